@@ -0,0 +1,46 @@
+"""Space Launch Notifications - CLI Import Time Benchmark
+
+One-shot runs spend most of their wall time importing, so the CLI must not
+load client libraries or template engines until they are used. Measures the
+cumulative `import launches.cli` time reported by `-X importtime` and checks
+it against the import time budget, exiting non-zero if it is exceeded.
+
+Usage:
+    python benchmarks/bench_import.py [runs]
+
+Copyright ©️ 2025 Scott Cummings
+SPDX-License-Identifier: MIT OR Apache-2.0
+"""
+
+import statistics
+import subprocess
+import sys
+
+IMPORT_BUDGET_SECONDS = 0.6  # cumulative `import launches.cli` time of the fastest run
+
+
+def time_import() -> float:
+    """return the cumulative import time of launches.cli in a fresh interpreter"""
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import launches.cli"],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stderr
+    # the last line is the top level import: "import time: self | cumulative | name"
+    cumulative = stderr.strip().splitlines()[-1].split("|")[1]
+    return int(cumulative) / 1_000_000
+
+
+def main(runs: int) -> int:
+    timings = [time_import() for _ in range(runs)]
+
+    print(f"runs: {runs}")
+    print(f"import launches.cli: min {min(timings) * 1000:.1f} ms")
+    print(f"import launches.cli: median {statistics.median(timings) * 1000:.1f} ms")
+    print(f"budget:              {IMPORT_BUDGET_SECONDS * 1000:.0f} ms")
+    return 0 if min(timings) < IMPORT_BUDGET_SECONDS else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(int(sys.argv[1]) if len(sys.argv) > 1 else 5))
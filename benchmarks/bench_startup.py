@@ -0,0 +1,61 @@
+"""Space Launch Notifications - Template Startup Benchmark
+
+Measures the time a fresh process takes to import the renderers and render a
+notification, with and without a warm template bytecode cache.
+
+Usage:
+    python benchmarks/bench_startup.py [runs]
+
+Copyright ©️ 2025 Scott Cummings
+SPDX-License-Identifier: MIT OR Apache-2.0
+"""
+
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+RESOURCES_DIR = Path(__file__).parent.parent / "tests" / "resources"
+
+RENDER_SCRIPT = """
+import json, sys
+from loguru import logger
+logger.remove()
+from launches.notifications.renderers import (
+    HTML_TEMPLATE, JinjaRenderer, configure_template_cache,
+)
+if sys.argv[1]:
+    configure_template_cache(sys.argv[1])
+launches = json.load(open(sys.argv[2]))
+renderer = JinjaRenderer(formatted_template=HTML_TEMPLATE)
+renderer.render_subject(launches)
+renderer.render_text_body(launches)
+renderer.render_formatted_body(launches)
+"""
+
+
+def time_run(cache_dir: str) -> float:
+    """time a single process rendering two_launches.json"""
+    start = time.perf_counter()
+    subprocess.run(  # noqa: S603 - fixed interpreter and script
+        [sys.executable, "-c", RENDER_SCRIPT, cache_dir, str(RESOURCES_DIR / "two_launches.json")],
+        check=True,
+    )
+    return time.perf_counter() - start
+
+
+def main(runs: int) -> None:
+    no_cache = [time_run("") for _ in range(runs)]
+    with tempfile.TemporaryDirectory() as cache_dir:
+        time_run(cache_dir)  # warm the bytecode cache
+        warm_cache = [time_run(cache_dir) for _ in range(runs)]
+
+    print(f"runs: {runs}")
+    print(f"no bytecode cache:   median {statistics.median(no_cache) * 1000:.1f} ms")
+    print(f"warm bytecode cache: median {statistics.median(warm_cache) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10)
@@ -0,0 +1,105 @@
+"""Space Launch Notifications - Webhook Throughput Benchmark
+
+Measures how long one notification cycle takes to post to hundreds of
+endpoints on a local stand-in server, comparing the pooled webhook service
+with a new connection per request, both serially and with the service's
+concurrency, so the concurrent run isolates the gain from connection reuse.
+
+Usage:
+    python benchmarks/bench_webhook.py [endpoints] [latency_ms]
+
+Copyright ©️ 2025 Scott Cummings
+SPDX-License-Identifier: MIT OR Apache-2.0
+"""
+
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+from loguru import logger
+
+from launches.notifications.services.webhook import MAX_CONNECTIONS, WebhookNotificationService
+
+LATENCY = [0.0]  # seconds each endpoint takes to respond
+
+
+class EndpointHandler(BaseHTTPRequestHandler):
+    """accepts every webhook after LATENCY seconds"""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers["Content-Length"]))
+        time.sleep(LATENCY[0])
+        self.send_response(204)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *_args):
+        pass
+
+
+def time_unpooled(urls: list[str], body: bytes) -> float:
+    """post to each endpoint in turn with a new connection per request"""
+    start = time.perf_counter()
+    for url in urls:
+        requests.post(url, data=body, timeout=10).raise_for_status()
+    return time.perf_counter() - start
+
+
+def time_unpooled_concurrent(urls: list[str], body: bytes) -> float:
+    """post to every endpoint with the service's concurrency, but a new
+    connection per request"""
+
+    def post(url: str) -> None:
+        requests.post(url, data=body, timeout=10).raise_for_status()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=MAX_CONNECTIONS) as pool:
+        list(pool.map(post, urls))
+    return time.perf_counter() - start
+
+
+def time_pooled(urls: list[str]) -> float:
+    """post to every endpoint with the webhook service"""
+    service = WebhookNotificationService(urls=urls, secret="bench")  # noqa: S106 - benchmark
+    start = time.perf_counter()
+    service.send("Launches", "benchmark body", "<p>benchmark body</p>")
+    return time.perf_counter() - start
+
+
+def main(endpoints: int, latency_ms: float) -> None:
+    logger.remove()
+    LATENCY[0] = latency_ms / 1000
+    server = ThreadingHTTPServer(("127.0.0.1", 0), EndpointHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    urls = [f"http://127.0.0.1:{server.server_address[1]}/hook/{i}" for i in range(endpoints)]
+    try:
+        body = b'{"subject": "Launches"}'
+        unpooled = time_unpooled(urls, body)
+        unpooled_concurrent = time_unpooled_concurrent(urls, body)
+        pooled = time_pooled(urls)
+    finally:
+        server.shutdown()
+
+    print(f"endpoints: {endpoints}, endpoint latency: {latency_ms:.0f} ms")
+    print(
+        f"serial, new connection per request:     {unpooled:.2f} s ({endpoints / unpooled:.0f} req/s)"
+    )
+    print(
+        f"concurrent, new connection per request: {unpooled_concurrent:.2f} s "
+        f"({endpoints / unpooled_concurrent:.0f} req/s)"
+    )
+    print(
+        f"pooled webhook service:                 {pooled:.2f} s ({endpoints / pooled:.0f} req/s)"
+    )
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 500,
+        float(sys.argv[2]) if len(sys.argv) > 2 else 5.0,
+    )
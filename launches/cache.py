@@ -7,13 +7,74 @@ Copyright ©️ 2025 Scott Cummings
 SPDX-License-Identifier: MIT OR Apache-2.0
 """
 
+import hashlib
 import json
 import os
+from collections.abc import Sequence
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Any, Dict
 
 from loguru import logger
 
+from launches.ll2 import is_within_window
+from launches.metrics import METRICS
+
+# reasons a launch is in a change set, listed under its id in the change set's `changes`
+CHANGE_NEW = "new"
+CHANGE_STATUS = "status"
+CHANGE_WINDOW_START = "window_start"
+CHANGE_INFO_URLS = "info_urls"
+CHANGE_VID_URLS = "vid_urls"
+CHANGE_NET = "net"
+# an unchanged launch entered a search window, see entered_window_reason
+CHANGE_ENTERED_WINDOW = "entered_window"
+
+CACHE_DIFF_SECONDS = METRICS.histogram(
+    "launches_cache_diff_seconds", "Time to diff launches against the cache and save them"
+)
+
+
+def change_fingerprint(launch: Dict[str, Any]) -> str:
+    """A digest of the launch attributes LaunchCache treats as significant changes.
+
+    Launches with equal fingerprints describe the same change, even if other
+    attributes (e.g. `last_updated`) differ.
+    """
+    significant = [
+        launch.get("status", {}).get("name"),
+        launch.get("window_start"),
+        launch.get("net"),
+        sorted(str(info_url.get("url")) for info_url in launch.get("infoURLs", [])),
+        sorted(str(vid_url.get("url")) for vid_url in launch.get("vidURLs", [])),
+    ]
+    encoded = json.dumps(significant, separators=(",", ":"))
+    return hashlib.sha1(encoded.encode("utf-8"), usedforsecurity=False).hexdigest()
+
+
+def with_all_new(launches: Dict[str, Any]) -> Dict[str, Any]:
+    """return launches with every launch listed as `new` under `changes`, for
+    launches reported without comparing them to a cache"""
+    return {
+        **launches,
+        "changes": {launch["id"]: [CHANGE_NEW] for launch in launches.get("results", [])},
+    }
+
+
+def entered_window_reason(window_hours: int) -> str:
+    """the reason an unchanged launch is in a change set because it entered a
+    window_hours search window"""
+    return f"{CHANGE_ENTERED_WINDOW}:{window_hours}"
+
+
+def is_change_for_window(reasons: Sequence[str] | None, window_hours: int) -> bool:
+    """True if a launch changed for reasons should be notified to a subscription
+    searching window_hours. Launches which only entered other windows are not."""
+    if not reasons:
+        return True
+    own = entered_window_reason(window_hours)
+    return any(reason == own or not reason.startswith(CHANGE_ENTERED_WINDOW) for reason in reasons)
+
 
 class LaunchCache:
     """Cache for Launch Library 2 API responses to avoid redundant notifications."""
@@ -36,7 +97,9 @@ class LaunchCache:
         # Create cache directory if it doesn't exist
         os.makedirs(self.cache_dir, exist_ok=True)
         self.cache_file = self.cache_dir / "launches_cache.json"
+        self.windows_file = self.cache_dir / "launch_windows.json"
         self._previous_launches = self._load_cache()
+        self._previous_windows = self._load_windows()
 
     def _load_cache(self) -> Dict[str, Any]:
         """Load the cache from disk.
@@ -66,29 +129,88 @@ class LaunchCache:
         except IOError as e:
             logger.warning(f"Failed to save cache: {e}")
 
-    def get_changed_launches(self, new_launches: Dict[str, Any]) -> Dict[str, Any]:
+    def _load_windows(self) -> Dict[str, list[str]]:
+        """Load the ids of the launches within each search window from disk.
+
+        Returns:
+            Dict[str, list[str]]: Launch ids by window hours, empty if none were saved.
+        """
+        if not self.windows_file.exists():
+            return {}
+
+        try:
+            with open(self.windows_file, "r") as f:
+                return json.load(f)
+        except (json.JSONDecodeError, IOError) as e:
+            logger.warning(f"Failed to load cached search windows: {e}")
+            return {}
+
+    def _save_windows(self, windows: Dict[str, list[str]]) -> None:
+        """Save the ids of the launches within each search window.
+
+        Args:
+            windows (Dict[str, list[str]]): Launch ids by window hours.
+        """
+        try:
+            with open(self.windows_file, "w") as f:
+                json.dump(windows, f, indent=2)
+        except IOError as e:
+            logger.warning(f"Failed to save cached search windows: {e}")
+
+    def get_changed_launches(
+        self, new_launches: Dict[str, Any], windows: Sequence[int] = ()
+    ) -> Dict[str, Any]:
         """Get launches that have changed from the previous cached response.
 
+        A launch which has not changed but has entered one of `windows` since the
+        previous response is also included, with an `entered_window_reason` so only
+        subscriptions searching that window are notified of it again.
+
         Args:
             new_launches (Dict[str, Any]): The new launches data.
+            windows (Sequence[int], optional): The search windows in hours of the
+                subscriptions the launches are routed to. Defaults to none.
 
         Returns:
-            Dict[str, Any]: A dict containing only changed launches.
+            Dict[str, Any]: A dict containing only changed launches, with the reasons
+            each launch changed under `changes`, keyed by launch id.
         """
         if not self.enabled:
-            return new_launches
+            return with_all_new(new_launches)
+
+        with CACHE_DIFF_SECONDS.time():
+            return self._diff_launches(new_launches, windows)
+
+    def _diff_launches(
+        self, new_launches: Dict[str, Any], windows: Sequence[int]
+    ) -> Dict[str, Any]:
+        """diff new_launches against the previous launches and save them"""
+        now = datetime.now(timezone.utc)
+        within_windows = {
+            str(hours): {
+                launch["id"]
+                for launch in new_launches.get("results", [])
+                if is_within_window(launch, now + timedelta(hours=hours))
+            }
+            for hours in set(windows)
+        }
+        previous_windows = {hours: set(ids) for hours, ids in self._previous_windows.items()}
+        if within_windows or previous_windows:
+            self._previous_windows = {hours: sorted(ids) for hours, ids in within_windows.items()}
+            self._save_windows(self._previous_windows)
 
         if not self._previous_launches:
             # No previous cache or cache disabled - return all launches
             self._previous_launches = new_launches
             self._save_cache(new_launches)
-            return new_launches
+            return with_all_new(new_launches)
 
-        changed_launches = {
+        changed_launches: Dict[str, Any] = {
             "count": 0,
             "next": new_launches.get("next"),
             "previous": new_launches.get("previous"),
             "results": [],
+            "changes": {},
         }
 
         previous_launches_by_id = {
@@ -103,14 +225,28 @@ class LaunchCache:
                 # This is a new launch
                 logger.info(f"New launch detected: {launch['name']}")
                 changed_launches["results"].append(launch)
+                changed_launches["changes"][launch_id] = [CHANGE_NEW]
                 continue
 
             previous_launch = previous_launches_by_id[launch_id]
 
             # Check if key attributes have changed
-            if self._is_launch_significantly_changed(previous_launch, launch):
+            reasons = self._change_reasons(previous_launch, launch)
+            if not reasons:
+                # windows without a previous state (e.g. a new subscription) are only recorded
+                reasons = [
+                    entered_window_reason(int(hours))
+                    for hours, launch_ids in within_windows.items()
+                    if hours in previous_windows
+                    and launch_id in launch_ids
+                    and launch_id not in previous_windows[hours]
+                ]
+                if reasons:
+                    logger.info(f"Launch entered a search window: {launch['name']}")
+            if reasons:
                 logger.info(f"Launch changed: {launch['name']}")
                 changed_launches["results"].append(launch)
+                changed_launches["changes"][launch_id] = reasons
 
         # Update the count of changed launches
         changed_launches["count"] = len(changed_launches["results"])
@@ -134,13 +270,28 @@ class LaunchCache:
         Returns:
             bool: True if the launch has significantly changed, False otherwise.
         """
+        return bool(LaunchCache._change_reasons(prev_launch, new_launch))
+
+    @staticmethod
+    def _change_reasons(prev_launch: Dict[str, Any], new_launch: Dict[str, Any]) -> list[str]:
+        """List the significant changes between two versions of a launch.
+
+        Args:
+            prev_launch (Dict[str, Any]): Previous launch data.
+            new_launch (Dict[str, Any]): New launch data.
+
+        Returns:
+            list[str]: The CHANGE_* reasons, empty if the launch has not significantly changed.
+        """
+        reasons = []
+
         # Check if status has changed
         if prev_launch.get("status", {}).get("name") != new_launch.get("status", {}).get("name"):
             logger.info(
                 f"Launch status changed from {prev_launch.get('status', {}).get('name')} "
                 f"to {new_launch.get('status', {}).get('name')}"
             )
-            return True
+            reasons.append(CHANGE_STATUS)
 
         # Check if window_start has changed
         if prev_launch.get("window_start") != new_launch.get("window_start"):
@@ -148,7 +299,7 @@ class LaunchCache:
                 f"Launch window_start changed from {prev_launch.get('window_start')} "
                 f"to {new_launch.get('window_start')}"
             )
-            return True
+            reasons.append(CHANGE_WINDOW_START)
 
         # Check if new information URLs were added
         prev_urls = {info_url.get("url") for info_url in prev_launch.get("infoURLs", [])}
@@ -156,7 +307,7 @@ class LaunchCache:
 
         if prev_urls != new_urls:
             logger.info(f"Launch info URLs changed: {len(new_urls - prev_urls)} new URLs added")
-            return True
+            reasons.append(CHANGE_INFO_URLS)
 
         # Check if new video URLs were added
         prev_vid_urls = {vid_url.get("url") for vid_url in prev_launch.get("vidURLs", [])}
@@ -166,13 +317,13 @@ class LaunchCache:
             logger.info(
                 f"Launch video URLs changed: {len(new_vid_urls - prev_vid_urls)} new video URLs added"
             )
-            return True
+            reasons.append(CHANGE_VID_URLS)
 
         # Check if net (No Earlier Than) date has changed
         if prev_launch.get("net") != new_launch.get("net"):
             logger.info(
                 f"Launch NET date changed from {prev_launch.get('net')} to {new_launch.get('net')}"
             )
-            return True
+            reasons.append(CHANGE_NET)
 
-        return False
+        return reasons
@@ -17,16 +17,33 @@ import sys
 from loguru import logger
 
 from launches.cache import LaunchCache
-from launches.config import load_config
+from launches.coalescing import ChangeCoalescer
+from launches.config import LaunchesConfig, load_config
+from launches.errors import ConfigError
+from launches.idempotency import SENT_INDEX_SIZE, SentIndex
 from launches.launches import (
     check_for_upcoming_launches,
     run_upcoming_launches_daily,
     run_upcoming_launches_periodic,
 )
 from launches.ll2 import LaunchLibrary2Client
+from launches.metrics import DEFAULT_METRICS_HOST, METRICS, MetricsServer
+from launches.notifications.dispatch import iter_handlers
 from launches.notifications.handlers import (
+    HandlerReuse,
     get_notification_handlers,
 )
+from launches.notifications.renderers import configure_template_cache
+from launches.outbox import MAX_ATTEMPTS, NotificationOutbox
+from launches.reload import ConfigReloader, ConfigWatcher, ServicePlan
+from launches.runtime import run_upcoming_launches_async
+from launches.scheduling import RunRecord
+from launches.subscriptions import (
+    DEFAULT_SUBSCRIPTION,
+    Subscription,
+    SubscriptionEngine,
+    get_subscriptions,
+)
 
 DEFAULT_CONFIG_PATH = "config.json"
 DEFAULT_CHECK_INTERVAL_HOURS = 24  # default hours between checks for periodic upcoming launches
@@ -34,6 +51,9 @@ DEFAULT_FORECAST_WINDOW_HOURS = 48  # default hours in future to check for upcom
 DEFAULT_DAILY_CHECK_TIMES = ["07:00", "19:00"]  # default times to check for upcoming launches
 DEFAULT_TIMEZONE = "America/Chicago"  # default daily schedule timezone
 DEFAULT_CACHE_DIR = "./.launches_cache"
+TEMPLATE_CACHE_SUBDIR = "templates"  # compiled template cache within the cache directory
+DEFAULT_RUNTIME = "schedule"  # default service mode runtime
+DEFAULT_CHECK_DEADLINE_SECONDS = 600  # default time before a running check is abandoned
 
 
 def get_env_bool(env_var: str) -> bool:
@@ -138,6 +158,19 @@ def parse_args() -> argparse.Namespace:
         dest="timezone",
         help=f"specify the IANA timezone for times # Default: {DEFAULT_TIMEZONE} ",
     )
+    arg_group.add_argument(
+        "--runtime",
+        choices=("schedule", "asyncio"),
+        dest="runtime",
+        help=f'specify the service mode runtime # Default "{DEFAULT_RUNTIME}"',
+    )
+    arg_group.add_argument(
+        "--metrics-port",
+        metavar="PORT",
+        type=int,
+        dest="metrics_port",
+        help="serve service mode metrics at http://HOST:PORT/metrics # Default: disabled",
+    )
     return parser.parse_args()
 
 
@@ -236,6 +269,125 @@ def get_cache(config, args):
     )
 
 
+def get_outbox(config, args, notification_handlers):
+    """
+    Creates and returns a NotificationOutbox if the launch cache is in use.
+
+    The outbox keeps notifications for changes the cache has already recorded
+    until they are delivered, so it is only needed alongside the cache. It records
+    every delivered change in a SentIndex so a change is never delivered twice.
+
+    Priority order for outbox enabling:
+    1. Command line argument (args.no_cache) - disables the outbox if true
+    2. Configuration values (config.cache_enabled and config.outbox_enabled)
+
+    Args:
+        config: The loaded LaunchesConfig.
+        args: Command line arguments (used for cache directory configuration).
+        notification_handlers: The handlers queued notifications are retried with.
+
+    Returns:
+        NotificationOutbox: An outbox in the cache directory with the handlers registered.
+        None: If the cache or the outbox is disabled.
+    """
+    if args.no_cache or not config.cache_enabled or not config.outbox_enabled:
+        return None
+
+    cache_dir = get_cache_directory(config, args)
+    outbox = NotificationOutbox(
+        cache_dir,
+        config.outbox_max_attempts or MAX_ATTEMPTS,
+        sent_index=SentIndex(cache_dir, config.sent_index_size or SENT_INDEX_SIZE),
+    )
+    outbox.register(notification_handlers)
+    return outbox
+
+
+def get_coalescer(config, args, notification_handlers):
+    """
+    Creates and returns a ChangeCoalescer if changes should be held before sending.
+
+    Changes are coalesced when a debounce window is configured or any handler
+    has a maximum send rate. Held changes are persisted in the cache directory
+    unless the cache is disabled.
+
+    Priority order for the debounce window:
+    1. Configuration value (config.debounce_seconds)
+    2. No debounce (0), changes are only held for rate limited handlers
+
+    Args:
+        config: The loaded LaunchesConfig.
+        args: Command line arguments (used for cache directory configuration).
+        notification_handlers: The handlers changes are coalesced for.
+
+    Returns:
+        ChangeCoalescer: A coalescer sending to the handlers.
+        None: If there is no debounce window and no rate limited handler.
+    """
+    if not is_coalescing(config, notification_handlers):
+        return None
+
+    state_dir = None
+    if not args.no_cache and config.cache_enabled:
+        state_dir = get_cache_directory(config, args)
+    return ChangeCoalescer(notification_handlers, config.debounce_seconds or 0, state_dir)
+
+
+def is_coalescing(config, notification_handlers):
+    """
+    Checks whether changes should be held by a ChangeCoalescer before sending.
+
+    Args:
+        config: The loaded LaunchesConfig.
+        notification_handlers: The handlers changes would be coalesced for.
+
+    Returns:
+        bool: True if a debounce window is configured or any handler has a
+        maximum send rate.
+    """
+    return bool(config.debounce_seconds) or any(
+        getattr(handler, "max_sends_per_hour", None)
+        for handler in iter_handlers(notification_handlers)
+    )
+
+
+def get_metrics_server(config, args, outbox=None):
+    """
+    Creates the HTTP endpoint serving service mode metrics, if enabled.
+
+    Priority order for the metrics port:
+    1. Command line argument (args.metrics_port)
+    2. Configuration value (config.metrics_port)
+    3. Disabled
+
+    The endpoint binds config.metrics_host, 127.0.0.1 by default. With an
+    outbox, the number of queued notifications in each state is also exposed.
+
+    Args:
+        config: The loaded LaunchesConfig.
+        args: An object that may contain a `metrics_port` attribute.
+        outbox: The NotificationOutbox whose queue is exposed, if any.
+
+    Returns:
+        MetricsServer: A metrics server, not yet started.
+        None: If no metrics port is configured.
+    """
+    port = getattr(args, "metrics_port", None)
+    if port is None:
+        port = config.metrics_port
+    if port is None:
+        return None
+
+    if outbox is not None:
+        METRICS.gauge(
+            "launches_outbox_notifications",
+            "Notifications in the outbox by state",
+            "state",
+            outbox.counts,
+        )
+    return MetricsServer(port, config.metrics_host or DEFAULT_METRICS_HOST)
+
+
 def get_time_zone(config, args):
     """
     Determines the time zone to use based on command line arguments,
@@ -343,6 +495,156 @@ def get_periodic(config, args):
     return False
 
 
+def get_runtime(config, args):
+    """
+    Determines the service mode runtime based on command line arguments,
+    configuration settings, and default values.
+
+    Priority order:
+    1. Command line argument (args.runtime)
+    2. Configuration value (config.service_runtime)
+    3. Default value (DEFAULT_RUNTIME)
+
+    Args:
+        config: An object that may contain a `service_runtime` attribute.
+        args: An object that may contain a `runtime` attribute.
+
+    Returns:
+        str: The service runtime, either "schedule" or "asyncio".
+    """
+    if args.runtime is not None:
+        return args.runtime
+
+    if hasattr(config, "service_runtime") and config.service_runtime is not None:
+        return config.service_runtime
+
+    return DEFAULT_RUNTIME
+
+
+def get_check_deadline(config):
+    """
+    Determines the per-run deadline for scheduled checks based on
+    configuration settings and default values.
+
+    Priority order:
+    1. Configuration value (config.check_deadline_seconds)
+    2. Default value (DEFAULT_CHECK_DEADLINE_SECONDS)
+
+    Args:
+        config: An object that may contain a `check_deadline_seconds` attribute.
+
+    Returns:
+        int: The deadline in seconds.
+    """
+    if hasattr(config, "check_deadline_seconds") and config.check_deadline_seconds is not None:
+        return config.check_deadline_seconds
+
+    return DEFAULT_CHECK_DEADLINE_SECONDS
+
+
+def get_handlers(config, window_hours, reuse=None):
+    """
+    Builds the notification handlers and the search window for the shared fetch.
+
+    Without subscriptions the top-level notification handlers are returned as-is.
+    With subscriptions a single SubscriptionEngine is returned, with the top-level
+    handlers (if any) as a `default` subscription, and the search window is widened
+    to the largest subscription window so one fetch serves every subscription.
+
+    Args:
+        config: The loaded LaunchesConfig.
+        window_hours: The search window for the top-level notification handlers.
+        reuse: Handlers from a previous load, kept if their configuration is unchanged.
+
+    Returns:
+        tuple: The list of handlers and the search window in hours.
+    """
+    if not config.subscriptions:
+        return get_notification_handlers(config.notification_handlers, reuse=reuse), window_hours
+
+    subscriptions = get_subscriptions(config.subscriptions, window_hours, reuse)
+    if config.notification_handlers:
+        subscriptions.insert(
+            0,
+            Subscription(
+                DEFAULT_SUBSCRIPTION,
+                window_hours,
+                get_notification_handlers(config.notification_handlers, reuse=reuse),
+            ),
+        )
+    engine = SubscriptionEngine(subscriptions)
+    return [engine], engine.window_hours
+
+
+def get_service_plan(config, args, reuse=None):
+    """
+    Builds the parts of the configuration a running service applies: the
+    handlers, search window, schedule and check deadline.
+
+    Args:
+        config: The loaded LaunchesConfig.
+        args: The parsed command line arguments.
+        reuse: Handlers from a previous load, kept if their configuration is unchanged.
+
+    Returns:
+        ServicePlan: The service plan for the configuration.
+    """
+    notification_handlers, window_hours = get_handlers(
+        config, get_search_window(config, args), reuse
+    )
+    return ServicePlan(
+        window_hours=window_hours,
+        notification_handlers=notification_handlers,
+        periodic=get_periodic(config, args),
+        repeat_hours=get_search_interval(config, args),
+        specific_times=get_check_times(config, args),
+        tz=get_time_zone(config, args),
+        deadline_seconds=get_check_deadline(config),
+    )
+
+
+def get_reloader(config, args, plan, reuse, coalescer, outbox):
+    """
+    Creates a reloader applying changes to the configuration file while the
+    schedule service runs.
+
+    Reloaded handlers are routed through the coalescer and registered with the
+    outbox like those loaded at startup. Command line arguments keep taking
+    priority over the reloaded configuration.
+
+    Args:
+        config: The loaded LaunchesConfig.
+        args: The parsed command line arguments.
+        plan: The ServicePlan the service started with.
+        reuse: The handlers the service started with.
+        coalescer: The ChangeCoalescer handlers are routed through, if any.
+        outbox: The NotificationOutbox handlers are registered with, if any.
+
+    Returns:
+        ConfigReloader: A reloader watching the configuration file.
+        None: If reloading is disabled by config.reload_config.
+    """
+    if config.reload_config is False:
+        return None
+
+    def build_plan(new_config: LaunchesConfig, new_reuse: HandlerReuse) -> ServicePlan:
+        new_plan = get_service_plan(new_config, args, new_reuse)
+        if coalescer is not None:
+            coalescer.set_handlers(new_plan.notification_handlers)
+            new_plan.notification_handlers = [coalescer]
+        elif is_coalescing(new_config, new_plan.notification_handlers):
+            # the coalescer is only created at startup
+            logger.warning(
+                "Send rate limits and debounce_seconds added by a reload apply after a restart"
+            )
+        if outbox is not None:
+            outbox.register(new_plan.notification_handlers)
+        return new_plan
+
+    logger.info("Watching {} for configuration changes", args.config)
+    return ConfigReloader(ConfigWatcher(args.config, config), build_plan, plan, reuse)
+
+
 def cli():
     """command line interface entrypoint"""
 
@@ -356,39 +658,99 @@ def cli():
     config = load_config(args.config)
     logger.debug("config: {}", config)
 
-    notification_handlers = get_notification_handlers(config.notification_handlers)
+    if not args.no_cache and config.cache_enabled:
+        configure_template_cache(
+            os.path.join(get_cache_directory(config, args), TEMPLATE_CACHE_SUBDIR)
+        )
+
+    reuse = HandlerReuse()
+    plan = get_service_plan(config, args, reuse)
+    notification_handlers, window_hours = plan.notification_handlers, plan.window_hours
     env = args.env
 
     # Create Launch Library client
     ll2_client = LaunchLibrary2Client(env=env)
 
-    window_hours = get_search_window(config, args)
     cache = get_cache(config, args)
-    time_zone = get_time_zone(config, args)
-    times = get_check_times(config, args)
-    search_interval = get_search_interval(config, args)
-    periodic = get_periodic(config, args)
+    runtime = get_runtime(config, args)
 
     if not args.service:
         check_for_upcoming_launches(window_hours, notification_handlers, ll2_client, None)
         return
 
-    if periodic:
+    if runtime == "asyncio" and config.reload_config:
+        # the config only rejects this when it selects the runtime itself
+        logger.error("Configuration reload is only supported by the schedule runtime")
+        raise ConfigError("reload_config is only supported by the schedule runtime")
+
+    run_record = RunRecord(get_cache_directory(config, args))
+    coalescer = get_coalescer(config, args, notification_handlers)
+    if coalescer is not None:
+        notification_handlers = plan.notification_handlers = [coalescer]
+    outbox = get_outbox(config, args, notification_handlers)
+    if coalescer is not None:
+        coalescer.outbox = outbox
+        coalescer.start()
+
+    metrics_server = get_metrics_server(config, args, outbox)
+    if metrics_server is not None:
+        try:
+            metrics_server.start()
+        except OSError as ex:
+            # metrics are optional, notifications keep running without them
+            logger.error("Unable to serve metrics on port {}: {}", metrics_server.port, ex)
+
+    if runtime == "asyncio":
+        logger.info("Starting asyncio service runtime with {}h window", window_hours)
+        run_upcoming_launches_async(
+            window_hours,
+            notification_handlers,
+            ll2_client,
+            cache,
+            periodic=plan.periodic,
+            repeat_hours=plan.repeat_hours,
+            specific_times=plan.specific_times,
+            tz=plan.tz,
+            run_record=run_record,
+            outbox=outbox,
+            deadline_seconds=plan.deadline_seconds,
+        )
+        return
+
+    reloader = get_reloader(config, args, plan, reuse, coalescer, outbox)
+    if plan.periodic:
         logger.info(
             "Starting periodic launch checks every {} hours with {}h window",
-            search_interval,
+            plan.repeat_hours,
             window_hours,
         )
         run_upcoming_launches_periodic(
-            window_hours, search_interval, notification_handlers, ll2_client, cache
+            window_hours,
+            plan.repeat_hours,
+            notification_handlers,
+            ll2_client,
+            cache,
+            plan.deadline_seconds,
+            run_record,
+            outbox,
+            reloader,
         )
     else:
         logger.info(
             "Starting scheduled launch checks at {} ({}) with {}h window",
-            times,
-            time_zone,
+            plan.specific_times,
+            plan.tz,
             window_hours,
         )
         run_upcoming_launches_daily(
-            window_hours, times, time_zone, notification_handlers, ll2_client, cache
+            window_hours,
+            plan.specific_times,
+            plan.tz,
+            notification_handlers,
+            ll2_client,
+            cache,
+            plan.deadline_seconds,
+            run_record,
+            outbox,
+            reloader,
         )
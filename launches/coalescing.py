@@ -0,0 +1,290 @@
+"""Space Launch Notifications - Coalescing Module
+
+Holds detected changes for a debounce window before notifying, merging
+repeated changes to the same launch, and holds changes for rate limited
+handlers until they may send again. During busy periods channels get fewer,
+richer notifications and stay within their providers' quotas.
+
+Copyright ©️ 2025 Scott Cummings
+SPDX-License-Identifier: MIT OR Apache-2.0
+"""
+
+import json
+import os
+import threading
+import time
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from loguru import logger
+
+from launches.notifications.dispatch import (
+    DispatchResult,
+    NotificationJob,
+    Sender,
+    dispatch_notifications,
+    get_notification_jobs,
+    handler_name,
+    iter_handlers,
+)
+from launches.notifications.ratelimit import TokenBucket
+from launches.subscriptions import select_launches
+
+if TYPE_CHECKING:
+    from launches.outbox import NotificationOutbox
+
+COALESCER_NAME = "coalescer"
+COALESCING_FILE = "coalescing.json"
+MAX_WAIT_FACTOR = 4  # changes are held at most this many debounce windows
+TICK_SECONDS = 5.0  # seconds between checks for settled changes
+RETRY_SECONDS = 60.0  # seconds changes which failed to send are held before a retry
+
+
+@dataclass
+class PendingChanges:
+    """Changes held for a single handler, merged by launch id"""
+
+    handler: Sender
+    first_change: float
+    last_change: float = 0.0
+    launches: dict[str, dict[str, Any]] = field(default_factory=dict)
+    links: dict[str, Any] = field(default_factory=dict)
+    changes: dict[str, list[str]] = field(default_factory=dict)
+    retry_at: float = 0.0  # held changes are not sent before this time
+
+    def merge(self, launches: dict[str, Any], now: float) -> None:
+        """merge a change set, keeping only the latest version of each launch
+        and every reason it changed"""
+        changes = launches.get("changes", {})
+        for launch in launches.get("results", []):
+            self.launches[launch["id"]] = launch
+            reasons = self.changes.setdefault(launch["id"], [])
+            reasons.extend(r for r in changes.get(launch["id"], []) if r not in reasons)
+        self.links = {"next": launches.get("next"), "previous": launches.get("previous")}
+        self.last_change = now
+
+    def restore(self, launches: dict[str, Any], retry_at: float) -> None:
+        """merge back a change set which failed to send, keeping the versions of
+        launches which have changed again since and every reason they changed"""
+        changes = launches.get("changes", {})
+        for launch in launches.get("results", []):
+            self.launches.setdefault(launch["id"], launch)
+            reasons = self.changes.setdefault(launch["id"], [])
+            reasons.extend(r for r in changes.get(launch["id"], []) if r not in reasons)
+        if not self.links:
+            self.links = {"next": launches.get("next"), "previous": launches.get("previous")}
+        self.retry_at = max(self.retry_at, retry_at)
+
+    def to_json(self) -> dict[str, Any]:
+        return {
+            "first_change": self.first_change,
+            "last_change": self.last_change,
+            "links": self.links,
+            "changes": self.changes,
+            "launches": list(self.launches.values()),
+            "retry_at": self.retry_at,
+        }
+
+    def change_set(self) -> dict[str, Any]:
+        """return the merged changes as a launches dict"""
+        launches = {**self.links}
+        if any(self.changes.values()):
+            launches["changes"] = self.changes
+        return select_launches(launches, list(self.launches.values()))
+
+
+class ChangeCoalescer:
+    """Coalesces change sets per handler before they are sent.
+
+    Quacks like a NotificationHandler: `send` only records the change set and a
+    background thread sends each handler's merged changes once no change has
+    arrived for `debounce_seconds` (or they have been held for
+    MAX_WAIT_FACTOR windows) and the handler's `max_sends_per_hour` allows it.
+    Held changes are persisted so they survive restarts. Without an outbox,
+    changes which fail to send are held again and retried after RETRY_SECONDS.
+    """
+
+    name = COALESCER_NAME
+
+    def __init__(
+        self,
+        notification_handlers: Sequence[Sender],
+        debounce_seconds: float = 0.0,
+        state_dir: str | None = None,
+    ) -> None:
+        self.notification_handlers = list(notification_handlers)
+        self.debounce_seconds = debounce_seconds
+        self.max_wait_seconds = debounce_seconds * MAX_WAIT_FACTOR
+        self.outbox: NotificationOutbox | None = None
+        self._pending: dict[str, PendingChanges] = {}
+        self._limits: dict[str, TokenBucket] = self._get_limits({})
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self.state_file: Path | None = None
+        if state_dir is not None:
+            os.makedirs(state_dir, exist_ok=True)
+            self.state_file = Path(state_dir) / COALESCING_FILE
+            self._load()
+
+    def routed_handlers(self) -> list[Sender]:
+        """return every handler changes are coalesced for"""
+        return list(iter_handlers(self.notification_handlers))
+
+    def _get_limits(self, previous: dict[str, TokenBucket]) -> dict[str, TokenBucket]:
+        """a send rate limit per rate limited handler, keeping the previous limit
+        of a handler whose rate is unchanged"""
+        limits = {}
+        for handler in self.routed_handlers():
+            per_hour = getattr(handler, "max_sends_per_hour", None)
+            if per_hour:
+                name = handler_name(handler)
+                limit = previous.get(name)
+                if limit is None or limit.rate != per_hour / 3600:
+                    limit = TokenBucket(per_hour / 3600, 1)
+                limits[name] = limit
+        return limits
+
+    def set_handlers(self, notification_handlers: Sequence[Sender]) -> None:
+        """Replace the handlers changes are coalesced for, e.g. on a config reload.
+        Held changes move to the handler of the same name, or are dropped if the
+        handler was removed."""
+        with self._lock:
+            self.notification_handlers = list(notification_handlers)
+            self._limits = self._get_limits(self._limits)
+            handlers = {handler_name(handler): handler for handler in self.routed_handlers()}
+            for name, pending in list(self._pending.items()):
+                if name in handlers:
+                    pending.handler = handlers[name]
+                else:
+                    logger.warning("Dropping held changes for removed handler {}", name)
+                    del self._pending[name]
+            self._save()
+
+    def send(self, launches: dict[str, Any]) -> None:
+        """hold a change set until it settles"""
+        now = time.time()
+        with self._lock:
+            for job in get_notification_jobs(launches, self.notification_handlers):
+                name = handler_name(job.handler)
+                pending = self._pending.get(name)
+                if pending is None:
+                    pending = self._pending[name] = PendingChanges(job.handler, now)
+                pending.merge(job.launches, now)
+            self._save()
+        logger.info("Holding {} changed launches for coalescing", launches["count"])
+
+    def due_jobs(self) -> list[NotificationJob]:
+        """Take the merged changes of every handler which may send now. Handlers
+        holding the same launches share one launches dict, like a fresh dispatch."""
+        now = time.time()
+        jobs = []
+        shared: dict[tuple[int, ...], dict[str, Any]] = {}
+        with self._lock:
+            for name, pending in list(self._pending.items()):
+                settled = now - pending.last_change >= self.debounce_seconds
+                overdue = now - pending.first_change >= self.max_wait_seconds
+                if not (settled or overdue) or now < pending.retry_at:
+                    continue
+                limit = self._limits.get(name)
+                if limit is not None and not limit.try_acquire():
+                    continue
+                del self._pending[name]
+                key = tuple(map(id, pending.launches.values()))
+                if key not in shared:
+                    shared[key] = pending.change_set()
+                jobs.append(NotificationJob(pending.handler, shared[key]))
+            if jobs:
+                self._save()
+        return jobs
+
+    def flush(self) -> list[DispatchResult]:
+        """send the merged changes of every handler which may send now"""
+        jobs = self.due_jobs()
+        if not jobs:
+            return []
+        logger.info("Sending {} coalesced notifications", len(jobs))
+        if self.outbox is not None:
+            return self.outbox.deliver(jobs)
+        results = dispatch_notifications(jobs)
+        self.hold_failed(results)
+        return results
+
+    def hold_failed(self, results: Sequence[DispatchResult]) -> None:
+        """hold the changes of failed sends again, so they are retried rather than lost"""
+        failed = [result.job for result in results if not result.success]
+        if not failed:
+            return
+        now = time.time()
+        with self._lock:
+            handlers = {handler_name(handler): handler for handler in self.routed_handlers()}
+            for job in failed:
+                name = handler_name(job.handler)
+                if name not in handlers:
+                    logger.warning("Dropping failed changes for removed handler {}", name)
+                    continue
+                pending = self._pending.get(name)
+                if pending is None:
+                    pending = self._pending[name] = PendingChanges(handlers[name], now, now)
+                pending.restore(job.launches, now + RETRY_SECONDS)
+            self._save()
+        logger.warning(
+            "Holding {} failed coalesced notifications for {}s before a retry",
+            len(failed),
+            RETRY_SECONDS,
+        )
+
+    def start(self) -> None:
+        """start sending settled changes on a background thread"""
+        self._thread = threading.Thread(target=self._run, name="launches-coalescer", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float | None = None) -> None:
+        """stop sending, held changes stay persisted for the next start"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self) -> None:
+        tick = min(TICK_SECONDS, max(self.debounce_seconds / 4, 0.1))
+        while not self._stop.wait(tick):
+            try:
+                self.flush()
+            except Exception as ex:
+                # the coalescer must survive errors, held changes are retried next tick
+                logger.exception("Unhandled exception sending coalesced notifications: {}", ex)
+
+    def _load(self) -> None:
+        if self.state_file is None or not self.state_file.exists():
+            return
+        try:
+            with open(self.state_file, "r") as f:
+                state = json.load(f)
+        except (json.JSONDecodeError, IOError) as e:
+            logger.warning(f"Failed to load coalescing state: {e}")
+            return
+        handlers = {handler_name(handler): handler for handler in self.routed_handlers()}
+        for name, held in state.items():
+            if name not in handlers:
+                logger.warning("Dropping held changes for unknown handler {}", name)
+                continue
+            pending = PendingChanges(handlers[name], held["first_change"], held["last_change"])
+            pending.launches = {launch["id"]: launch for launch in held["launches"]}
+            pending.links = held["links"]
+            pending.changes = held.get("changes", {})
+            pending.retry_at = held.get("retry_at", 0.0)
+            self._pending[name] = pending
+
+    def _save(self) -> None:
+        if self.state_file is None:
+            return
+        try:
+            with open(self.state_file, "w") as f:
+                json.dump({name: held.to_json() for name, held in self._pending.items()}, f)
+        except IOError as e:
+            logger.warning(f"Failed to save coalescing state: {e}")
+
+    def __repr__(self) -> str:
+        return f"ChangeCoalescer(debounce_seconds={self.debounce_seconds})"
@@ -8,18 +8,37 @@ Copyright ©️ 2025 Scott Cummings
 SPDX-License-Identifier: MIT OR Apache-2.0
 """
 
-from typing import Any
+from typing import Any, Literal
 
 from loguru import logger
-from pydantic import BaseModel, ValidationError
+from pydantic import BaseModel, ValidationError, model_validator
 
 from launches.errors import ConfigError
 
 
 class NotificationHandlerConfig(BaseModel):
     service: str
-    renderer: str
+    renderer: str = "plaintext"
     parameters: dict[str, Any]
+    timezone: str | None = None
+    stream: bool = False
+    name: str | None = None
+    max_sends_per_hour: float | None = None
+
+
+class SubscriptionFilterConfig(BaseModel):
+    launch_service_provider_ids: list[int] = []
+    location_ids: list[int] = []
+    pad_ids: list[int] = []
+    orbits: list[str] = []
+    rocket_configuration_ids: list[int] = []
+
+
+class SubscriptionConfig(BaseModel):
+    name: str
+    search_window_hours: int | None = None
+    filters: SubscriptionFilterConfig = SubscriptionFilterConfig()
+    notification_handlers: list[NotificationHandlerConfig]
 
 
 class LaunchesConfig(BaseModel):
@@ -28,9 +47,27 @@ class LaunchesConfig(BaseModel):
     search_repeat_hours: int | None = None
     daily_check_times: list[str] | None = None
     time_zone: str | None = None
-    notification_handlers: list[NotificationHandlerConfig]
+    notification_handlers: list[NotificationHandlerConfig] = []
+    subscriptions: list[SubscriptionConfig] = []
     cache_enabled: bool = True
     cache_directory: str | None = None
+    outbox_enabled: bool = True
+    outbox_max_attempts: int | None = None
+    sent_index_size: int | None = None
+    debounce_seconds: float | None = None
+    service_runtime: Literal["schedule", "asyncio"] | None = None
+    check_deadline_seconds: int | None = None
+    reload_config: bool | None = None
+    metrics_port: int | None = None
+    metrics_host: str | None = None
+
+    @model_validator(mode="after")
+    def check_handlers(self) -> "LaunchesConfig":
+        if not self.notification_handlers and not self.subscriptions:
+            raise ValueError("notification_handlers or subscriptions must be configured")
+        if self.reload_config and self.service_runtime == "asyncio":
+            raise ValueError("reload_config is only supported by the schedule runtime")
+        return self
 
 
 def load_config(config_path: str) -> LaunchesConfig:
@@ -67,6 +104,16 @@ def load_config(config_path: str) -> LaunchesConfig:
                     "recipients": ["",""]
                 }
             }
+        ],
+        "subscriptions": [
+            {
+                "name": "spacex",
+                "search_window_hours": 72,
+                "filters": {"launch_service_provider_ids": [121]},
+                "notification_handlers": [
+                    {"service": "stdout", "renderer": "plaintext", "parameters": {}}
+                ]
+            }
         ]
     }
     """
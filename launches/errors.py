@@ -23,3 +23,11 @@ class LL2RequestError(LaunchesError):
 
 class NotificationError(LaunchesError):
     """notification service error"""
+
+
+class DeliveryError(NotificationError):
+    """notification was not delivered to some recipients"""
+
+    def __init__(self, message: str, failed_recipients: list[str] | None = None) -> None:
+        super().__init__(message)
+        self.failed_recipients = failed_recipients or []
@@ -0,0 +1,170 @@
+"""Space Launch Notifications - Idempotency Module
+
+Remembers the last change of each launch each handler has delivered, so a
+change resent after a restart, a lost cache or an outbox retry is a no-op
+rather than a duplicate email, while a launch changing back to an earlier
+state (e.g. Go, Hold, Go) is still delivered.
+
+Copyright ©️ 2025 Scott Cummings
+SPDX-License-Identifier: MIT OR Apache-2.0
+"""
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Sequence
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+
+from launches.cache import change_fingerprint
+from launches.notifications.dispatch import (
+    DispatchResult,
+    NotificationJob,
+    dispatch_notifications,
+    handler_name,
+)
+from launches.subscriptions import select_launches
+
+SENT_INDEX_FILE = "sent_index.bin"
+SENT_INDEX_MAGIC = b"LSIX2"
+SENT_INDEX_SIZE = 20000  # idempotency keys kept, oldest keys are forgotten first
+KEY_BYTES = 16
+ENTRY_BYTES = 2 * KEY_BYTES  # an idempotency key followed by its change digest
+
+
+def idempotency_key(name: str, launch: dict[str, Any]) -> bytes:
+    """a compact key for the handler `name` delivering changes of a launch"""
+    material = f"{name}\0{launch.get('id')}"
+    return hashlib.blake2b(material.encode("utf-8"), digest_size=KEY_BYTES).digest()
+
+
+def change_digest(launch: dict[str, Any]) -> bytes:
+    """a compact digest of the current change of a launch"""
+    return hashlib.blake2b(
+        change_fingerprint(launch).encode("utf-8"), digest_size=KEY_BYTES
+    ).digest()
+
+
+class SentIndex:
+    """A bounded, persisted map of idempotency keys to the last delivered change.
+
+    Keys are fixed-size digests of the handler and launch id, mapped to a digest
+    of the change fingerprint last delivered. A launch is only skipped while its
+    current change is the one last delivered, so a change back to an earlier
+    state is delivered again. Entries are kept in delivery order so the index
+    never grows beyond `max_entries` keys (32 bytes each on disk).
+    """
+
+    def __init__(self, cache_dir: str, max_entries: int = SENT_INDEX_SIZE) -> None:
+        os.makedirs(cache_dir, exist_ok=True)
+        self.index_file = Path(cache_dir) / SENT_INDEX_FILE
+        self.max_entries = max_entries
+        self._entries: OrderedDict[bytes, bytes] = OrderedDict()
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self) -> None:
+        if not self.index_file.exists():
+            return
+        try:
+            data = self.index_file.read_bytes()
+        except IOError as e:
+            logger.warning(f"Failed to load sent index: {e}")
+            return
+        if not data.startswith(SENT_INDEX_MAGIC):
+            logger.warning("Ignoring unrecognised sent index {}", self.index_file)
+            return
+        body = data[len(SENT_INDEX_MAGIC) :]
+        for start in range(0, len(body) - len(body) % ENTRY_BYTES, ENTRY_BYTES):
+            key = body[start : start + KEY_BYTES]
+            self._entries[key] = body[start + KEY_BYTES : start + ENTRY_BYTES]
+            self._entries.move_to_end(key)
+        self._trim()
+
+    def _save(self) -> None:
+        temp_file = self.index_file.with_suffix(".tmp")
+        try:
+            entries = b"".join(key + digest for key, digest in self._entries.items())
+            temp_file.write_bytes(SENT_INDEX_MAGIC + entries)
+            os.replace(temp_file, self.index_file)
+        except IOError as e:
+            logger.warning(f"Failed to save sent index: {e}")
+
+    def _trim(self) -> None:
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def is_delivered(self, name: str, launch: dict[str, Any]) -> bool:
+        """True if the current change of launch is the last one `name` delivered"""
+        key = idempotency_key(name, launch)
+        with self._lock:
+            return self._entries.get(key) == change_digest(launch)
+
+    def add(self, deliveries: Sequence[tuple[bytes, bytes]]) -> None:
+        """record delivered (idempotency key, change digest) pairs and persist the index"""
+        with self._lock:
+            for key, digest in deliveries:
+                self._entries[key] = digest
+                self._entries.move_to_end(key)
+            self._trim()
+            self._save()
+
+    def unsent_jobs(self, jobs: Sequence[NotificationJob]) -> list[NotificationJob | None]:
+        """Return each job narrowed to the launches its handler has not delivered,
+        or None when there is nothing left to send. Jobs narrowed to the same
+        launches share one launches dict, so shared renderers still render once."""
+        narrowed: list[NotificationJob | None] = []
+        selections: dict[tuple[int, ...], dict[str, Any]] = {}
+        for job in jobs:
+            name = handler_name(job.handler)
+            results = job.launches.get("results", [])
+            unsent = [launch for launch in results if not self.is_delivered(name, launch)]
+            if not unsent:
+                logger.info("Skipping notification for {}, already delivered", job.handler)
+                narrowed.append(None)
+            elif len(unsent) == len(results):
+                narrowed.append(job)
+            else:
+                logger.info(
+                    "{} of {} launches already delivered by {}",
+                    len(results) - len(unsent),
+                    len(results),
+                    job.handler,
+                )
+                launches_key = (id(job.launches), *map(id, unsent))
+                if launches_key not in selections:
+                    selections[launches_key] = select_launches(job.launches, unsent)
+                narrowed.append(NotificationJob(job.handler, selections[launches_key]))
+        return narrowed
+
+    def dispatch(
+        self,
+        jobs: Sequence[NotificationJob],
+        dispatch: Callable[[Sequence[NotificationJob]], list[DispatchResult]] = (
+            dispatch_notifications
+        ),
+    ) -> list[DispatchResult]:
+        """Dispatch only undelivered changes, recording delivered ones.
+        Returns one result per job, with fully delivered jobs reported as skipped."""
+        narrowed = self.unsent_jobs(jobs)
+        sent = dispatch([job for job in narrowed if job is not None])
+        delivered = [
+            (idempotency_key(handler_name(result.job.handler), launch), change_digest(launch))
+            for result in sent
+            if result.success
+            for launch in result.job.launches.get("results", [])
+        ]
+        if delivered:
+            self.add(delivered)
+
+        results = iter(sent)
+        return [
+            next(results) if job is not None else DispatchResult(original, True, 0.0, skipped=True)
+            for original, job in zip(jobs, narrowed, strict=True)
+        ]
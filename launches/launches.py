@@ -13,18 +13,41 @@ SPDX-License-Identifier: MIT OR Apache-2.0
 
 import time
 from collections.abc import Sequence
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
-from typing import Any, Optional
+from typing import TYPE_CHECKING, Any, Optional
 
 import schedule
 from loguru import logger
 
-from launches.cache import LaunchCache
-from launches.errors import LaunchesError, NotificationError
+from launches.cache import LaunchCache, with_all_new
+from launches.errors import LaunchesError
+from launches.metrics import COUNT_BUCKETS, METRICS
+from launches.outbox import NotificationOutbox, OutboxWorker
+from launches.scheduling import (
+    GuardedJob,
+    RunRecord,
+    is_daily_run_missed,
+    observe_scheduler_lag,
+    scheduler_sleep_seconds,
+)
+from launches.subscriptions import get_notification_windows
 
 from .ll2 import LaunchLibrary2Client
+from .notifications.dispatch import (
+    DispatchResult,
+    dispatch_notifications,
+    get_notification_jobs,
+)
 from .notifications.handlers import NotificationHandler
 
+if TYPE_CHECKING:
+    from launches.reload import ConfigReloader
+
+CHANGED_LAUNCHES = METRICS.histogram(
+    "launches_changed_launches", "Changed launches found per check", buckets=COUNT_BUCKETS
+)
+
 
 def get_window_datetime(window_hours: int) -> datetime:
     """Get API compatible timestamp for
@@ -44,21 +67,24 @@ def get_upcoming_launches(window_hours: int, env: str = "prod") -> dict[str, Any
 def send_notification(
     launches: dict[str, Any],
     notification_handlers: Sequence[NotificationHandler],
-) -> None:
+    outbox: Optional[NotificationOutbox] = None,
+) -> list[DispatchResult]:
     """Build and send a notification using the provided launches,
-    subject_render, body_renderer, and notification service"""
+    subject_render, body_renderer, and notification service.
+    Handlers send concurrently and a failing handler does not affect the others.
+    With an outbox, notifications are persisted first and failures retried later."""
     logger.info(
         "{} upcoming launches, attempting to send notifications",
         launches["count"],
     )
     logger.debug("configured notification handlers {}", notification_handlers)
 
-    # attempt to send the notification
-    try:
-        for notification_handler in notification_handlers:
-            notification_handler.send(launches)
-    except NotificationError as ex:
-        logger.error("Error encounted attempting to send notification: {}", ex)
+    jobs = get_notification_jobs(launches, notification_handlers)
+    results = outbox.deliver(jobs) if outbox is not None else dispatch_notifications(jobs)
+    failed = sum(1 for result in results if not result.success)
+    if failed:
+        logger.error("{}/{} notifications failed to send", failed, len(results))
+    return results
 
 
 def check_for_upcoming_launches(
@@ -66,7 +92,9 @@ def check_for_upcoming_launches(
     notification_handlers: Sequence[NotificationHandler],
     ll2_client: LaunchLibrary2Client,
     cache: Optional[LaunchCache] = None,
-) -> None:
+    outbox: Optional[NotificationOutbox] = None,
+    deadline_seconds: Optional[float] = None,
+) -> bool:
     """Run a check for upcoming launches and send notifications if needed.
 
     Args:
@@ -75,6 +103,13 @@ def check_for_upcoming_launches(
         ll2_client (LaunchLibrary2Client): Client for accessing the Launch Library API.
         cache (Optional[LaunchCache]): Cache instance to filter unchanged launches.
             If provided, only changed launches will trigger notifications.
+        outbox (Optional[NotificationOutbox]): Durable queue notifications are
+            delivered through, so failed sends are retried rather than lost.
+        deadline_seconds (Optional[float]): The check's deadline, the request for
+            launches times out rather than outlive it.
+
+    Returns:
+        bool: False if upcoming launches could not be retrieved, True otherwise.
     """
     logger.info("Checking for upcoming launches within a {} hour window", window_hours)
 
@@ -83,27 +118,98 @@ def check_for_upcoming_launches(
         window_start_lt = datetime.now(tz=timezone.utc) + timedelta(hours=window_hours)
 
         # Get launches from the API
-        launches = ll2_client.get_upcoming_launches_within_window(window_start_lt)
+        launches = ll2_client.get_upcoming_launches_within_window(
+            window_start_lt, timeout=deadline_seconds
+        )
 
         # Filter for changes if cache is enabled
         if cache is not None:
-            changed_launches = cache.get_changed_launches(launches)
+            changed_launches = cache.get_changed_launches(
+                launches, get_notification_windows(notification_handlers)
+            )
             logger.info(
                 "Changed launches: {}/{}",
                 changed_launches["count"],
                 launches["count"],
             )
             launches = changed_launches
+        else:
+            launches = with_all_new(launches)
     except LaunchesError as ex:
         logger.exception("Exception occured while attempting to get upcoming launches", ex)
-        return
+        return False
 
+    CHANGED_LAUNCHES.observe(launches["count"])
     if launches["count"] > 0:
         # Send notification only if there are launches to report
         logger.info("Found {} launches to report", launches["count"])
-        send_notification(launches, notification_handlers)
+        send_notification(launches, notification_handlers, outbox)
     else:
         logger.info(f"No new or changed launches found within a {window_hours} hour window.")
+    return True
+
+
+@dataclass
+class LaunchCheck:
+    """A check for upcoming launches, as run by the scheduler. The window,
+    handlers and deadline are read on every run, so a ConfigReloader can replace
+    them while the service runs."""
+
+    window_hours: int
+    notification_handlers: Sequence[NotificationHandler]
+    ll2_client: LaunchLibrary2Client
+    cache: Optional[LaunchCache] = None
+    outbox: Optional[NotificationOutbox] = None
+    deadline_seconds: Optional[float] = None
+
+    def __call__(self) -> bool:
+        return check_for_upcoming_launches(
+            self.window_hours,
+            self.notification_handlers,
+            self.ll2_client,
+            self.cache,
+            self.outbox,
+            self.deadline_seconds,
+        )
+
+
+def schedule_daily_checks(
+    job: GuardedJob, specific_times: list[str], tz: str
+) -> list[schedule.Job]:
+    """schedule job at each of the times of day in tz"""
+    return [schedule.every().day.at(time_str, tz).do(job) for time_str in specific_times]
+
+
+def schedule_periodic_checks(job: GuardedJob, repeat_hours: int) -> list[schedule.Job]:
+    """schedule job every repeat_hours"""
+    return [schedule.every(repeat_hours).hours.do(job)]
+
+
+def run_pending_forever(
+    outbox: Optional[NotificationOutbox] = None,
+    reloader: Optional["ConfigReloader"] = None,
+) -> None:
+    """run scheduled checks until interrupted, retrying the outbox in the background
+    and applying configuration changes between checks"""
+    worker = OutboxWorker(outbox) if outbox is not None else None
+    if worker is not None:
+        worker.start()
+    try:
+        while True:
+            observe_scheduler_lag(schedule.get_jobs())
+            schedule.run_pending()
+            if reloader is not None:
+                try:
+                    reloader.poll()
+                except Exception as ex:
+                    # a bad reload must not stop the scheduler, the running config stays
+                    logger.exception("Unhandled exception reloading configuration: {}", ex)
+            time.sleep(scheduler_sleep_seconds(schedule.idle_seconds()))
+    except KeyboardInterrupt:
+        return
+    finally:
+        if worker is not None:
+            worker.stop()
 
 
 def run_upcoming_launches_daily(
@@ -113,13 +219,18 @@ def run_upcoming_launches_daily(
     notification_handlers: list[NotificationHandler],
     ll2_client: LaunchLibrary2Client,
     cache: Optional[LaunchCache] = None,
+    deadline_seconds: Optional[float] = None,
+    run_record: Optional[RunRecord] = None,
+    outbox: Optional[NotificationOutbox] = None,
+    reloader: Optional["ConfigReloader"] = None,
 ) -> None:
     """
     Schedules and runs tasks to check for upcoming rocket launches.
 
     This function sets up a schedule to check for upcoming launches at specific times
     each day, using the provided search window and notification handlers. It does NOT
-    perform an immediate check upon invocation.
+    perform an immediate check upon invocation, unless `run_record` shows a scheduled
+    check was missed while the service was down, in which case one catch-up check runs.
 
     Args:
         search_window_hrs (int): The number of hours ahead to search for upcoming launches.
@@ -131,21 +242,33 @@ def run_upcoming_launches_daily(
             interact with the launch library API.
         cache (Optional[LaunchCache], optional): Cache instance to filter unchanged launches.
             Defaults to None.
+        deadline_seconds (Optional[float], optional): Abandon checks running longer than
+            this. Defaults to None (no deadline).
+        run_record (Optional[RunRecord], optional): Persisted record of the last
+            successful check, used to catch up missed checks. Defaults to None.
+        outbox (Optional[NotificationOutbox], optional): Durable notification queue,
+            retried by a background worker while the service runs. Defaults to None.
+        reloader (Optional[ConfigReloader], optional): Applies changes to the
+            configuration file while the service runs. Defaults to None.
 
     Returns:
         None
     """
-    for time_str in specific_times:
-        schedule.every().day.at(time_str, tz).do(
-            check_for_upcoming_launches, search_window_hrs, notification_handlers, ll2_client, cache
-        )
+    check = LaunchCheck(
+        search_window_hrs, notification_handlers, ll2_client, cache, outbox, deadline_seconds
+    )
+    job = GuardedJob(check, deadline_seconds, run_record)
+    entries = schedule_daily_checks(job, specific_times, tz)
+    if reloader is not None:
+        reloader.attach(check, job, entries)
 
-    try:
-        while True:
-            schedule.run_pending()
-            time.sleep(30)
-    except KeyboardInterrupt:
-        return
+    if run_record is not None and is_daily_run_missed(
+        run_record.last_success(), specific_times, tz
+    ):
+        logger.info("A scheduled check was missed, running a catch-up check")
+        job()
+
+    run_pending_forever(outbox, reloader)
 
 
 def run_upcoming_launches_periodic(
@@ -154,6 +277,10 @@ def run_upcoming_launches_periodic(
     notification_handlers: list[NotificationHandler],
     ll2_client: LaunchLibrary2Client,
     cache: Optional[LaunchCache] = None,
+    deadline_seconds: Optional[float] = None,
+    run_record: Optional[RunRecord] = None,
+    outbox: Optional[NotificationOutbox] = None,
+    reloader: Optional["ConfigReloader"] = None,
 ) -> None:
     """
     Periodically checks for upcoming rocket launches and sends notifications.
@@ -171,21 +298,27 @@ def run_upcoming_launches_periodic(
             used to fetch launch data.
         cache (Optional[LaunchCache], optional): Cache instance to filter unchanged launches.
             Defaults to None.
+        deadline_seconds (Optional[float], optional): Abandon checks running longer than
+            this. Defaults to None (no deadline).
+        run_record (Optional[RunRecord], optional): Persisted record of the last
+            successful check. Defaults to None.
+        outbox (Optional[NotificationOutbox], optional): Durable notification queue,
+            retried by a background worker while the service runs. Defaults to None.
+        reloader (Optional[ConfigReloader], optional): Applies changes to the
+            configuration file while the service runs. Defaults to None.
 
     Returns:
         None
     """
-
-    schedule.every(repeat_hours).hours.do(
-        check_for_upcoming_launches, window_hours, notification_handlers, ll2_client, cache
+    check = LaunchCheck(
+        window_hours, notification_handlers, ll2_client, cache, outbox, deadline_seconds
     )
+    job = GuardedJob(check, deadline_seconds, run_record)
+    entries = schedule_periodic_checks(job, repeat_hours)
+    if reloader is not None:
+        reloader.attach(check, job, entries)
 
     # run a check immediately
-    check_for_upcoming_launches(window_hours, notification_handlers, ll2_client, cache)
+    job()
 
-    try:
-        while True:
-            schedule.run_pending()
-            time.sleep(30)
-    except KeyboardInterrupt:
-        return
+    run_pending_forever(outbox, reloader)
@@ -5,13 +5,15 @@ SPDX-License-Identifier: MIT OR Apache-2.0
 """
 
 import json
-from datetime import datetime
+from datetime import datetime, timezone
+from functools import lru_cache
 from typing import Any
 
 import requests.exceptions
 from loguru import logger
 
 from launches.errors import LL2RequestError
+from launches.metrics import BYTES_BUCKETS, METRICS
 
 LAUNCH_DT_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
 LL2_API_URL = {
@@ -19,6 +21,67 @@ LL2_API_URL = {
     "dev": "https://lldev.thespacedevs.com/2.2.0/",
 }
 
+LAUNCH_TIME_CACHE_SIZE = 4096  # parsed timestamps kept by parse_launch_time
+
+LL2_REQUEST_SECONDS = METRICS.histogram(
+    "launches_ll2_request_seconds", "Launch Library 2 request latency", ("endpoint",)
+)
+LL2_RESPONSES = METRICS.counter(
+    "launches_ll2_responses_total",
+    "Launch Library 2 responses by status code, error if no response was received",
+    ("status",),
+)
+LL2_RESPONSE_BYTES = METRICS.histogram(
+    "launches_ll2_response_bytes", "Launch Library 2 response payload size", buckets=BYTES_BUCKETS
+)
+LL2_DECODE_SECONDS = METRICS.histogram(
+    "launches_ll2_decode_seconds", "Time to decode Launch Library 2 response JSON"
+)
+
+
+@lru_cache(maxsize=LAUNCH_TIME_CACHE_SIZE)
+def parse_launch_time(iso_time: str) -> datetime | None:
+    """Parse an LL2 LAUNCH_DT_FORMAT timestamp into an aware UTC datetime.
+    Returns None if iso_time is not a timestamp in that format.
+
+    Equivalent to strptime with LAUNCH_DT_FORMAT, but parses the fixed-width
+    fields directly and is memoized, since the same timestamps are parsed many
+    times while filtering and rendering a digest."""
+    if (
+        not isinstance(iso_time, str)
+        or len(iso_time) != 20
+        or iso_time[4] != "-"
+        or iso_time[7] != "-"
+        or iso_time[10] != "T"
+        or iso_time[13] != ":"
+        or iso_time[16] != ":"
+        or iso_time[19] != "Z"
+    ):
+        return None
+    fields = (
+        iso_time[0:4],
+        iso_time[5:7],
+        iso_time[8:10],
+        iso_time[11:13],
+        iso_time[14:16],
+        iso_time[17:19],
+    )
+    if not all(field.isdigit() for field in fields):
+        return None
+    try:
+        return datetime(*(int(field) for field in fields), tzinfo=timezone.utc)
+    except ValueError:
+        return None
+
+
+def is_within_window(launch: dict[str, Any], window_end: datetime) -> bool:
+    """True if the launch window starts before window_end. Launches without a
+    parsable window_start are kept rather than silently dropped."""
+    window_start = parse_launch_time(launch.get("window_start"))
+    if window_start is None:
+        return True
+    return window_start < window_end
+
 
 class LaunchLibrary2Client:
     LL2_UPCOMING_ENDPOINT = "launch/upcoming/"
@@ -30,21 +93,34 @@ class LaunchLibrary2Client:
         self.env = env
         self.base_url = LL2_API_URL[env]
 
-    def ll2_get(self, endpoint: str, parameters: dict) -> requests.Response:
+    def ll2_get(
+        self, endpoint: str, parameters: dict, timeout: float | None = None
+    ) -> requests.Response:
         """make a get request to the launch library at the
-        provided endpoint using the provided parameters"""
+        provided endpoint using the provided parameters,
+        waiting at most timeout (default REQUEST_TIMEOUT) seconds"""
+        if timeout is None or timeout > self.REQUEST_TIMEOUT:
+            timeout = self.REQUEST_TIMEOUT
         logger.info(
             "Making request to space launch library endpoint {} with parameters: {}",
             endpoint,
             parameters,
         )
         try:
-            resp = requests.get(
-                self.base_url + endpoint,
-                params=parameters,
-                timeout=self.REQUEST_TIMEOUT,
-            )
-            logger.info("Space launch library response status code: {}", resp.status_code)
+            with LL2_REQUEST_SECONDS.time(endpoint=endpoint):
+                resp = requests.get(
+                    self.base_url + endpoint,
+                    params=parameters,
+                    timeout=timeout,
+                )
+        except requests.exceptions.RequestException as ex:
+            LL2_RESPONSES.inc(status="error")
+            raise LL2RequestError(f"Error getting space launches {ex}") from ex
+
+        logger.info("Space launch library response status code: {}", resp.status_code)
+        LL2_RESPONSES.inc(status=resp.status_code)
+        LL2_RESPONSE_BYTES.observe(len(resp.content))
+        try:
             resp.raise_for_status()
         except requests.exceptions.RequestException as ex:
             raise LL2RequestError(f"Error getting space launches {ex}") from ex
@@ -54,6 +130,7 @@ class LaunchLibrary2Client:
     def get_upcoming_launches_within_window(
         self,
         window_start_lt: datetime,
+        timeout: float | None = None,
     ) -> dict[str, Any]:
         """Make a request to the space launch library for upcoming launches where the
         window is less than the provided datetime raises a RequestError
@@ -61,6 +138,8 @@ class LaunchLibrary2Client:
 
         Args:
             window_start_lt (datetime): The cutoff time for the launch window.
+            timeout (float | None): Seconds to wait for the response, e.g. the time
+                left before a check's deadline. Defaults to REQUEST_TIMEOUT.
 
         Returns:
             dict[str, Any]: Dictionary containing launch data.
@@ -71,11 +150,12 @@ class LaunchLibrary2Client:
             "mode": "detailed",
         }
 
-        resp = self.ll2_get(self.LL2_UPCOMING_ENDPOINT, parameters)
+        resp = self.ll2_get(self.LL2_UPCOMING_ENDPOINT, parameters, timeout=timeout)
 
         # attempt to decode response as JSON
         try:
-            launches = resp.json()
+            with LL2_DECODE_SECONDS.time():
+                launches = resp.json()
             logger.debug(f"ll2 response: {resp.text}")
         except json.JSONDecodeError as ex:
             raise LL2RequestError(f"Unable to decode response JSON {ex}") from ex
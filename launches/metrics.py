@@ -0,0 +1,285 @@
+"""Space Launch Notifications - Metrics Module
+
+Counters and histograms for the service loop, exposed in the Prometheus
+text format by an optional stdlib HTTP endpoint. Recording a sample costs a
+lock and a few additions, so metrics are always recorded and only served
+when the endpoint is enabled.
+
+Copyright ©️ 2025 Scott Cummings
+SPDX-License-Identifier: MIT OR Apache-2.0
+"""
+
+import bisect
+import math
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from typing import TYPE_CHECKING
+
+from loguru import logger
+
+if TYPE_CHECKING:
+    from http.server import ThreadingHTTPServer
+
+DEFAULT_METRICS_HOST = "127.0.0.1"
+METRICS_PATH = "/metrics"
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+SECONDS_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+BYTES_BUCKETS = (1e3, 1e4, 1e5, 1e6, 1e7, 1e8)
+COUNT_BUCKETS = (0.0, 1.0, 2.0, 5.0, 10.0, 25.0, 50.0, 100.0)
+
+LabelValues = tuple[str, ...]
+
+
+def format_value(value: float) -> str:
+    """format a sample value, integers without a decimal point"""
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if value == int(value):
+        return str(int(value))
+    return repr(value)
+
+
+def escape_label(value: str) -> str:
+    """escape a label value for the text format"""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def format_labels(names: tuple[str, ...], values: LabelValues, extra: str = "") -> str:
+    """format label pairs, escaping their values"""
+    pairs = [f'{name}="{escape_label(value)}"' for name, value in zip(names, values, strict=True)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Counter:
+    """A monotonically increasing count per label values"""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labels: tuple[str, ...] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labels = labels
+        self._values: dict[LabelValues, float] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict[str, object]) -> LabelValues:
+        return tuple(str(labels[name]) for name in self.labels)
+
+    def inc(self, amount: float = 1.0, **labels: object) -> None:
+        """add amount to the count for labels"""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: object) -> float:
+        """return the count for labels"""
+        with self._lock:
+            return self._values.get(self._key(labels), 0.0)
+
+    def samples(self) -> Iterator[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        for key, value in values:
+            yield f"{self.name}{format_labels(self.labels, key)} {format_value(value)}"
+
+
+class Histogram:
+    """Observed values counted into cumulative buckets per label values"""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labels: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = SECONDS_BUCKETS,
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labels = labels
+        self.buckets = tuple(sorted(buckets))
+        # label values -> count per bucket (the last is +Inf), followed by the sum
+        self._values: dict[LabelValues, list[float]] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict[str, object]) -> LabelValues:
+        return tuple(str(labels[name]) for name in self.labels)
+
+    def observe(self, value: float, **labels: object) -> None:
+        """count value into its bucket for labels"""
+        key = self._key(labels)
+        position = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [0.0] * (len(self.buckets) + 2)
+            entry[position] += 1
+            entry[-1] += value
+
+    @contextmanager
+    def time(self, **labels: object) -> Iterator[None]:
+        """observe the seconds taken by the block, even if it raises"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def count(self, **labels: object) -> int:
+        """return the number of values observed for labels"""
+        with self._lock:
+            entry = self._values.get(self._key(labels))
+            return int(sum(entry[:-1])) if entry is not None else 0
+
+    def sum(self, **labels: object) -> float:
+        """return the sum of the values observed for labels"""
+        with self._lock:
+            entry = self._values.get(self._key(labels))
+            return entry[-1] if entry is not None else 0.0
+
+    def samples(self) -> Iterator[str]:
+        with self._lock:
+            values = sorted((key, list(entry)) for key, entry in self._values.items())
+        for key, entry in values:
+            cumulative = 0.0
+            for bound, count in zip((*self.buckets, math.inf), entry[:-1], strict=True):
+                cumulative += count
+                le = f'le="{format_value(bound)}"'
+                yield f"{self.name}_bucket{format_labels(self.labels, key, le)} {format_value(cumulative)}"
+            yield f"{self.name}_sum{format_labels(self.labels, key)} {format_value(entry[-1])}"
+            yield f"{self.name}_count{format_labels(self.labels, key)} {format_value(cumulative)}"
+
+
+class Gauge:
+    """Values read from a callback when the metrics are collected, one per label value"""
+
+    kind = "gauge"
+
+    def __init__(
+        self, name: str, documentation: str, label: str, collect: Callable[[], dict[str, float]]
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labels = (label,)
+        self.collect = collect
+
+    def samples(self) -> Iterator[str]:
+        for value, sample in sorted(self.collect().items()):
+            yield f"{self.name}{format_labels(self.labels, (str(value),))} {format_value(sample)}"
+
+
+Metric = Counter | Histogram | Gauge
+
+
+class MetricsRegistry:
+    """The metrics of a process by name. Metrics are created by the modules
+    recording them, asking for an existing name returns the same metric."""
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, Metric] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, name: str, create: Callable[[], Metric]) -> Metric:
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = create()
+            return metric
+
+    def counter(self, name: str, documentation: str, labels: tuple[str, ...] = ()) -> Counter:
+        """return the counter name, creating it on first use"""
+        return self._get(name, lambda: Counter(name, documentation, labels))  # type: ignore[return-value]
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labels: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = SECONDS_BUCKETS,
+    ) -> Histogram:
+        """return the histogram name, creating it on first use"""
+        return self._get(name, lambda: Histogram(name, documentation, labels, buckets))  # type: ignore[return-value]
+
+    def gauge(
+        self, name: str, documentation: str, label: str, collect: Callable[[], dict[str, float]]
+    ) -> Gauge:
+        """register a gauge read from collect, replacing any gauge of the same name"""
+        gauge = Gauge(name, documentation, label, collect)
+        with self._lock:
+            self._metrics[name] = gauge
+        return gauge
+
+    def render(self) -> str:
+        """return every metric in the Prometheus text exposition format"""
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda metric: metric.name)
+        lines = []
+        for metric in metrics:
+            try:
+                samples = list(metric.samples())
+            except Exception as ex:
+                # a failing gauge must not hide the other metrics
+                logger.warning("Unable to collect metric {}: {}", metric.name, ex)
+                continue
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(samples)
+        return "\n".join(lines) + "\n"
+
+
+METRICS = MetricsRegistry()
+
+
+class MetricsServer:
+    """Serves a MetricsRegistry at /metrics over HTTP on a background thread"""
+
+    def __init__(
+        self, port: int, host: str = DEFAULT_METRICS_HOST, registry: MetricsRegistry = METRICS
+    ) -> None:
+        self.host = host
+        self.port = port
+        self.registry = registry
+        self._server: ThreadingHTTPServer | None = None
+
+    def start(self) -> None:
+        """start serving, binding the configured port (0 binds a free port)"""
+        # http.server is only imported when the endpoint is enabled
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        registry = self.registry
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                if self.path.split("?", 1)[0] != METRICS_PATH:
+                    self.send_error(404)
+                    return
+                body = registry.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, fmt: str, *args: object) -> None:
+                logger.debug("Metrics request from {}: {}", self.address_string(), fmt % args)
+
+        self._server = ThreadingHTTPServer((self.host, self.port), MetricsHandler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        thread = threading.Thread(
+            target=self._server.serve_forever, name="launches-metrics", daemon=True
+        )
+        thread.start()
+        logger.info("Serving metrics at http://{}:{}{}", self.host, self.port, METRICS_PATH)
+
+    def stop(self) -> None:
+        """stop serving"""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
@@ -0,0 +1,269 @@
+"""Space Launch Notifications - Notification Dispatch Module
+
+Fans notifications out across a bounded worker pool. Every handler runs in
+isolation with its own timeout, so one failing or hung handler never stops
+or delays the others.
+
+The pool lives as long as the process and its workers are daemon threads. A
+send abandoned after its timeout keeps running, and keeps its worker, until it
+returns, but never delays the process from exiting.
+
+Copyright ©️ 2025 Scott Cummings
+SPDX-License-Identifier: MIT OR Apache-2.0
+"""
+
+import itertools
+import math
+import queue
+import threading
+import time
+from collections.abc import Callable, Iterator, Sequence
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from dataclasses import dataclass
+from typing import Any, Protocol
+
+from loguru import logger
+
+from launches.metrics import METRICS
+
+DEFAULT_MAX_WORKERS = 8  # maximum handlers sending concurrently across the process
+DEFAULT_HANDLER_TIMEOUT = 60.0  # seconds a single handler may take to send
+
+SEND_SECONDS = METRICS.histogram(
+    "launches_send_seconds", "Time a handler took to send a notification", ("handler",)
+)
+SENDS = METRICS.counter(
+    "launches_sends_total", "Notifications sent by handler and result", ("handler", "result")
+)
+
+
+class SendExecutor:
+    """A pool of daemon worker threads which lives as long as the process.
+
+    Unlike a ThreadPoolExecutor, whose workers are joined when the interpreter
+    exits, a worker stuck in an abandoned send never blocks exit. Workers are
+    started on demand, up to max_workers, and reused by every caller.
+    """
+
+    def __init__(self, max_workers: int, thread_name_prefix: str) -> None:
+        self.max_workers = max_workers
+        self.thread_name_prefix = thread_name_prefix
+        self._work: queue.SimpleQueue[tuple[Future, Callable[..., Any], tuple] | None] = (
+            queue.SimpleQueue()
+        )
+        self._idle = threading.Semaphore(0)
+        self._lock = threading.Lock()
+        self._workers = 0
+        self._counter = itertools.count()
+        self._shutdown = False
+
+    def submit(self, func: Callable[..., Any], *args: Any) -> Future:
+        """run func(*args) on a worker, returning its Future. Cancelling the
+        Future before a worker picks it up skips the call."""
+        if self._shutdown:
+            raise RuntimeError(f"{self.thread_name_prefix} executor has been shut down")
+        future: Future = Future()
+        self._work.put((future, func, args))
+        if not self._idle.acquire(blocking=False):
+            with self._lock:
+                if self._workers < self.max_workers:
+                    self._workers += 1
+                    name = f"{self.thread_name_prefix}_{next(self._counter)}"
+                    threading.Thread(target=self._run, name=name, daemon=True).start()
+        return future
+
+    def shutdown(self) -> None:
+        """stop the workers once the calls already submitted have run"""
+        with self._lock:
+            self._shutdown = True
+            workers, self._workers = self._workers, 0
+        for _ in range(workers):
+            self._work.put(None)
+
+    def _run(self) -> None:
+        while True:
+            work = self._work.get()
+            if work is None:
+                return
+            future, func, args = work
+            if future.set_running_or_notify_cancel():
+                try:
+                    future.set_result(func(*args))
+                except BaseException as ex:
+                    future.set_exception(ex)
+            self._idle.release()
+
+
+SEND_EXECUTOR = SendExecutor(DEFAULT_MAX_WORKERS, "launches-dispatch")
+
+
+class Sender(Protocol):
+    """Anything which can send a notification from a launches dict"""
+
+    def send(self, launches: dict[str, Any]) -> None:
+        """send notification"""
+        raise NotImplementedError()
+
+
+@dataclass
+class NotificationJob:
+    """A change set to be sent by a single handler"""
+
+    handler: Sender
+    launches: dict[str, Any]
+
+
+class NotificationRouter(Protocol):
+    """A handler which routes a change set to other handlers, e.g. subscriptions"""
+
+    def notification_jobs(self, launches: dict[str, Any]) -> list[NotificationJob]:
+        """return the jobs needed to deliver launches"""
+        raise NotImplementedError()
+
+    def routed_handlers(self) -> list[Sender]:
+        """return every handler the router may route to"""
+        raise NotImplementedError()
+
+
+@dataclass
+class DispatchResult:
+    """The outcome of a single NotificationJob"""
+
+    job: NotificationJob
+    success: bool
+    elapsed: float
+    error: BaseException | None = None
+    skipped: bool = False  # the job had already been delivered and was not sent again
+
+
+def handler_name(handler: Sender) -> str:
+    """the stable name a handler's notifications are recorded under"""
+    return getattr(handler, "name", "") or repr(handler)
+
+
+def is_router(handler: Sender) -> bool:
+    """True if the handler routes change sets to other handlers"""
+    # look the method up on the type so mocks and plain handlers are never routers
+    return callable(getattr(type(handler), "notification_jobs", None))
+
+
+def iter_handlers(notification_handlers: Sequence[Sender]) -> Iterator[Sender]:
+    """yield every handler which may send, expanding routers into their handlers"""
+    for handler in notification_handlers:
+        if is_router(handler):
+            router: NotificationRouter = handler  # type: ignore[assignment]
+            yield from router.routed_handlers()
+        else:
+            yield handler
+
+
+def get_notification_jobs(
+    launches: dict[str, Any], notification_handlers: Sequence[Sender]
+) -> list[NotificationJob]:
+    """build one job per handler, expanding routers into the jobs they route to"""
+    jobs: list[NotificationJob] = []
+    for handler in notification_handlers:
+        if is_router(handler):
+            router: NotificationRouter = handler  # type: ignore[assignment]
+            jobs.extend(router.notification_jobs(launches))
+        else:
+            jobs.append(NotificationJob(handler, launches))
+    return jobs
+
+
+def observe_send(result: DispatchResult) -> None:
+    """record a handler's send latency and result"""
+    name = handler_name(result.job.handler)
+    if result.success:
+        outcome = "success"
+    elif isinstance(result.error, TimeoutError):
+        outcome = "timeout"
+    else:
+        outcome = "failure"
+    SEND_SECONDS.observe(result.elapsed, handler=name)
+    SENDS.inc(handler=name, result=outcome)
+
+
+def send_observed(job: NotificationJob) -> None:
+    """send a single job on the calling thread, recording its latency and result"""
+    started = time.monotonic()
+    try:
+        job.handler.send(job.launches)
+    except BaseException as ex:
+        observe_send(DispatchResult(job, False, time.monotonic() - started, ex))
+        raise
+    observe_send(DispatchResult(job, True, time.monotonic() - started))
+
+
+def dispatch_notifications(
+    jobs: Sequence[NotificationJob],
+    timeout: float = DEFAULT_HANDLER_TIMEOUT,
+    executor: SendExecutor = SEND_EXECUTOR,
+) -> list[DispatchResult]:
+    """Run every job concurrently, returning one DispatchResult per job in job order.
+
+    Each job's timeout starts when a worker picks it up. A timed out handler keeps
+    its worker thread until it returns, but the dispatcher no longer waits for it.
+    """
+    if not jobs:
+        return []
+
+    started: dict[int, float] = {}
+    results: dict[int, DispatchResult] = {}
+
+    def run(position: int) -> None:
+        started[position] = time.monotonic()
+        jobs[position].handler.send(jobs[position].launches)
+
+    # a job still waiting for a worker after every wave could have run is abandoned
+    queued_deadline = time.monotonic() + timeout * math.ceil(len(jobs) / executor.max_workers)
+    futures: dict[Future, int] = {}
+    try:
+        for position in range(len(jobs)):
+            futures[executor.submit(run, position)] = position
+        pending = set(futures)
+        while pending:
+            now = time.monotonic()
+            deadlines = [
+                started[futures[f]] + timeout if futures[f] in started else queued_deadline
+                for f in pending
+            ]
+            wait_for = max(0.0, min(deadlines) - now)
+            done, pending = wait(pending, timeout=wait_for, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                position = futures[future]
+                elapsed = time.monotonic() - started.get(position, now)
+                error = future.exception()
+                results[position] = DispatchResult(jobs[position], error is None, elapsed, error)
+
+            now = time.monotonic()
+            for future in list(pending):
+                position = futures[future]
+                if position in started and now - started[position] >= timeout:
+                    error = TimeoutError(f"handler timed out after {timeout}s")
+                elif position not in started and now >= queued_deadline:
+                    error = TimeoutError("handler timed out waiting for a worker")
+                else:
+                    continue
+                pending.discard(future)
+                results[position] = DispatchResult(
+                    jobs[position], False, now - started.get(position, now), error
+                )
+    finally:
+        # abandoned jobs which have not started are skipped
+        for future in futures:
+            future.cancel()
+
+    for position in sorted(results):
+        result = results[position]
+        observe_send(result)
+        if result.success:
+            logger.debug("{} sent in {:.2f}s", result.job.handler, result.elapsed)
+        else:
+            logger.error(
+                "Error encounted attempting to send notification with {}: {}",
+                result.job.handler,
+                result.error,
+            )
+    return [results[position] for position in range(len(jobs))]
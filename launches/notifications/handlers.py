@@ -7,52 +7,284 @@ Copyright ©️ 2025 Scott Cummings
 SPDX-License-Identifier: MIT OR Apache-2.0
 """
 
-from dataclasses import dataclass
-from typing import Any
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Any, NamedTuple
 
 from loguru import logger
 
 from launches.config import NotificationHandlerConfig
-from launches.errors import ConfigError
+from launches.errors import ConfigError, DeliveryError, NotificationError
+from launches.notifications.dispatch import Sender, SendExecutor
 from launches.notifications.renderers import (
     NotificationRenderer,
+    StreamingNotificationRenderer,
     get_notification_renderer,
 )
 from launches.notifications.services import (
     NotificationService,
+    RecipientNotificationService,
+    StreamingNotificationService,
+    get_capabilities,
     get_notification_service,
+    get_service_class,
+    recipient_timezones,
+    supports_streaming,
 )
 
+RENDER_CACHE_SIZE = 32  # rendered notifications kept across renderers and change sets
+MAX_GROUP_WORKERS = 4  # timezone groups sent concurrently by pooled services
+
+# shared by every handler, separate from the dispatch pool since group sends are
+# submitted from handlers already running on a dispatch worker
+GROUP_EXECUTOR = SendExecutor(MAX_GROUP_WORKERS, "launches-groups")
+
+
+class RenderedNotification(NamedTuple):
+    """The rendered parts of a notification"""
+
+    subject: str
+    text_body: str
+    formatted_body: str | None
+
+
+class RenderCache:
+    """Memoizes rendered notifications by renderer and change set identity.
+
+    Handlers sharing a renderer render each change set exactly once. Entries hold
+    references to their renderer and launches so identities are never reused
+    while cached.
+    """
+
+    def __init__(self, maxsize: int = RENDER_CACHE_SIZE) -> None:
+        self.maxsize = maxsize
+        self._entries: OrderedDict[
+            tuple[int, int], tuple[NotificationRenderer, dict[str, Any], RenderedNotification]
+        ] = OrderedDict()
+        self._rendering: dict[tuple[int, int], Future] = {}
+        self._lock = threading.Lock()
+
+    def render(
+        self, renderer: NotificationRenderer, launches: dict[str, Any]
+    ) -> RenderedNotification:
+        """return the rendered notification, rendering it on first use"""
+        key = (id(renderer), id(launches))
+        # handlers dispatch concurrently; concurrent handlers wait for the render
+        # in progress for their key rather than repeat it, while renders of other
+        # keys proceed outside the lock
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return entry[2]
+            rendering = self._rendering.get(key)
+            if rendering is None:
+                rendering = self._rendering[key] = Future()
+                owner = True
+            else:
+                owner = False
+        if not owner:
+            return rendering.result()
+
+        try:
+            rendered = RenderedNotification(
+                renderer.render_subject(launches),
+                renderer.render_text_body(launches),
+                renderer.render_formatted_body(launches),
+            )
+        except BaseException as ex:
+            with self._lock:
+                del self._rendering[key]
+            rendering.set_exception(ex)
+            raise
+        with self._lock:
+            del self._rendering[key]
+            self._entries[key] = (renderer, launches, rendered)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        rendering.set_result(rendered)
+        return rendered
+
+
+RENDER_CACHE = RenderCache()
+
 
 @dataclass
 class NotificationHandler:
     """Composition of a NotificationRender and a NotificationService.
-    Renders and sends a notification from a launches dict"""
+    Renders and sends a notification from a launches dict.
+
+    Streaming handlers render the bodies into the service as they are sent, so
+    peak memory stays bounded regardless of digest size. Streamed bodies bypass
+    the render cache. A handler with `max_sends_per_hour` has its changes held
+    and merged by a ChangeCoalescer between sends.
+
+    When the service's recipients declare timezones, the notification is
+    rendered once per distinct timezone and each group of recipients is sent
+    its own rendering. Services with pooled connections are sent the groups
+    concurrently."""
 
     renderer: NotificationRenderer
     service: NotificationService
+    render_cache: RenderCache = field(default=RENDER_CACHE, repr=False, compare=False)
+    stream: bool = False
+    name: str = ""
+    max_sends_per_hour: float | None = None
 
     def send(self, launches: dict[str, Any]) -> None:
         """render and send a notification from the launches dict"""
-        subject = self.renderer.render_subject(launches)
-        text_body = self.renderer.render_text_body(launches)
-        formatted_body = self.renderer.render_formatted_body(launches)
+        if self.stream:
+            renderer: StreamingNotificationRenderer = self.renderer  # type: ignore[assignment]
+            service: StreamingNotificationService = self.service  # type: ignore[assignment]
+            service.send_stream(
+                renderer.render_subject(launches),
+                renderer.stream_text_body(launches),
+                renderer.stream_formatted_body(launches),
+            )
+            return
+        groups = recipient_timezones(self.service)
+        if groups is not None:
+            self.send_by_timezone(launches, groups)
+            return
+        subject, text_body, formatted_body = self.render_cache.render(self.renderer, launches)
         self.service.send(subject, text_body, formatted_body)
 
+    def close(self) -> None:
+        """release resources held by the service, e.g. pooled connections"""
+        close = getattr(self.service, "close", None)
+        if callable(close):
+            close()
+
+    def send_by_timezone(
+        self, launches: dict[str, Any], groups: dict[str | None, list[str]]
+    ) -> None:
+        """Render once per timezone and send each rendering to its recipients.
+        Every group is attempted, raising a DeliveryError for the recipients
+        of any group which failed."""
+        service: RecipientNotificationService = self.service  # type: ignore[assignment]
+        by_renderer: dict[NotificationRenderer, list[str]] = {}
+        for tz, recipients in groups.items():
+            renderer = self.renderer if tz is None else self.renderer.localized(tz)
+            by_renderer.setdefault(renderer, []).extend(recipients)
+
+        def send_group(group: tuple[NotificationRenderer, list[str]]) -> list[str]:
+            """send a group its rendering, returning the recipients which failed"""
+            renderer, recipients = group
+            subject, text_body, formatted_body = self.render_cache.render(renderer, launches)
+            try:
+                service.send_to(recipients, subject, text_body, formatted_body)
+            except DeliveryError as ex:
+                return ex.failed_recipients
+            except NotificationError as ex:
+                logger.error("Unable to send notification to {}: {}", recipients, ex)
+                return recipients
+            return []
+
+        if get_capabilities(service).pooled and len(by_renderer) > 1:
+            futures = [GROUP_EXECUTOR.submit(send_group, group) for group in by_renderer.items()]
+            failures = [future.result() for future in futures]
+        else:
+            failures = [send_group(group) for group in by_renderer.items()]
+        failed = [recipient for group_failed in failures for recipient in group_failed]
+        if failed:
+            raise DeliveryError(f"Unable to send notification to {len(failed)} recipients", failed)
+
+
+class HandlerReuse:
+    """Handlers kept across configuration reloads.
+
+    Handlers are keyed by name and configuration, so a reload rebuilds only the
+    handlers whose configuration changed; unchanged handlers keep their
+    authenticated services, pooled connections and caches.
+    """
+
+    def __init__(self, previous: "HandlerReuse | None" = None) -> None:
+        self._previous = previous._handlers if previous is not None else {}
+        self._handlers: dict[tuple[str, str], Sender] = {}
+
+    def get(
+        self, name: str, handler_config: NotificationHandlerConfig, build: Callable[[], Sender]
+    ) -> Sender:
+        """return the previous handler for this name and configuration, or build one"""
+        key = (name, handler_config.model_dump_json())
+        handler = self._previous.get(key)
+        if handler is None:
+            handler = build()
+        else:
+            logger.debug("Keeping unchanged notification handler {}", name)
+        self._handlers[key] = handler
+        return handler
+
+    def rebuilt(self) -> list[str]:
+        """return the names of the handlers which were not kept"""
+        return [name for name, _ in self._handlers.keys() - self._previous.keys()]
+
+    def built(self) -> list[Sender]:
+        """return the handlers which were built rather than kept"""
+        return [handler for key, handler in self._handlers.items() if key not in self._previous]
+
+    def removed(self) -> list[Sender]:
+        """return the previous handlers which were not kept"""
+        return [handler for key, handler in self._previous.items() if key not in self._handlers]
+
+
+def build_notification_handler(name: str, handler_config: NotificationHandlerConfig) -> Sender:
+    """build a single notification handler from its configuration"""
+    service_class = get_service_class(handler_config.service)
+    if get_capabilities(service_class).handler:
+        # e.g. jsonl, which sends launches without rendering them
+        return service_class.from_handler_config(name, handler_config)
+    renderer_name = handler_config.renderer
+    renderer = get_notification_renderer(renderer_name, handler_config.timezone)
+    service = get_notification_service(handler_config)
+    stream = handler_config.stream
+    if stream and not supports_streaming(service):
+        logger.warning("{} does not support streaming, rendering in full", service)
+        stream = False
+    groups = recipient_timezones(service)
+    if groups is not None:
+        # create each timezone's renderer up front, rejecting unknown timezones
+        for tz in groups:
+            if tz is not None:
+                renderer.localized(tz)
+        if stream:
+            logger.warning("{} has recipient timezones, rendering in full", service)
+            stream = False
+    return NotificationHandler(
+        renderer,
+        service,
+        stream=stream,
+        name=name,
+        max_sends_per_hour=handler_config.max_sends_per_hour,
+    )
+
 
 def get_notification_handlers(
     handler_configs: list[NotificationHandlerConfig],
-) -> list[NotificationHandler]:
+    prefix: str = "",
+    reuse: HandlerReuse | None = None,
+) -> list[Sender]:
     """This function returns a list notification handlers built from
-    the project configuration
+    the project configuration. Handlers without a configured name are named
+    from prefix, their position and their service, e.g. `0-email`.
+    Services with the `handler` capability, e.g. `jsonl`, build the whole
+    handler and are not given a renderer.
+    With `reuse`, handlers whose configuration is unchanged since the previous
+    load are kept rather than rebuilt.
     """
     logger.debug("loading notification handlers")
-    notification_handlers: list[NotificationHandler] = []
-    for handler_config in handler_configs:
-        renderer_name = handler_config.renderer
-        renderer = get_notification_renderer(renderer_name)
-        service = get_notification_service(handler_config)
-        notification_handlers.append(NotificationHandler(renderer, service))
+    notification_handlers: list[Sender] = []
+    for position, handler_config in enumerate(handler_configs):
+        name = prefix + (handler_config.name or f"{position}-{handler_config.service}")
+        build = partial(build_notification_handler, name, handler_config)
+        if reuse is None:
+            notification_handlers.append(build())
+        else:
+            notification_handlers.append(reuse.get(name, handler_config, build))
 
     if len(notification_handlers) == 0:
         logger.error("Unable to load any notification handlers")
@@ -0,0 +1,82 @@
+"""Space Launch Notifications - JSON Lines Notification Handler
+
+Writes changed launches as JSON Lines for downstream tools, skipping
+template rendering entirely. Registered as the `jsonl` service with the
+`handler` capability, so it is built as a complete handler.
+
+Copyright ©️ 2025 Scott Cummings
+SPDX-License-Identifier: MIT OR Apache-2.0
+"""
+
+import json
+import sys
+import threading
+from dataclasses import dataclass, field
+from typing import Any, ClassVar, TextIO
+
+from loguru import logger
+
+from launches.config import NotificationHandlerConfig
+from launches.notifications.services import ServiceCapabilities
+
+JSONL_BUFFER_SIZE = 65536  # bytes buffered between writes to a JSON Lines file
+
+
+def launch_record(launch: dict[str, Any], changes: dict[str, list[str]]) -> dict[str, Any]:
+    """the JSON Lines record of a changed launch"""
+    return {"id": launch["id"], "changes": changes.get(launch["id"], []), "launch": launch}
+
+
+@dataclass
+class JsonLinesHandler:
+    """Writes one JSON object per changed launch, with the reasons it changed,
+    to stdout or appended to the file at `path`.
+
+    Records go through a buffered writer which is flushed once per change set,
+    so downstream readers see each cycle's records together."""
+
+    capabilities: ClassVar = ServiceCapabilities(handler=True)
+
+    path: str | None = None
+    name: str = ""
+    max_sends_per_hour: float | None = None
+    _file: TextIO | None = field(default=None, init=False, repr=False, compare=False)
+    _lock: threading.Lock = field(
+        default_factory=threading.Lock, init=False, repr=False, compare=False
+    )
+
+    @classmethod
+    def from_handler_config(
+        cls, name: str, handler_config: NotificationHandlerConfig
+    ) -> "JsonLinesHandler":
+        """build the handler `name`, any renderer is ignored"""
+        return cls(
+            handler_config.parameters.get("path"),
+            name=name,
+            max_sends_per_hour=handler_config.max_sends_per_hour,
+        )
+
+    def _writer(self) -> TextIO:
+        if self.path is None:
+            return sys.stdout
+        if self._file is None:
+            self._file = open(self.path, "a", buffering=JSONL_BUFFER_SIZE, encoding="utf-8")
+        return self._file
+
+    def send(self, launches: dict[str, Any]) -> None:
+        """write a record for every launch in the change set"""
+        logger.info("Writing {} launches as JSON Lines", launches["count"])
+        changes = launches.get("changes", {})
+        with self._lock:
+            writer = self._writer()
+            for launch in launches.get("results", []):
+                writer.write(json.dumps(launch_record(launch, changes), separators=(",", ":")))
+                writer.write("\n")
+            writer.flush()
+
+    def close(self) -> None:
+        """close the JSON Lines file"""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
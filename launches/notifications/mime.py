@@ -0,0 +1,103 @@
+"""Space Launch Notifications - MIME Message Module
+
+Builds email messages for the email notification services. Message content
+is encoded once per rendered notification and shared by every email service,
+which only stamps its own address headers on top.
+
+Copyright ©️ 2025 Scott Cummings
+SPDX-License-Identifier: MIT OR Apache-2.0
+"""
+
+import base64
+import secrets
+from collections.abc import Iterable, Iterator
+from email.header import Header
+from functools import lru_cache
+
+from launches.errors import NotificationError
+
+CRLF = b"\r\n"
+HEADER_LINE_LENGTH = 78  # RFC 5322 recommended line length, headers are folded to it
+BASE64_LINE_BYTES = 57  # bytes per base64 body line, which encode to 76 characters
+MESSAGE_CACHE_SIZE = 32  # encoded messages kept for handlers sending the same content
+
+
+def encode_header(name: str, value: str) -> bytes:
+    """encode a single header, folded at 78 characters and using RFC 2047 encoding
+    for non-ASCII values. Values containing line breaks are rejected, so they
+    cannot inject headers."""
+    if "\r" in value or "\n" in value:
+        raise NotificationError(f"invalid line break in {name} header")
+    charset = "us-ascii" if value.isascii() else "utf-8"
+    # long values such as a group's To list are folded, every line must end with CRLF
+    value = Header(value, charset, header_name=name).encode(
+        linesep="\r\n", maxlinelen=HEADER_LINE_LENGTH
+    )
+    return f"{name}: {value}".encode("ascii") + CRLF
+
+
+def iter_base64_lines(chunks: Iterable[str]) -> Iterator[bytes]:
+    """utf-8 and base64 encode text chunks into CRLF terminated body lines,
+    holding at most one line's worth of unencoded bytes between chunks"""
+    buffer = bytearray()
+    for chunk in chunks:
+        buffer += chunk.encode("utf-8")
+        usable = len(buffer) - len(buffer) % BASE64_LINE_BYTES
+        for start in range(0, usable, BASE64_LINE_BYTES):
+            yield base64.b64encode(buffer[start : start + BASE64_LINE_BYTES]) + CRLF
+        del buffer[:usable]
+    if buffer:
+        yield base64.b64encode(buffer) + CRLF
+
+
+def iter_text_part(subtype: str, chunks: Iterable[str]) -> Iterator[bytes]:
+    """stream a base64 encoded text/<subtype> MIME part"""
+    yield f'Content-Type: text/{subtype}; charset="utf-8"'.encode("ascii") + CRLF
+    yield b"Content-Transfer-Encoding: base64" + CRLF
+    yield CRLF
+    yield from iter_base64_lines(chunks)
+
+
+def iter_mime_message(
+    headers: dict[str, str],
+    text_chunks: Iterable[str],
+    html_chunks: Iterable[str] | None = None,
+) -> Iterator[bytes]:
+    """Stream a MIME message line by line without holding the rendered bodies.
+
+    With html_chunks the message is multipart/alternative with a plaintext and an
+    html part, otherwise it is a single text/plain part. Every line is CRLF
+    terminated, ready to be written into an SMTP DATA stream.
+    """
+    for name, value in headers.items():
+        yield encode_header(name, value)
+    yield b"MIME-Version: 1.0" + CRLF
+
+    if html_chunks is None:
+        yield from iter_text_part("plain", text_chunks)
+        return
+
+    boundary = f"==============={secrets.token_hex(16)}=="
+    yield f'Content-Type: multipart/alternative; boundary="{boundary}"'.encode("ascii") + CRLF
+    yield CRLF
+    yield f"--{boundary}".encode("ascii") + CRLF
+    yield from iter_text_part("plain", text_chunks)
+    yield f"--{boundary}".encode("ascii") + CRLF
+    yield from iter_text_part("html", html_chunks)
+    yield f"--{boundary}--".encode("ascii") + CRLF
+
+
+@lru_cache(maxsize=MESSAGE_CACHE_SIZE)
+def encode_message(subject: str, text_body: str, html_body: str | None = None) -> bytes:
+    """Return the encoded message for a notification, without address headers.
+
+    Cached by content, so every email handler sending the same rendered
+    notification shares a single MIME and base64 encoding of it.
+    """
+    html_chunks = (html_body,) if html_body else None
+    return b"".join(iter_mime_message({"Subject": subject}, (text_body,), html_chunks))
+
+
+def add_headers(message: bytes, headers: dict[str, str]) -> bytes:
+    """return an encoded message with headers prepended"""
+    return b"".join(encode_header(name, value) for name, value in headers.items()) + message
@@ -1,27 +1,109 @@
 """Space Launch Notifications - Notification Templates Module
 
+Renderers are registered by name as factories taking the timezone to render
+in. Other packages add renderers through the `launches.notification_renderers`
+entry point group.
+
 Copyright ©️ 2025 Scott Cummings
 SPDX-License-Identifier: MIT OR Apache-2.0
 """
 
+import copy
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Iterator
 from datetime import datetime, timezone
-from typing import Any, Protocol
+from functools import cache, lru_cache
+from typing import TYPE_CHECKING, Any, Protocol
 
 import pytz
-from jinja2 import Environment, PackageLoader, Template, select_autoescape
 from loguru import logger
+from pytz.tzinfo import BaseTzInfo
 
-from launches.ll2 import LAUNCH_DT_FORMAT
+from launches.errors import ConfigError
+from launches.ll2 import parse_launch_time
+from launches.metrics import METRICS
+from launches.plugins import PluginRegistry
+
+if TYPE_CHECKING:
+    # jinja2 is imported on first render, runs which send nothing never load it
+    from jinja2 import BytecodeCache, Environment, Template
+    from jinja2.runtime import Context
 
-JINJA_ENV = Environment(
-    loader=PackageLoader("launches", "templates"), autoescape=select_autoescape()
-)
 TXT_TEMPLATE = "launches.j2.txt"
 HTML_TEMPLATE = "launches.j2.html"
 SUBJECT_TEMPLATE = "subject.j2"
+# digest template -> template of per-launch `summary` and `detail` macros
+FRAGMENT_TEMPLATES = {
+    TXT_TEMPLATE: "launch_fragments.j2.txt",
+    HTML_TEMPLATE: "launch_fragments.j2.html",
+}
+FRAGMENT_CACHE_SIZE = 512  # cached (summary, detail) fragment pairs per digest template
 BODY_TZ = "US/Central"
 SUBJECT_DT_FORMAT = "%d %b %Y %H:%M %Z"
 BODY_DT_FORMAT = "%a %b %d %Y %H:%M %Z"
+FORMAT_CACHE_SIZE = 4096  # formatted timestamps kept by each time formatting helper
+
+RENDER_SECONDS = METRICS.histogram(
+    "launches_render_seconds",
+    "Time to render a digest or subject, by template, including streamed bodies",
+    ("template",),
+)
+
+_template_cache_dir: str | None = None
+
+
+def create_bytecode_cache(cache_dir: str) -> "BytecodeCache":
+    """a bytecode cache persisting compiled templates in cache_dir"""
+    from jinja2 import FileSystemBytecodeCache
+
+    os.makedirs(cache_dir, exist_ok=True)
+    return FileSystemBytecodeCache(cache_dir)
+
+
+def configure_template_cache(cache_dir: str) -> None:
+    """persist compiled templates in cache_dir so later processes skip compilation"""
+    global _template_cache_dir
+    os.makedirs(cache_dir, exist_ok=True)
+    _template_cache_dir = cache_dir
+    if get_jinja_env.cache_info().currsize:
+        get_jinja_env().bytecode_cache = create_bytecode_cache(cache_dir)
+
+
+def create_jinja_env(bytecode_cache: "BytecodeCache | None" = None) -> "Environment":
+    """create a jinja2 environment for the bundled templates"""
+    from jinja2 import Environment, PackageLoader, pass_context, select_autoescape
+
+    env = Environment(
+        loader=PackageLoader("launches", "templates"),
+        autoescape=select_autoescape(),
+        bytecode_cache=bytecode_cache,
+    )
+    # add custom time formatting functions to jinja2 env
+    env.globals["local_format_time"] = pass_context(context_local_format_time)
+    env.globals["format_time"] = format_time
+    return env
+
+
+@cache
+def get_jinja_env() -> "Environment":
+    """create the shared jinja2 environment on first use"""
+    if _template_cache_dir is None:
+        return create_jinja_env()
+    return create_jinja_env(create_bytecode_cache(_template_cache_dir))
+
+
+def precompile_templates(cache_dir: str) -> None:
+    """compile every bundled template into a bytecode cache in cache_dir,
+    e.g. while building a container image"""
+    env = create_jinja_env(create_bytecode_cache(cache_dir))
+    for template_name in env.list_templates():
+        env.get_template(template_name)
+    logger.info("Precompiled templates into {}", cache_dir)
 
 
 class NotificationRenderer(Protocol):
@@ -39,6 +121,138 @@ class NotificationRenderer(Protocol):
         """render formatted body"""
         raise NotImplementedError()
 
+    def localized(self, tz: str) -> "NotificationRenderer":
+        """return a renderer localizing times to tz"""
+        raise NotImplementedError()
+
+
+class StreamingNotificationRenderer(NotificationRenderer, Protocol):
+    """A NotificationRenderer which can also render bodies as a stream of chunks"""
+
+    def stream_text_body(self, launches: dict[str, Any]) -> Iterator[str]:
+        """render plaintext body in chunks"""
+        raise NotImplementedError()
+
+    def stream_formatted_body(self, launches: dict[str, Any]) -> Iterator[str] | None:
+        """render formatted body in chunks"""
+        raise NotImplementedError()
+
+
+def launch_fingerprint(launch: dict[str, Any]) -> str:
+    """a digest of the full launch content, used to key rendered fragments"""
+    encoded = json.dumps(launch, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha1(encoded.encode("utf-8"), usedforsecurity=False).hexdigest()
+
+
+class DigestTemplate:
+    """Renders a digest template from per-launch fragments.
+
+    Each launch's summary and detail fragments are rendered through the macros
+    in the matching FRAGMENT_TEMPLATES entry and cached by launch fingerprint and
+    fragment template version, so a digest only re-renders launches which changed.
+    Templates without fragments are rendered whole. Templates are loaded on the
+    first render, so runs which never send a notification never compile them.
+    """
+
+    def __init__(self, template_name: str) -> None:
+        self.template_name = template_name
+        self.template: "Template | None" = None
+        self.fragments: "Template | None" = None
+        self.version = ""
+        self._modules: dict[str, Any] = {}
+        self._cache: OrderedDict[tuple[str, str, str], tuple[str, str]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def load(self) -> "Template":
+        """load the digest and fragment templates if they have not been loaded yet"""
+        with self._lock:
+            if self.template is None:
+                env = get_jinja_env()
+                fragments_name = FRAGMENT_TEMPLATES.get(self.template_name)
+                if fragments_name is not None:
+                    self.fragments = env.get_template(fragments_name)
+                    source, _, _ = env.loader.get_source(env, fragments_name)  # type: ignore[union-attr]
+                    self.version = hashlib.sha1(
+                        source.encode("utf-8"), usedforsecurity=False
+                    ).hexdigest()
+                self.template = env.get_template(self.template_name)
+            return self.template
+
+    def fragment_module(self, tz: str) -> Any:
+        """return the fragment macros bound to a render context for tz"""
+        with self._lock:
+            module = self._modules.get(tz)
+            if module is None:
+                module = self.fragments.make_module({"body_tz": tz})  # type: ignore[union-attr]
+                self._modules[tz] = module
+            return module
+
+    def render(self, launches: dict[str, Any], tz: str = BODY_TZ) -> str:
+        """render the digest for launches, localizing times to tz"""
+        with RENDER_SECONDS.time(template=self.template_name):
+            return self._render(launches, tz)
+
+    def _render(self, launches: dict[str, Any], tz: str) -> str:
+        template = self.load()
+        if self.fragments is None:
+            return template.render(launches, body_tz=tz)
+        fragments = [self.render_fragments(launch, tz) for launch in launches.get("results", [])]
+        return template.render(
+            launches,
+            body_tz=tz,
+            summaries=[summary for summary, _ in fragments],
+            details=[detail for _, detail in fragments],
+        )
+
+    def generate(self, launches: dict[str, Any], tz: str = BODY_TZ) -> Iterator[str]:
+        """render the digest for launches as it is consumed, yielding chunks of output.
+        Only the time spent rendering is observed, not the time the consumer takes
+        to handle each chunk, e.g. writing it to a socket."""
+        chunks = self._generate(launches, tz)
+        elapsed = 0.0
+        try:
+            while True:
+                start = time.perf_counter()
+                chunk = next(chunks, None)
+                elapsed += time.perf_counter() - start
+                if chunk is None:
+                    return
+                yield chunk
+        finally:
+            RENDER_SECONDS.observe(elapsed, template=self.template_name)
+
+    def _generate(self, launches: dict[str, Any], tz: str) -> Iterator[str]:
+        template = self.load()
+        if self.fragments is None:
+            yield from template.generate(launches, body_tz=tz)
+            return
+        # fragments are rendered as the template consumes them, so at most the
+        # fragment cache is held rather than every fragment of the digest
+        results = launches.get("results", [])
+        yield from template.generate(
+            launches,
+            body_tz=tz,
+            summaries=(self.render_fragments(launch, tz)[0] for launch in results),
+            details=(self.render_fragments(launch, tz)[1] for launch in results),
+        )
+
+    def render_fragments(self, launch: dict[str, Any], tz: str = BODY_TZ) -> tuple[str, str]:
+        """return the cached (summary, detail) fragments for launch, rendering on a miss"""
+        key = (launch_fingerprint(launch), self.version, tz)
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                return cached
+
+        module = self.fragment_module(tz)
+        fragments = (module.summary(launch), module.detail(launch))
+        with self._lock:
+            self._cache[key] = fragments
+            if len(self._cache) > FRAGMENT_CACHE_SIZE:
+                self._cache.popitem(last=False)
+        return fragments
+
 
 class JinjaRenderer:
     """Render a Launch Notification Using Text"""
@@ -48,95 +262,167 @@ class JinjaRenderer:
         text_template=TXT_TEMPLATE,
         formatted_template: str | None = None,
         subject_template: str | None = SUBJECT_TEMPLATE,
+        tz: str = BODY_TZ,
     ):
-        self.text_renderer = JINJA_ENV.get_template(text_template)
+        try:
+            get_timezone(tz)
+        except pytz.UnknownTimeZoneError as ex:
+            raise ConfigError(f"Unknown renderer timezone: {tz}") from ex
+        self.tz = tz
+        # tz -> renderer sharing these templates, shared by every localized renderer
+        self._localized: dict[str, JinjaRenderer] = {tz: self}
+        self.text_renderer = DigestTemplate(text_template)
         if formatted_template is not None:
-            self.formatted_renderer: Template | None = JINJA_ENV.get_template(formatted_template)
+            self.formatted_renderer: DigestTemplate | None = DigestTemplate(formatted_template)
         else:
             self.formatted_renderer = None
         if subject_template is None:
-            self.subject_renderer = JINJA_ENV.get_template(SUBJECT_TEMPLATE)
+            self.subject_renderer = DigestTemplate(SUBJECT_TEMPLATE)
         else:
-            self.subject_renderer = JINJA_ENV.get_template(subject_template)
+            self.subject_renderer = DigestTemplate(subject_template)
         logger.info(
-            "Initialized JinjaRender with text_template: {}, formatted_template: {}",
+            "Initialized JinjaRender with text_template: {}, formatted_template: {}, tz: {}",
             text_template,
             formatted_template,
+            tz,
         )
 
+    def localized(self, tz: str) -> "JinjaRenderer":
+        """Return a renderer for tz sharing these templates and their fragment
+        caches. Each timezone has one renderer, so notifications for recipients
+        in the same timezone are rendered once."""
+        renderer = self._localized.get(tz)
+        if renderer is None:
+            try:
+                get_timezone(tz)
+            except pytz.UnknownTimeZoneError as ex:
+                raise ConfigError(f"Unknown recipient timezone: {tz}") from ex
+            renderer = copy.copy(self)
+            renderer.tz = tz
+            renderer = self._localized.setdefault(tz, renderer)
+        return renderer
+
     def render_subject(self, launches: dict[str, Any]) -> str:
         """render text subject"""
-        return self.subject_renderer.render({"now": subject_local_now(), "launches": launches})
+        return self.subject_renderer.render(
+            {"now": subject_local_now(self.tz), "launches": launches}, self.tz
+        )
 
     def render_text_body(self, launches: dict[str, Any]) -> str:
         """render text body"""
-        return self.text_renderer.render(launches)
+        return self.text_renderer.render(launches, self.tz)
 
     def render_formatted_body(self, launches: dict[str, Any]) -> str | None:
         """render formatted body"""
         if self.formatted_renderer is not None:
-            return self.formatted_renderer.render(launches)
+            return self.formatted_renderer.render(launches, self.tz)
+        return None
+
+    def stream_text_body(self, launches: dict[str, Any]) -> Iterator[str]:
+        """render text body in chunks"""
+        return self.text_renderer.generate(launches, self.tz)
+
+    def stream_formatted_body(self, launches: dict[str, Any]) -> Iterator[str] | None:
+        """render formatted body in chunks"""
+        if self.formatted_renderer is not None:
+            return self.formatted_renderer.generate(launches, self.tz)
         return None
 
     def __repr__(self) -> str:
-        return "JinjaRenderer()"
+        return f"JinjaRenderer(tz='{self.tz}')"
+
+
+def plaintext_renderer(tz: str = BODY_TZ) -> JinjaRenderer:
+    """a renderer of plain text notifications"""
+    return JinjaRenderer(tz=tz)
 
 
-def get_notification_renderer(renderer: str) -> NotificationRenderer:
-    """Get a NotificationRender based on the renderer string."""
+def html_renderer(tz: str = BODY_TZ) -> JinjaRenderer:
+    """a renderer of notifications with an html body"""
+    return JinjaRenderer(formatted_template=HTML_TEMPLATE, tz=tz)
+
+
+RENDERER_ENTRY_POINT_GROUP = "launches.notification_renderers"
+
+# renderer name -> "module:factory" of a callable taking `tz` and returning a renderer
+RENDERER_REGISTRY = PluginRegistry(
+    RENDERER_ENTRY_POINT_GROUP,
+    {
+        "plaintext": "launches.notifications.renderers:plaintext_renderer",
+        "html": "launches.notifications.renderers:html_renderer",
+    },
+)
+
+
+def register_renderer(name: str, target: Any) -> None:
+    """register the factory, or its "module:factory", creating the renderer `name`"""
+    RENDERER_REGISTRY.register(name, target)
+    get_notification_renderer.cache_clear()
+
+
+@cache
+def get_notification_renderer(renderer: str, tz: str | None = None) -> NotificationRenderer:
+    """Get a NotificationRender based on the renderer string, localizing times to
+    tz (default BODY_TZ). Renderers are shared, so handlers configured alike can
+    share rendered output."""
     logger.debug(
         "loading notification render: {}",
         renderer,
     )
-    match renderer:
-        case "plaintext":
-            return JinjaRenderer()
-        case "html":
-            return JinjaRenderer(formatted_template=HTML_TEMPLATE)
-        case _:
-            # default to TextRender
-            logger.warning("Unknown renderer: '{}', defaulting to `plaintext`", renderer)
-            return JinjaRenderer(formatted_template=TXT_TEMPLATE)
-
-
-def local_format_time(iso_time: str) -> str:
-    """Localize iso_time to
-    TEMPLATE_TZ and BODY_DT_FORMAT"""
+    tz = tz or BODY_TZ
     try:
-        # convert str time to naive datetime
-        dt = datetime.strptime(iso_time, LAUNCH_DT_FORMAT)
-    except ValueError:
+        factory = RENDERER_REGISTRY.load(renderer)
+    except KeyError:
+        # default to TextRender
+        logger.warning("Unknown renderer: '{}', defaulting to `plaintext`", renderer)
+        return JinjaRenderer(formatted_template=TXT_TEMPLATE, tz=tz)
+    except (ImportError, AttributeError) as ex:
+        raise ConfigError(f"Unable to load notification renderer {renderer}: {ex}") from ex
+    return factory(tz=tz)
+
+
+@cache
+def get_timezone(tz: str) -> BaseTzInfo:
+    """return the pytz timezone named tz, cached since pytz lookups are slow"""
+    return pytz.timezone(tz)
+
+
+def as_launch_time(time: str | datetime | None) -> datetime | None:
+    """return time as an aware datetime, parsing LL2 timestamps if needed"""
+    if isinstance(time, datetime):
+        return time if time.tzinfo is not None else time.replace(tzinfo=timezone.utc)
+    return parse_launch_time(time)
+
+
+@lru_cache(maxsize=FORMAT_CACHE_SIZE)
+def local_format_time(iso_time: str | datetime | None, tz: str = BODY_TZ) -> str:
+    """Localize iso_time to
+    tz and BODY_DT_FORMAT"""
+    dt = as_launch_time(iso_time)
+    if dt is None:
         return ""
-    # set timezone to UTC
-    dt = dt.replace(tzinfo=timezone.utc)
-    # change timezone using pytz
-    tz = pytz.timezone(BODY_TZ)
-    dt_offset = dt.astimezone(tz)
     # output datetime in template format
-    return dt_offset.strftime(BODY_DT_FORMAT)
+    return dt.astimezone(get_timezone(tz)).strftime(BODY_DT_FORMAT)
 
 
-def subject_local_now() -> str:
-    tz = pytz.timezone(BODY_TZ)
-    dt = datetime.now(tz)
+def subject_local_now(tz: str = BODY_TZ) -> str:
+    dt = datetime.now(get_timezone(tz))
     # output datetime in template format
     return dt.strftime(SUBJECT_DT_FORMAT)
 
 
-def format_time(iso_time: str) -> str:
+@lru_cache(maxsize=FORMAT_CACHE_SIZE)
+def format_time(iso_time: str | datetime | None) -> str:
     """convert an iso formatted time to the
     TEMPLATE_DT_FORMAT"""
-    try:
-        # convert str time to naive datetime
-        dt = datetime.strptime(iso_time, LAUNCH_DT_FORMAT)
-    except ValueError:
+    dt = as_launch_time(iso_time)
+    if dt is None:
         return ""
-    # set timezone to UTC
-    dt = dt.replace(tzinfo=timezone.utc)
     # output datetime in template format
-    return dt.strftime(BODY_DT_FORMAT)
+    return dt.astimezone(timezone.utc).strftime(BODY_DT_FORMAT)
 
 
-# add custom time formatting functions to jinja2 env
-JINJA_ENV.globals["local_format_time"] = local_format_time
-JINJA_ENV.globals["format_time"] = format_time
+def context_local_format_time(context: "Context", iso_time: str | datetime | None) -> str:
+    """local_format_time for templates, using the `body_tz` of the render context
+    (registered with jinja2's pass_context by create_jinja_env)"""
+    return local_format_time(iso_time, context.get("body_tz") or BODY_TZ)
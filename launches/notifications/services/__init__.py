@@ -1,18 +1,70 @@
 """Space Launch Notifications - Notifications Services Module
 
+Services are registered by name and imported on first use, so a run only
+loads the client libraries of the services it is configured with. Other
+packages add services through the `launches.notification_services` entry
+point group. Each service declares its ServiceCapabilities, which the
+handler uses to pick how to send.
+
 Copyright ©️ 2025 Scott Cummings
 SPDX-License-Identifier: MIT OR Apache-2.0
 """
 
-from typing import Protocol
+from collections.abc import Iterable
+from dataclasses import dataclass
+from typing import Any, Protocol
 
 from loguru import logger
 
 from launches.config import NotificationHandlerConfig
 from launches.errors import ConfigError, LaunchesError
-from launches.notifications.services.gmail import GmailNotificationService
-from launches.notifications.services.smtp_email import SMTPEmaiLNotificationService
-from launches.notifications.services.stdout import StdOutNotificationService
+from launches.plugins import PluginRegistry, load_target
+
+SERVICE_ENTRY_POINT_GROUP = "launches.notification_services"
+
+# service name -> "module:class" of its implementation
+SERVICE_REGISTRY = PluginRegistry(
+    SERVICE_ENTRY_POINT_GROUP,
+    {
+        "email": "launches.notifications.services.smtp_email:SMTPEmaiLNotificationService",
+        "gmail": "launches.notifications.services.gmail:GmailNotificationService",
+        "jsonl": "launches.notifications.jsonl:JsonLinesHandler",
+        "stdout": "launches.notifications.services.stdout:StdOutNotificationService",
+        "webhook": "launches.notifications.services.webhook:WebhookNotificationService",
+    },
+)
+
+
+def register_service(name: str, target: str | type) -> None:
+    """register the class, or its "module:class", implementing the service `name`"""
+    SERVICE_REGISTRY.register(name, target)
+
+
+def get_service_class(name: str) -> type:
+    """import and return the class implementing the service `name`"""
+    try:
+        return SERVICE_REGISTRY.load(name)
+    except KeyError:
+        raise ConfigError(f"Unknown notification service {name}") from None
+
+
+def __getattr__(name: str) -> Any:
+    """import service classes on first access, e.g. `services.GmailNotificationService`"""
+    for target in SERVICE_REGISTRY.targets().values():
+        if isinstance(target, str) and target.rpartition(":")[2] == name:
+            return load_target(target)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+@dataclass(frozen=True)
+class ServiceCapabilities:
+    """What a notification service supports beyond `send`, declared as its
+    `capabilities` class attribute"""
+
+    streaming: bool = False  # send_stream, bodies are sent as they are rendered
+    batch: bool = False  # send_to, one send reaches a chosen group of recipients
+    pooled: bool = False  # thread safe, concurrent sends share pooled connections
+    handler: bool = False  # from_handler_config builds a complete handler, without a renderer
 
 
 class NotificationService(Protocol):
@@ -26,6 +78,60 @@ class NotificationService(Protocol):
         raise NotImplementedError()
 
 
+class StreamingNotificationService(NotificationService, Protocol):
+    """A NotificationService which can also send bodies rendered as a stream of chunks"""
+
+    def send_stream(
+        self, subject: str, msg: Iterable[str], formatted_msg: Iterable[str] | None
+    ) -> None:
+        """send notification, consuming the bodies as they are rendered"""
+        raise NotImplementedError()
+
+
+def get_capabilities(service: NotificationService | type) -> ServiceCapabilities:
+    """Return the capabilities a service declares. Services which do not declare
+    them are assumed to support the optional methods they implement."""
+    service_class = service if isinstance(service, type) else type(service)
+    declared = getattr(service_class, "capabilities", None)
+    if isinstance(declared, ServiceCapabilities):
+        return declared
+    return ServiceCapabilities(
+        streaming=callable(getattr(service_class, "send_stream", None)),
+        batch=callable(getattr(service_class, "send_to", None))
+        and callable(getattr(service_class, "timezone_groups", None)),
+    )
+
+
+def supports_streaming(service: NotificationService) -> bool:
+    """True if the service can send streamed bodies"""
+    return get_capabilities(service).streaming
+
+
+class RecipientNotificationService(NotificationService, Protocol):
+    """A NotificationService whose recipients may each declare a timezone"""
+
+    def timezone_groups(self) -> dict[str | None, list[str]]:
+        """return the recipients grouped by timezone, None for the handler's timezone"""
+        raise NotImplementedError()
+
+    def send_to(
+        self, recipients: list[str], subject: str, msg: str, formatted_msg: str | None
+    ) -> None:
+        """send notification to some of the recipients"""
+        raise NotImplementedError()
+
+
+def recipient_timezones(service: NotificationService) -> dict[str | None, list[str]] | None:
+    """return the service's recipients grouped by timezone, or None if every
+    recipient uses the handler's timezone"""
+    if not get_capabilities(service).batch:
+        return None
+    groups = service.timezone_groups()  # type: ignore[attr-defined]
+    if set(groups) <= {None}:
+        return None
+    return groups
+
+
 def get_notification_service(
     service_config: NotificationHandlerConfig,
 ) -> NotificationService:
@@ -47,21 +153,14 @@ def get_notification_service(
             "Attempting to load notification service: {}",
             service_config.service,
         )
-        match service_config.service:
-            case "email":
-                return SMTPEmaiLNotificationService(**service_config.parameters)
-            case "gmail":
-                return GmailNotificationService(**service_config.parameters)
-            case "stdout":
-                return StdOutNotificationService()
-            # case "gmail":
-            #     return GmailNotificationService(**service_config.parameters)
-            case _:
-                logger.error(
-                    "Unknown notification service {}",
-                    service_config.service,
-                )
-                raise ConfigError(f"Unknown notification service {service_config.service}")
-    except (ValueError, TypeError, KeyError) as ex:
+        if service_config.service not in SERVICE_REGISTRY:
+            logger.error(
+                "Unknown notification service {}",
+                service_config.service,
+            )
+            raise ConfigError(f"Unknown notification service {service_config.service}")
+        service_class = get_service_class(service_config.service)
+        return service_class(**service_config.parameters)
+    except (ValueError, TypeError, KeyError, ImportError, AttributeError) as ex:
         logger.error("Unable to load notification service: {}", ex)
         raise LaunchesError(f"Unable to load notificatioin service {ex}") from ex
@@ -6,26 +6,63 @@ SPDX-License-Identifier: MIT OR Apache-2.0
 
 import base64
 import os
-from email.mime.multipart import MIMEMultipart
-from email.mime.text import MIMEText
-from typing import ClassVar
+import threading
+import time
+from typing import Any, ClassVar
 
 import googleapiclient.errors
+from google.auth.exceptions import RefreshError
+from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 from googleapiclient.discovery import build
 from loguru import logger
 
+from launches.errors import DeliveryError, NotificationError
+from launches.notifications.mime import add_headers, encode_message
+from launches.notifications.ratelimit import TokenBucket
+from launches.notifications.services import ServiceCapabilities
+from launches.notifications.services.recipients import group_by_timezone
+
+BATCH_SIZE = 50  # requests per batch, the most Gmail recommends
+SEND_QUOTA_UNITS = 100  # quota units consumed by each messages.send request
+QUOTA_UNITS_PER_SECOND = 250  # Gmail's per-user quota rate
+MAX_RETRIES = 2  # retries for messages rejected by rate limits or server errors
+RETRY_DELAY = 1.0  # seconds before the first retry, doubled for each later retry
+RETRY_STATUSES = frozenset({429, 500, 502, 503})
+
+
+def is_retryable(error: BaseException) -> bool:
+    """True if a send failed with a rate limit or transient server error"""
+    if not isinstance(error, googleapiclient.errors.HttpError):
+        return False
+    if error.resp.status in RETRY_STATUSES:
+        return True
+    return error.resp.status == 403 and "rateLimitExceeded" in str(error)
+
 
 class GmailNotificationService:
     """Concrete implementation using Google Gmail API"""
 
     SCOPES: ClassVar = ["https://www.googleapis.com/auth/gmail.send"]
+    # the API client is not thread safe, so sends are not pooled
+    capabilities: ClassVar = ServiceCapabilities(batch=True)
 
     def __init__(self, **kwargs):
         self.credentials_file = kwargs.get("credentials_file", "")
         self.token_file = kwargs.get("token_file", "")
         self.recipients = kwargs.get("recipients", [])
+        # recipient -> timezone their notifications are rendered in
+        self.recipient_timezones: dict[str, str] = dict(kwargs.get("recipient_timezones", {}))
+        # send each recipient their own message rather than one shared message
+        self.separate_messages: bool = kwargs.get("separate_messages", False)
+        self.batch_size = int(kwargs.get("batch_size", BATCH_SIZE))
+        self.retry_delay = float(kwargs.get("retry_delay", RETRY_DELAY))
+        quota_rate = float(kwargs.get("quota_units_per_second", QUOTA_UNITS_PER_SECOND))
+        # allow a full batch as a burst, Gmail enforces the quota as a moving average
+        self.quota = TokenBucket(quota_rate, max(quota_rate, self.batch_size * SEND_QUOTA_UNITS))
+        self._lock = threading.Lock()
+        self._service = None
         self.creds = self._authenticate()
         logger.info("Initialized {}", self)
 
@@ -44,59 +81,159 @@ class GmailNotificationService:
         else:
             logger.debug("Token file does not exist.")
 
+        if creds and not creds.valid and creds.refresh_token:
+            try:
+                self._refresh(creds)
+            except RefreshError as ex:
+                logger.warning("Unable to refresh Gmail credentials: {}", ex)
+
         if not creds or not creds.valid:
             logger.info("No valid credentials found. Starting OAuth2 flow.")
             flow = InstalledAppFlow.from_client_secrets_file(self.credentials_file, self.SCOPES)
             creds = flow.run_local_server(port=0)
-
-            # Save credentials for future use
-            with open(self.token_file, "w") as token:
-                token.write(creds.to_json())
-            logger.info("Saved new credentials to token file.")
+            self._save_credentials(creds)
 
         logger.info("Gmail authentication complete. Credentials valid: {}", creds and creds.valid)
         return creds
 
-    def get_msg(self, subject: str, body: str, html_body: str | None) -> MIMEMultipart | MIMEText:
-        """build the message using MIMEText
-        return the message as a str"""
-        if html_body:
-            msg: MIMEMultipart | MIMEText = MIMEMultipart("alternative")
-        else:
-            msg = MIMEText(body)
-        msg["Subject"] = subject
-        if isinstance(self.recipients, list):
-            msg["To"] = ", ".join(self.recipients)
-        else:
-            msg["To"] = self.recipients
-        if html_body:
-            text = MIMEText(body, "text")
-            html = MIMEText(html_body, "html")
-            msg.attach(text)
-            msg.attach(html)
-        return msg
+    def _save_credentials(self, creds) -> None:
+        """persist credentials so later runs and refreshes skip the OAuth2 flow"""
+        with open(self.token_file, "w") as token:
+            token.write(creds.to_json())
+        logger.info("Saved new credentials to token file.")
+
+    def _refresh(self, creds) -> None:
+        """silently refresh expired credentials and persist the new token"""
+        logger.debug("Refreshing expired Gmail credentials.")
+        creds.refresh(Request())
+        self._save_credentials(creds)
+
+    def get_service(self):
+        """return the Gmail API service, building it on first use from the discovery
+        document bundled with googleapiclient. Expired credentials are refreshed."""
+        if self.creds.expired and self.creds.refresh_token:
+            self._refresh(self.creds)
+        if self._service is None:
+            logger.debug("Building Gmail API service.")
+            self._service = build(
+                "gmail",
+                "v1",
+                credentials=self.creds,
+                static_discovery=True,
+                cache_discovery=False,
+            )
+        return self._service
+
+    def get_recipients(self) -> list[str]:
+        """return the recipients as a list"""
+        if isinstance(self.recipients, str):
+            return [self.recipients]
+        return list(self.recipients)
+
+    def get_message_recipients(self, recipients: list[str] | None = None) -> list[list[str]]:
+        """return the recipients of each message to send to recipients
+        (default every recipient)"""
+        if recipients is None:
+            recipients = self.get_recipients()
+        if self.separate_messages:
+            return [[recipient] for recipient in recipients]
+        return [list(recipients)]
+
+    def timezone_groups(self) -> dict[str | None, list[str]]:
+        """return the recipients grouped by the timezone they are rendered in"""
+        return group_by_timezone(self.get_recipients(), self.recipient_timezones)
 
     def send(self, subject: str, msg: str, formatted_msg: str | None = None) -> None:
         """Sends email notification"""
+        self.send_to(self.get_recipients(), subject, msg, formatted_msg)
+
+    def send_to(
+        self, recipients: list[str], subject: str, msg: str, formatted_msg: str | None = None
+    ) -> None:
+        """Sends email notification to some of the recipients"""
         logger.info("Preparing to send Gmail notification. Subject: {}", subject)
-        service = build("gmail", "v1", credentials=self.creds)
 
-        message = self.get_msg(subject, msg, formatted_msg)
-        logger.debug(
-            "Constructed MIMEText message for Gmail. To: {}, Subject: {}",
-            message["to"],
-            message["subject"],
-        )
-        raw_message = base64.urlsafe_b64encode(message.as_bytes()).decode()
-        body = {"raw": raw_message}
+        message = encode_message(subject, msg, formatted_msg)
+        messages = []
+        for to in self.get_message_recipients(recipients):
+            logger.debug("Constructed message for Gmail. To: {}, Subject: {}", to, subject)
+            headers = {"To": ", ".join(to)}
+            raw_message = base64.urlsafe_b64encode(add_headers(message, headers)).decode()
+            messages.append((to, {"raw": raw_message}))
+        self.send_messages(messages)
+
+    def send_messages(self, messages: list[tuple[list[str], dict[str, Any]]]) -> None:
+        """Send (recipients, body) messages through the Gmail API.
+
+        A single message is sent directly; several are grouped into batch requests
+        of up to batch_size, paced to stay within the per-user quota. Messages
+        rejected by rate limits or server errors are retried on their own. Raises a
+        DeliveryError naming the recipients whose messages could not be sent.
+        """
+        failed: dict[str, BaseException] = {}
+        pending = messages
+        for attempt in range(MAX_RETRIES + 1):
+            if attempt:
+                logger.warning("Retrying {} Gmail messages", len(pending))
+                time.sleep(self.retry_delay * 2 ** (attempt - 1))
+            retry = []
+            for start in range(0, len(pending), max(1, self.batch_size)):
+                chunk = pending[start : start + max(1, self.batch_size)]
+                self.quota.acquire(len(chunk) * SEND_QUOTA_UNITS)
+                errors = self._execute(chunk)
+                for (to, body), error in zip(chunk, errors, strict=True):
+                    if error is None:
+                        for recipient in to:
+                            failed.pop(recipient, None)
+                    elif is_retryable(error) and attempt < MAX_RETRIES:
+                        retry.append((to, body))
+                    else:
+                        # a message failed for each of its recipients
+                        failed.update(dict.fromkeys(to, error))
+            if not retry:
+                break
+            pending = retry
+
+        if failed:
+            for to, error in failed.items():
+                logger.error("Failed to send Gmail notification to {}: {}", to, error)
+            raise DeliveryError(
+                f"Unable to send Gmail notifications to {len(failed)} recipients",
+                list(failed),
+            )
+        logger.info("Gmail notification sent successfully.")
+
+    def _execute(self, chunk: list[tuple[list[str], dict[str, Any]]]) -> list[BaseException | None]:
+        """send a chunk of messages in one HTTP request, returning each message's error"""
+        errors: list[BaseException | None] = [None] * len(chunk)
+
+        def callback(request_id: str, _response: Any, exception: BaseException | None) -> None:
+            errors[int(request_id)] = exception
 
         try:
-            logger.debug("Sending message via Gmail API...")
-            service.users().messages().send(userId="me", body=body).execute()
-            logger.info("Gmail notification sent successfully.")
-        except googleapiclient.errors.Error as ex:
+            # the service's http transport is not thread safe
+            with self._lock:
+                service = self.get_service()
+                if len(chunk) == 1:
+                    logger.debug("Sending message via Gmail API...")
+                    try:
+                        service.users().messages().send(userId="me", body=chunk[0][1]).execute()
+                    except googleapiclient.errors.HttpError as ex:
+                        errors[0] = ex
+                    return errors
+
+                logger.debug("Sending batch of {} messages via Gmail API...", len(chunk))
+                batch = service.new_batch_http_request(callback=callback)
+                for position, (_, body) in enumerate(chunk):
+                    batch.add(
+                        service.users().messages().send(userId="me", body=body),
+                        request_id=str(position),
+                    )
+                batch.execute()
+        except (googleapiclient.errors.Error, RefreshError) as ex:
             logger.error("Failed to send Gmail notification: {}", ex)
-            raise
+            raise NotificationError(f"Unable to send Gmail notification {ex}") from ex
+        return errors
 
     def __repr__(self) -> str:
         return f"GmailNotificationService(authenticated={bool(self.creds)})"
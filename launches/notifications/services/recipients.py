@@ -0,0 +1,16 @@
+"""Space Launch Notifications - Recipient Timezones
+
+Copyright ©️ 2025 Scott Cummings
+SPDX-License-Identifier: MIT OR Apache-2.0
+"""
+
+
+def group_by_timezone(
+    recipients: list[str], recipient_timezones: dict[str, str]
+) -> dict[str | None, list[str]]:
+    """Group recipients by their declared timezone, keeping their configured order.
+    Recipients without a timezone are grouped under None, the handler's timezone."""
+    groups: dict[str | None, list[str]] = {}
+    for recipient in recipients:
+        groups.setdefault(recipient_timezones.get(recipient), []).append(recipient)
+    return groups
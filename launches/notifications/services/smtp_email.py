@@ -5,22 +5,68 @@ SPDX-License-Identifier: MIT OR Apache-2.0
 """
 
 import base64
+import hashlib
 import smtplib
-import ssl
-from email.mime.multipart import MIMEMultipart
-from email.mime.text import MIMEText
+import time
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from typing import ClassVar
 
 from loguru import logger
 
-from launches.errors import NotificationError
+from launches.errors import DeliveryError, NotificationError
+from launches.notifications.mime import add_headers, encode_message, iter_mime_message
+from launches.notifications.services import ServiceCapabilities
+from launches.notifications.services.recipients import group_by_timezone
+from launches.notifications.services.smtp_pool import (
+    DEFAULT_IDLE_TIMEOUT,
+    DEFAULT_POOL_SIZE,
+    SMTPConnectionPool,
+    get_connection_pool,
+    release_connection_pool,
+)
 
 CONNECT_TIMEOUT = 30
+DATA_BUFFER_SIZE = 8192  # bytes of message data buffered between socket writes
+RECIPIENTS_PER_MESSAGE = 50  # recipients per SMTP transaction, below common server limits
+MAX_RETRIES = 2  # retries for recipients which failed with a transient error
+RETRY_DELAY = 1.0  # seconds before the first retry, doubled for each later retry
+
+
+@dataclass
+class RecipientResult:
+    """The delivery outcome for a single recipient"""
+
+    recipient: str
+    success: bool
+    code: int | None = None
+    response: str = ""
+
+    @property
+    def retryable(self) -> bool:
+        """True if delivery failed with a transient (4xx) or connection error"""
+        return not self.success and (self.code is None or 400 <= self.code < 500)
+
+
+def decode_response(response: bytes | str) -> str:
+    """return an SMTP server response as text"""
+    if isinstance(response, bytes):
+        return response.decode("utf-8", errors="replace")
+    return response
+
+
+def dot_stuff(lines: Iterable[bytes]) -> Iterator[bytes]:
+    """escape lines starting with a period, as required inside SMTP DATA"""
+    for line in lines:
+        yield b"." + line if line.startswith(b".") else line
 
 
 class SMTPEmaiLNotificationService:
     """An email notification service which connects to
     a SMTP server with the credentials provided"""
 
+    capabilities: ClassVar = ServiceCapabilities(streaming=True, batch=True, pooled=True)
+
     def __init__(self, *_args, **kwargs) -> None:
         self.server: str = kwargs["smtp_server"]
         self.port: int = kwargs["smtp_port"]
@@ -37,27 +83,55 @@ class SMTPEmaiLNotificationService:
             self.password = None
         self.sender: str = kwargs["sender"]
         self.recipients: list[str] | str = kwargs["recipients"]
+        # recipient -> timezone their notifications are rendered in
+        self.recipient_timezones: dict[str, str] = dict(kwargs.get("recipient_timezones", {}))
+        self.recipients_per_message = int(
+            kwargs.get("recipients_per_message", RECIPIENTS_PER_MESSAGE)
+        )
+        self.max_retries = int(kwargs.get("max_retries", MAX_RETRIES))
+        self.retry_delay = float(kwargs.get("retry_delay", RETRY_DELAY))
+        # services connecting to the same server with the same credentials and
+        # pool settings share sessions, a changed password or pool gets its own
+        pool_size = int(kwargs.get("pool_size", DEFAULT_POOL_SIZE))
+        idle_timeout = float(kwargs.get("idle_timeout", DEFAULT_IDLE_TIMEOUT))
+        credentials = hashlib.sha256(f"{self.username}\0{self.password}".encode("utf-8"))
+        self.pool_key: tuple | None = (
+            self.server,
+            self.port,
+            self.use_tls,
+            self.local_hostname,
+            self.username,
+            credentials.hexdigest(),
+            pool_size,
+            idle_timeout,
+        )
+        self.pool: SMTPConnectionPool = get_connection_pool(
+            self.pool_key, self._create_smtp_connection, pool_size, idle_timeout
+        )
         logger.info("Initialized {}", self)
 
-    def get_msg(self, subject: str, body: str, html_body: str | None) -> MIMEMultipart | MIMEText:
-        """build the message using MIMEText
-        return the message as a str"""
-        if html_body:
-            msg: MIMEMultipart | MIMEText = MIMEMultipart("alternative")
-        else:
-            msg = MIMEText(body)
-        msg["Subject"] = subject
-        msg["From"] = self.sender
-        if isinstance(self.recipients, list):
-            msg["To"] = ", ".join(self.recipients)
-        else:
-            msg["To"] = self.recipients
-        if html_body:
-            text = MIMEText(body, "text")
-            html = MIMEText(html_body, "html")
-            msg.attach(text)
-            msg.attach(html)
-        return msg
+    def close(self) -> None:
+        """stop using the shared connection pool, closing it if no other service uses it"""
+        if self.pool_key is not None:
+            release_connection_pool(self.pool_key)
+            self.pool_key = None
+
+    def get_recipients(self) -> list[str]:
+        """return the recipients as a list"""
+        if isinstance(self.recipients, str):
+            return [self.recipients]
+        return list(self.recipients)
+
+    def get_headers(self, recipients: list[str] | None = None) -> dict[str, str]:
+        """return the address headers stamped on each message to recipients
+        (default every recipient)"""
+        if recipients is None:
+            recipients = self.get_recipients()
+        return {"From": self.sender, "To": ", ".join(recipients)}
+
+    def timezone_groups(self) -> dict[str | None, list[str]]:
+        """return the recipients grouped by the timezone they are rendered in"""
+        return group_by_timezone(self.get_recipients(), self.recipient_timezones)
 
     def _create_smtp_connection(self):
         """Create and return an SMTP connection as a context manager"""
@@ -85,25 +159,166 @@ class SMTPEmaiLNotificationService:
         """Attempt to connect to SMTP server and send email
         will raise a NotificationError if there were any issues
         msg must be a valid email message"""
+        self.send_to(self.get_recipients(), subject, msg, formatted_msg)
+
+    def send_to(
+        self, recipients: list[str], subject: str, msg: str, formatted_msg: str | None
+    ) -> None:
+        """send email to some of the recipients
+        will raise a NotificationError if there were any issues"""
 
         logger.info("Attempting to send email notification")
-        message = self.get_msg(subject, msg, formatted_msg)
+        message = encode_message(subject, msg, formatted_msg)
+
+        logger.debug("Email details - Subject: '{}', To: {}", subject, recipients)
+
+        results = self.deliver(message, recipients)
+        self.check_results(results)
+
+    def deliver(self, message: bytes, recipients: list[str]) -> dict[str, RecipientResult]:
+        """Send an encoded message without address headers to recipients, returning a
+        RecipientResult per recipient. Recipients which failed transiently are retried,
+        the rest are not resent"""
+        results: dict[str, RecipientResult] = {}
+        pending = recipients
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                logger.warning("Retrying email notification for {} recipients", len(pending))
+                time.sleep(self.retry_delay * 2 ** (attempt - 1))
+            results.update(self._deliver_chunks(message, pending))
+            pending = [recipient for recipient in pending if results[recipient].retryable]
+            if not pending:
+                break
+        return results
+
+    def _deliver_chunks(self, message: bytes, recipients: list[str]) -> dict[str, RecipientResult]:
+        """send message to recipients in chunks of recipients_per_message,
+        sending chunks in parallel over pooled connections"""
+        size = max(1, self.recipients_per_message)
+        chunks = [recipients[i : i + size] for i in range(0, len(recipients), size)]
+        if len(chunks) == 1:
+            return self._deliver_chunk(message, chunks[0])
 
+        results: dict[str, RecipientResult] = {}
+        futures = [self.pool.executor.submit(self._deliver_chunk, message, c) for c in chunks]
+        for future in futures:
+            results.update(future.result())
+        return results
+
+    def _deliver_chunk(self, message: bytes, chunk: list[str]) -> dict[str, RecipientResult]:
+        """send message to a single chunk of recipients in one SMTP transaction,
+        addressed to only the recipients of the chunk"""
+        message = add_headers(message, self.get_headers(chunk))
+        try:
+            # a pooled session the server dropped since its health check is
+            # replaced and the message resent once
+            for attempt in range(2):
+                try:
+                    with self.pool.connection() as connection:
+                        logger.debug("Sending email message to {} recipients", len(chunk))
+                        try:
+                            refused = connection.sendmail(self.sender, chunk, message)
+                        except smtplib.SMTPRecipientsRefused as ex:
+                            # sendmail resets the transaction, the session is still usable
+                            refused = ex.recipients
+                    break
+                except smtplib.SMTPServerDisconnected:
+                    if attempt:
+                        raise
+                    logger.warning("SMTP server closed the connection, reconnecting")
+        except smtplib.SMTPResponseException as ex:
+            logger.error("SMTP Exception: {}", ex)
+            response = decode_response(ex.smtp_error)
+            return {r: RecipientResult(r, False, ex.smtp_code, response) for r in chunk}
+        except (smtplib.SMTPException, OSError) as ex:
+            logger.error("SMTP Exception: {}", ex)
+            return {r: RecipientResult(r, False, None, str(ex)) for r in chunk}
+
+        results = {}
+        for recipient in chunk:
+            if recipient in refused:
+                code, response = refused[recipient]
+                results[recipient] = RecipientResult(
+                    recipient, False, code, decode_response(response)
+                )
+            else:
+                results[recipient] = RecipientResult(recipient, True, 250)
+        return results
+
+    def check_results(self, results: dict[str, RecipientResult]) -> None:
+        """log the delivery results, raising a DeliveryError if any recipient failed"""
+        failed = [result for result in results.values() if not result.success]
+        if failed:
+            logger.error(
+                "SMTP Send Errors: {}",
+                {result.recipient: (result.code, result.response) for result in failed},
+            )
+            raise DeliveryError(
+                f"Unable to send email notification to {len(failed)} of {len(results)} recipients",
+                [result.recipient for result in failed],
+            )
+        logger.info("Successfully sent email notification to {} recipients", len(results))
+
+    def send_stream(
+        self, subject: str, msg: Iterable[str], formatted_msg: Iterable[str] | None
+    ) -> None:
+        """Send an email whose bodies are encoded and written into the SMTP DATA
+        stream as they are rendered, so the full message is never held in memory.
+        The stream can only be consumed once, so every recipient is sent in a single
+        transaction without retries. More recipients than recipients_per_message
+        can't share one transaction, so the bodies are rendered in full and sent
+        in chunks as by `send`.
+        will raise a NotificationError if there were any issues"""
+
+        if len(self.get_recipients()) > max(1, self.recipients_per_message):
+            logger.info("Too many recipients to stream in one message, rendering in full")
+            formatted = "".join(formatted_msg) if formatted_msg is not None else None
+            self.send(subject, "".join(msg), formatted)
+            return
+
+        logger.info("Attempting to stream email notification")
         logger.debug("Email details - Subject: '{}', To: {}", subject, self.recipients)
+        headers = {"Subject": subject, **self.get_headers()}
+        lines = iter_mime_message(headers, msg, formatted_msg)
 
         try:
-            connection = self._create_smtp_connection()
-            logger.debug("Sending email message")
-            send_errs = connection.sendmail(self.sender, self.recipients, message.as_string())
-            if send_errs is not None and len(send_errs):
-                logger.error("SMTP Send Errors: {}", send_errs)
-        except (smtplib.SMTPException, ssl.SSLError) as ex:
+            with self.pool.connection() as connection:
+                code, response = connection.mail(self.sender)
+                if code != 250:
+                    raise smtplib.SMTPSenderRefused(code, response, self.sender)
+                results = {}
+                for recipient in self.get_recipients():
+                    code, response = connection.rcpt(recipient)
+                    results[recipient] = RecipientResult(
+                        recipient, code in (250, 251), code, decode_response(response)
+                    )
+                if any(result.success for result in results.values()):
+                    self._write_data(connection, lines)
+                else:
+                    connection.rset()
+        except (smtplib.SMTPException, OSError) as ex:
             logger.error("SMTP Exception: {}", ex)
             raise NotificationError(f"Unable to send email notification {ex}") from ex
-        finally:
-            connection.close()
 
-        logger.info("Successfully sent email notification")
+        self.check_results(results)
+
+    def _write_data(self, connection: smtplib.SMTP, lines: Iterable[bytes]) -> None:
+        """write message lines into an SMTP DATA command, buffering socket writes"""
+        code, response = connection.docmd("DATA")
+        if code != 354:
+            raise smtplib.SMTPDataError(code, response)
+        logger.debug("Streaming email message")
+        buffer = bytearray()
+        for line in dot_stuff(lines):
+            buffer += line
+            if len(buffer) >= DATA_BUFFER_SIZE:
+                connection.send(bytes(buffer))
+                buffer.clear()
+        buffer += b".\r\n"
+        connection.send(bytes(buffer))
+        code, response = connection.getreply()
+        if code != 250:
+            raise smtplib.SMTPDataError(code, response)
 
     def __repr__(self) -> str:
         return (
@@ -0,0 +1,158 @@
+"""Space Launch Notifications - SMTP Connection Pool
+
+Keeps authenticated SMTP sessions open between notifications so bursts of
+email sends skip the TLS handshake, ehlo and login of a fresh connection.
+
+Copyright ©️ 2025 Scott Cummings
+SPDX-License-Identifier: MIT OR Apache-2.0
+"""
+
+import atexit
+import smtplib
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from typing import Any
+
+from loguru import logger
+
+from launches.notifications.dispatch import SendExecutor
+
+DEFAULT_POOL_SIZE = 4  # open connections per SMTP server and login
+DEFAULT_IDLE_TIMEOUT = 60.0  # seconds an idle connection is kept before it is closed
+ACQUIRE_TIMEOUT = 60.0  # seconds to wait for a connection when the pool is exhausted
+
+
+def close_connection(connection: smtplib.SMTP) -> None:
+    """politely end an SMTP session, ignoring a connection that has already gone"""
+    try:
+        connection.quit()
+    except (smtplib.SMTPException, OSError):
+        connection.close()
+
+
+class SMTPConnectionPool:
+    """A bounded pool of keep-alive SMTP connections.
+
+    Idle connections are health checked with NOOP before reuse and closed once
+    they have been idle longer than `idle_timeout`; dead or expired connections
+    are transparently replaced by a new one from `connect`. A connection which
+    raised while in use is discarded rather than returned to the pool. The
+    pool's executor, with a worker per connection, sends messages in parallel.
+    """
+
+    def __init__(
+        self,
+        connect: Callable[[], smtplib.SMTP],
+        max_size: int = DEFAULT_POOL_SIZE,
+        idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+    ) -> None:
+        self.connect = connect
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self._idle: list[tuple[smtplib.SMTP, float]] = []
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_size)
+        self.executor = SendExecutor(max_size, "launches-smtp")
+        self.closed = False
+
+    def _take_idle(self) -> smtplib.SMTP | None:
+        """return the most recently used live idle connection, closing stale ones"""
+        while True:
+            with self._lock:
+                if not self._idle:
+                    return None
+                connection, released = self._idle.pop()
+            if time.monotonic() - released > self.idle_timeout:
+                logger.debug("Closing expired SMTP connection")
+                close_connection(connection)
+                continue
+            try:
+                if connection.noop()[0] == 250:
+                    return connection
+            except (smtplib.SMTPException, OSError):
+                pass
+            logger.debug("Pooled SMTP connection failed health check, reconnecting")
+            connection.close()
+
+    @contextmanager
+    def connection(self) -> Iterator[smtplib.SMTP]:
+        """borrow a connection for the duration of the with block"""
+        if not self._slots.acquire(timeout=ACQUIRE_TIMEOUT):
+            raise smtplib.SMTPException("Timed out waiting for a pooled SMTP connection")
+        try:
+            connection = self._take_idle()
+            if connection is None:
+                connection = self.connect()
+            try:
+                yield connection
+            except BaseException:
+                connection.close()
+                raise
+            with self._lock:
+                if not self.closed:
+                    self._idle.append((connection, time.monotonic()))
+                    connection = None
+            if connection is not None:
+                # the pool was closed while the connection was in use
+                close_connection(connection)
+        finally:
+            self._slots.release()
+
+    def close(self) -> None:
+        """close every idle connection, and connections in use once they are returned"""
+        with self._lock:
+            self.closed = True
+            idle, self._idle = self._idle, []
+        self.executor.shutdown()
+        for connection, _ in idle:
+            close_connection(connection)
+
+
+_pools: dict[tuple[Any, ...], SMTPConnectionPool] = {}
+_pool_users: dict[tuple[Any, ...], int] = {}
+_pools_lock = threading.Lock()
+
+
+def get_connection_pool(
+    key: tuple[Any, ...],
+    connect: Callable[[], smtplib.SMTP],
+    max_size: int = DEFAULT_POOL_SIZE,
+    idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+) -> SMTPConnectionPool:
+    """Return the pool shared by every service connecting with the same key.
+    The key must cover everything `connect` and the pool settings depend on,
+    since later services share the first service's pool. Each call must be
+    matched by a release_connection_pool once the service is discarded."""
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = SMTPConnectionPool(connect, max_size, idle_timeout)
+            _pools[key] = pool
+        _pool_users[key] = _pool_users.get(key, 0) + 1
+        return pool
+
+
+def release_connection_pool(key: tuple[Any, ...]) -> None:
+    """stop using the pool for key, closing it once no service uses it"""
+    with _pools_lock:
+        users = _pool_users.get(key, 0) - 1
+        if users > 0:
+            _pool_users[key] = users
+            return
+        _pool_users.pop(key, None)
+        pool = _pools.pop(key, None)
+    if pool is not None:
+        pool.close()
+
+
+@atexit.register
+def close_connection_pools() -> None:
+    """close and forget every shared pool"""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+        _pool_users.clear()
+    for pool in pools:
+        pool.close()
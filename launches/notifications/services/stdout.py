@@ -4,12 +4,20 @@ Copyright ©️ 2025 Scott Cummings
 SPDX-License-Identifier: MIT OR Apache-2.0
 """
 
+import sys
+from collections.abc import Iterable
+from typing import ClassVar
+
 from loguru import logger
 
+from launches.notifications.services import ServiceCapabilities
+
 
 class StdOutNotificationService:
     """A "dummy" notification service which just prints to stdout"""
 
+    capabilities: ClassVar = ServiceCapabilities(streaming=True)
+
     def __init__(self, *_args, **_kwargs) -> None:
         logger.info("Initialized {}", self)
 
@@ -19,5 +27,15 @@ class StdOutNotificationService:
         print(subject)
         print(msg)
 
+    def send_stream(
+        self, subject: str, msg: Iterable[str], formatted_msg: Iterable[str] | None
+    ) -> None:
+        """print notification to stdout as it is rendered"""
+        logger.info("Sending StdOut Notification")
+        print(subject)
+        for chunk in msg:
+            sys.stdout.write(chunk)
+        sys.stdout.write("\n")
+
     def __repr__(self) -> str:
         return "StdOutNotificationService()"
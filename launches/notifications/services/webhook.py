@@ -0,0 +1,228 @@
+"""Space Launch Notifications - Webhook Notification Service
+
+Posts notifications to HTTP endpoints over pooled keep-alive connections,
+so a cycle notifying hundreds of endpoints reuses a few TCP/TLS sessions
+per host rather than opening one per request.
+
+Copyright ©️ 2025 Scott Cummings
+SPDX-License-Identifier: MIT OR Apache-2.0
+"""
+
+import hashlib
+import hmac
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import ClassVar
+from urllib.parse import urlsplit
+
+import requests
+from loguru import logger
+from requests.adapters import HTTPAdapter
+
+from launches.errors import ConfigError, DeliveryError
+from launches.notifications.dispatch import DEFAULT_HANDLER_TIMEOUT
+from launches.notifications.services import ServiceCapabilities
+
+REQUEST_TIMEOUT = 10.0  # seconds to connect to, and wait for, an endpoint
+MAX_CONNECTIONS = 10  # concurrent requests, and keep-alive connections per host
+MAX_RETRIES = 2  # retries for endpoints which failed with a transient error
+RETRY_DELAY = 1.0  # seconds before the first retry, doubled for each later retry
+MAX_RETRY_AFTER = 60.0  # longest Retry-After an endpoint may ask for
+HOST_POOLS = 10  # minimum number of per host connection pools kept open
+SIGNATURE_HEADER = "X-Launches-Signature"
+TIMESTAMP_HEADER = "X-Launches-Timestamp"
+FORMATS = ("json", "body")
+
+
+@dataclass
+class EndpointResult:
+    """The delivery outcome for a single endpoint"""
+
+    url: str
+    success: bool
+    status: int | None = None
+    response: str = ""
+    retry_after: float = 0.0
+
+    @property
+    def retryable(self) -> bool:
+        """True if delivery failed with a connection error, 429 or 5xx"""
+        return not self.success and (
+            self.status is None or self.status == 429 or self.status >= 500
+        )
+
+
+def sign(secret: str, timestamp: str, body: bytes) -> str:
+    """return the HMAC-SHA256 signature of a timestamped request body"""
+    digest = hmac.new(
+        secret.encode("utf-8"), timestamp.encode("ascii") + b"." + body, hashlib.sha256
+    )
+    return "sha256=" + digest.hexdigest()
+
+
+def parse_retry_after(value: str | None) -> float:
+    """return the seconds of a numeric Retry-After header, capped at MAX_RETRY_AFTER"""
+    try:
+        return min(max(float(value or 0), 0.0), MAX_RETRY_AFTER)
+    except ValueError:
+        return 0.0
+
+
+class WebhookNotificationService:
+    """A notification service which posts each notification to HTTP endpoints.
+
+    The `json` format posts `{"subject", "text", "html"}`, the `body` format
+    posts the rendered body (html if rendered, otherwise text) as is. With a
+    `secret` every request is signed with HMAC-SHA256 over
+    `<timestamp>.<body>`, sent in the X-Launches-Timestamp and
+    X-Launches-Signature headers.
+    """
+
+    capabilities: ClassVar = ServiceCapabilities(pooled=True)
+
+    def __init__(self, *_args, **kwargs) -> None:
+        urls = kwargs["urls"]
+        self.urls: list[str] = [urls] if isinstance(urls, str) else list(urls)
+        self.format: str = kwargs.get("format", "json")
+        if self.format not in FORMATS:
+            raise ConfigError(f"Unknown webhook format {self.format}, expected one of {FORMATS}")
+        self.secret: str | None = kwargs.get("secret")
+        self.headers: dict[str, str] = dict(kwargs.get("headers", {}))
+        self.timeout = float(kwargs.get("timeout", REQUEST_TIMEOUT))
+        self.max_connections = int(kwargs.get("max_connections", MAX_CONNECTIONS))
+        self.max_retries = int(kwargs.get("max_retries", MAX_RETRIES))
+        self.retry_delay = float(kwargs.get("retry_delay", RETRY_DELAY))
+        # a send, with its retries, stays within the time dispatch waits for a handler
+        self.send_timeout = float(kwargs.get("send_timeout", DEFAULT_HANDLER_TIMEOUT))
+        self.session = self._create_session()
+        logger.info("Initialized {}", self)
+
+    def _create_session(self) -> requests.Session:
+        """a session keeping up to max_connections connections open per host"""
+        hosts = {urlsplit(url).netloc for url in self.urls}
+        adapter = HTTPAdapter(
+            pool_connections=max(HOST_POOLS, len(hosts)),
+            pool_maxsize=self.max_connections,
+        )
+        session = requests.Session()
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def close(self) -> None:
+        """close the session's pooled connections"""
+        self.session.close()
+
+    def get_body(self, subject: str, msg: str, formatted_msg: str | None) -> tuple[bytes, str]:
+        """return the request body and its content type"""
+        if self.format == "body":
+            if formatted_msg is not None:
+                return formatted_msg.encode("utf-8"), "text/html; charset=utf-8"
+            return msg.encode("utf-8"), "text/plain; charset=utf-8"
+        payload = {"subject": subject, "text": msg, "html": formatted_msg}
+        return json.dumps(payload).encode("utf-8"), "application/json"
+
+    def get_headers(self, body: bytes, content_type: str) -> dict[str, str]:
+        """return the request headers, signing the body with the current time if a
+        secret is configured, so each attempt is signed afresh"""
+        headers = {**self.headers, "Content-Type": content_type}
+        if self.secret:
+            timestamp = str(int(time.time()))
+            headers[TIMESTAMP_HEADER] = timestamp
+            headers[SIGNATURE_HEADER] = sign(self.secret, timestamp, body)
+        return headers
+
+    def send(self, subject: str, msg: str, formatted_msg: str | None) -> None:
+        """Post the notification to every endpoint
+        will raise a DeliveryError if any endpoint failed"""
+
+        logger.info("Attempting to send webhook notification to {} endpoints", len(self.urls))
+        body, content_type = self.get_body(subject, msg, formatted_msg)
+        results = self.deliver(body, content_type, self.urls)
+        self.check_results(results)
+
+    def deliver(self, body: bytes, content_type: str, urls: list[str]) -> dict[str, EndpointResult]:
+        """Post body to urls, returning an EndpointResult per url.
+        Endpoints which failed transiently are retried, the rest are not resent.
+        A retry which could not finish within send_timeout is not attempted."""
+        deadline = time.monotonic() + self.send_timeout
+        results: dict[str, EndpointResult] = {}
+        pending = urls
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                delay = self.retry_delay * 2 ** (attempt - 1)
+                delay = max([delay, *(results[url].retry_after for url in pending)])
+                if time.monotonic() + delay + self.timeout > deadline:
+                    logger.warning(
+                        "Not retrying webhook notification for {} endpoints,"
+                        " a retry in {:.1f}s would exceed the {}s send timeout",
+                        len(pending),
+                        delay,
+                        self.send_timeout,
+                    )
+                    break
+                logger.warning(
+                    "Retrying webhook notification for {} endpoints in {:.1f}s",
+                    len(pending),
+                    delay,
+                )
+                time.sleep(delay)
+            headers = self.get_headers(body, content_type)
+            results.update(self._post_all(body, headers, pending))
+            pending = [url for url in pending if results[url].retryable]
+            if not pending:
+                break
+        return results
+
+    def _post_all(
+        self, body: bytes, headers: dict[str, str], urls: list[str]
+    ) -> dict[str, EndpointResult]:
+        """post to urls in parallel, at most max_connections at a time"""
+        if len(urls) == 1:
+            return {urls[0]: self._post(body, headers, urls[0])}
+
+        workers = min(len(urls), self.max_connections)
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="launches-webhook") as pool:
+            return {
+                result.url: result
+                for result in pool.map(lambda url: self._post(body, headers, url), urls)
+            }
+
+    def _post(self, body: bytes, headers: dict[str, str], url: str) -> EndpointResult:
+        """post body to a single endpoint"""
+        try:
+            response = self.session.post(url, data=body, headers=headers, timeout=self.timeout)
+        except requests.RequestException as ex:
+            logger.debug("Webhook request to {} failed: {}", url, ex)
+            return EndpointResult(url, False, None, str(ex))
+
+        # read the whole response so the connection is returned to the pool
+        text = response.text
+        if response.ok:
+            return EndpointResult(url, True, response.status_code)
+        return EndpointResult(
+            url,
+            False,
+            response.status_code,
+            text[:200],
+            parse_retry_after(response.headers.get("Retry-After")),
+        )
+
+    def check_results(self, results: dict[str, EndpointResult]) -> None:
+        """log the delivery results, raising a DeliveryError if any endpoint failed"""
+        failed = [result for result in results.values() if not result.success]
+        if failed:
+            logger.error(
+                "Webhook Send Errors: {}",
+                {result.url: (result.status, result.response) for result in failed},
+            )
+            raise DeliveryError(
+                f"Unable to send webhook notification to {len(failed)} of {len(results)} endpoints",
+                [result.url for result in failed],
+            )
+        logger.info("Successfully sent webhook notification to {} endpoints", len(results))
+
+    def __repr__(self) -> str:
+        return f"WebhookNotificationService(endpoints={len(self.urls)}, format={self.format})"
@@ -0,0 +1,273 @@
+"""Space Launch Notifications - Outbox Module
+
+A durable SQLite queue between change detection and delivery. Every
+notification job is persisted before it is sent and only removed once its
+handler succeeds, so a change set the cache has already marked as seen is
+never lost to a failing service or a restart. Failed jobs are retried with
+exponential backoff by a background worker and dead-lettered once they run
+out of attempts.
+
+Copyright ©️ 2025 Scott Cummings
+SPDX-License-Identifier: MIT OR Apache-2.0
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections.abc import Iterator, Sequence
+from contextlib import closing, contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+
+from launches.idempotency import SentIndex
+from launches.notifications.dispatch import (
+    DispatchResult,
+    NotificationJob,
+    Sender,
+    dispatch_notifications,
+    handler_name,
+)
+
+OUTBOX_FILE = "outbox.sqlite3"
+MAX_ATTEMPTS = 5  # attempts before a notification is dead-lettered
+RETRY_DELAY = 60.0  # seconds before the first retry, doubled for each later retry
+MAX_RETRY_DELAY = 3600.0  # longest wait between retries
+LEASE_SECONDS = 300.0  # time an in flight notification is hidden from other senders
+WORKER_INTERVAL = 30.0  # seconds between background retry passes
+
+PENDING = "pending"
+DEAD = "dead"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS change_sets (
+    id INTEGER PRIMARY KEY,
+    launches TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS deliveries (
+    id INTEGER PRIMARY KEY,
+    change_set INTEGER NOT NULL REFERENCES change_sets(id),
+    handler TEXT NOT NULL,
+    state TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt REAL NOT NULL,
+    last_error TEXT,
+    created REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS deliveries_due ON deliveries (state, next_attempt);
+"""
+
+
+@dataclass
+class OutboxEntry:
+    """A persisted NotificationJob"""
+
+    id: int
+    job: NotificationJob
+    attempts: int = 0
+
+
+class NotificationOutbox:
+    """Persists notification jobs until they are delivered.
+
+    Delivery is at-least-once: a job is deleted only after its handler
+    succeeds, and a job whose sender crashed is retried once its lease expires.
+    Handlers are looked up by name, so `register` must be called with the
+    configured handlers before retrying jobs persisted by an earlier process.
+    With a `sent_index`, changes a handler has already delivered are never sent
+    again, so retries and restarts cannot cause duplicates.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str,
+        max_attempts: int = MAX_ATTEMPTS,
+        retry_delay: float = RETRY_DELAY,
+        lease_seconds: float = LEASE_SECONDS,
+        sent_index: SentIndex | None = None,
+    ) -> None:
+        os.makedirs(cache_dir, exist_ok=True)
+        self.path = Path(cache_dir) / OUTBOX_FILE
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.lease_seconds = lease_seconds
+        self.sent_index = sent_index
+        self._handlers: dict[str, Sender] = {}
+        self._lock = threading.Lock()
+        with self._transaction() as db:
+            db.executescript(SCHEMA)
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """a connection committing on success and rolling back on error"""
+        with self._lock, closing(sqlite3.connect(self.path, timeout=30)) as db, db:
+            yield db
+
+    def register(self, notification_handlers: Sequence[Sender]) -> None:
+        """make handlers available to retry persisted jobs, expanding routers and
+        coalescers into the handlers they send to"""
+        for handler in notification_handlers:
+            self._handlers[handler_name(handler)] = handler
+            if callable(getattr(type(handler), "routed_handlers", None)):
+                self.register(handler.routed_handlers())  # type: ignore[attr-defined]
+
+    def enqueue(self, jobs: Sequence[NotificationJob], lease: bool = False) -> list[OutboxEntry]:
+        """Persist jobs, storing each change set once however many handlers send it.
+        Leased jobs are about to be sent by the caller and are hidden from retries."""
+        now = time.time()
+        next_attempt = now + self.lease_seconds if lease else now
+        entries = []
+        change_sets: dict[int, int] = {}
+        with self._transaction() as db:
+            for job in jobs:
+                self._handlers.setdefault(handler_name(job.handler), job.handler)
+                change_set = change_sets.get(id(job.launches))
+                if change_set is None:
+                    cursor = db.execute(
+                        "INSERT INTO change_sets (launches) VALUES (?)",
+                        (json.dumps(job.launches),),
+                    )
+                    change_set = cursor.lastrowid  # type: ignore[assignment]
+                    change_sets[id(job.launches)] = change_set
+                cursor = db.execute(
+                    "INSERT INTO deliveries (change_set, handler, state, next_attempt, created)"
+                    " VALUES (?, ?, ?, ?, ?)",
+                    (change_set, handler_name(job.handler), PENDING, next_attempt, now),
+                )
+                entries.append(OutboxEntry(cursor.lastrowid, job))  # type: ignore[arg-type]
+        return entries
+
+    def send(self, entries: Sequence[OutboxEntry]) -> list[DispatchResult]:
+        """dispatch persisted jobs and record their outcomes"""
+        jobs = [entry.job for entry in entries]
+        if self.sent_index is not None:
+            results = self.sent_index.dispatch(jobs)
+        else:
+            results = dispatch_notifications(jobs)
+        self._record(entries, results)
+        return results
+
+    def deliver(self, jobs: Sequence[NotificationJob]) -> list[DispatchResult]:
+        """persist and immediately send jobs"""
+        return self.send(self.enqueue(jobs, lease=True))
+
+    def retry_due(self) -> list[DispatchResult]:
+        """send every pending job whose retry is due"""
+        entries = self._claim_due()
+        if not entries:
+            return []
+        logger.info("Retrying {} queued notifications", len(entries))
+        return self.send(entries)
+
+    def _claim_due(self) -> list[OutboxEntry]:
+        """lease the due jobs, dead-lettering jobs for handlers no longer configured"""
+        now = time.time()
+        entries = []
+        with self._transaction() as db:
+            rows = db.execute(
+                "SELECT d.id, d.handler, d.attempts, c.launches FROM deliveries d"
+                " JOIN change_sets c ON c.id = d.change_set"
+                " WHERE d.state = ? AND d.next_attempt <= ? ORDER BY d.id",
+                (PENDING, now),
+            ).fetchall()
+            loaded: dict[str, dict[str, Any]] = {}
+            for delivery_id, name, attempts, launches in rows:
+                handler = self._handlers.get(name)
+                if handler is None:
+                    logger.error(
+                        "No handler named {} for queued notification, dead-lettering", name
+                    )
+                    db.execute(
+                        "UPDATE deliveries SET state = ?, last_error = ? WHERE id = ?",
+                        (DEAD, "unknown handler", delivery_id),
+                    )
+                    continue
+                # handlers sharing a change set share one launches dict, like a fresh dispatch
+                if launches not in loaded:
+                    loaded[launches] = json.loads(launches)
+                job = NotificationJob(handler, loaded[launches])
+                entries.append(OutboxEntry(delivery_id, job, attempts))
+            db.executemany(
+                "UPDATE deliveries SET next_attempt = ? WHERE id = ?",
+                [(now + self.lease_seconds, entry.id) for entry in entries],
+            )
+        return entries
+
+    def _record(self, entries: Sequence[OutboxEntry], results: Sequence[DispatchResult]) -> None:
+        now = time.time()
+        with self._transaction() as db:
+            for entry, result in zip(entries, results, strict=True):
+                if result.success:
+                    db.execute("DELETE FROM deliveries WHERE id = ?", (entry.id,))
+                    continue
+                attempts = entry.attempts + 1
+                if attempts >= self.max_attempts:
+                    logger.error(
+                        "Notification for {} failed {} times, dead-lettering: {}",
+                        entry.job.handler,
+                        attempts,
+                        result.error,
+                    )
+                    state, next_attempt = DEAD, now
+                else:
+                    delay = min(self.retry_delay * 2 ** (attempts - 1), MAX_RETRY_DELAY)
+                    logger.warning(
+                        "Notification for {} failed, retrying in {:.0f}s", entry.job.handler, delay
+                    )
+                    state, next_attempt = PENDING, now + delay
+                db.execute(
+                    "UPDATE deliveries SET state = ?, attempts = ?, next_attempt = ?,"
+                    " last_error = ? WHERE id = ?",
+                    (state, attempts, next_attempt, str(result.error), entry.id),
+                )
+            db.execute(
+                "DELETE FROM change_sets WHERE id NOT IN (SELECT change_set FROM deliveries)"
+            )
+
+    def counts(self) -> dict[str, int]:
+        """return the number of queued notifications in each state"""
+        with self._transaction() as db:
+            rows = db.execute("SELECT state, COUNT(*) FROM deliveries GROUP BY state").fetchall()
+        return {PENDING: 0, DEAD: 0, **dict(rows)}
+
+    def dead_letters(self) -> list[tuple[str, str | None]]:
+        """return the handler name and last error of every dead-lettered notification"""
+        with self._transaction() as db:
+            return db.execute(
+                "SELECT handler, last_error FROM deliveries WHERE state = ? ORDER BY id", (DEAD,)
+            ).fetchall()
+
+
+class OutboxWorker:
+    """Retries due outbox notifications on a background thread"""
+
+    def __init__(self, outbox: NotificationOutbox, interval: float = WORKER_INTERVAL) -> None:
+        self.outbox = outbox
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        """start retrying, beginning with jobs left over from a previous run"""
+        self._thread = threading.Thread(target=self._run, name="launches-outbox", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float | None = None) -> None:
+        """stop retrying once the current pass completes"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self) -> None:
+        while True:
+            try:
+                self.outbox.retry_due()
+            except Exception as ex:
+                # the worker must survive errors, queued notifications stay persisted
+                logger.exception("Unhandled exception retrying queued notifications: {}", ex)
+            if self._stop.wait(self.interval):
+                return
@@ -0,0 +1,97 @@
+"""Space Launch Notifications - Plugin Registry Module
+
+Notification services and renderers are registered by name as the
+"module:attribute" implementing them, and imported on first use. Other
+packages add their own through Python entry points, e.g. in pyproject.toml:
+
+    [project.entry-points."launches.notification_services"]
+    sms = "launches_sms:SMSNotificationService"
+
+Copyright ©️ 2025 Scott Cummings
+SPDX-License-Identifier: MIT OR Apache-2.0
+"""
+
+import importlib
+import threading
+from functools import reduce
+from typing import Any
+
+from loguru import logger
+
+
+def load_target(target: str) -> Any:
+    """import and return the object named by a "module:attribute" target"""
+    module_name, _, attribute = target.partition(":")
+    module = importlib.import_module(module_name.strip())
+    if not attribute:
+        return module
+    return reduce(getattr, attribute.strip().split("."), module)
+
+
+class PluginRegistry:
+    """Implementations registered by name and imported on first use.
+
+    Entry points in `group` are discovered the first time an unregistered name
+    is looked up, or the registry is listed, so runs using only built-in
+    implementations never scan the installed packages. Built-in and explicitly
+    registered names take priority over plugins.
+    """
+
+    def __init__(self, group: str, builtins: dict[str, str]) -> None:
+        self.group = group
+        self._targets: dict[str, Any] = dict(builtins)
+        self._loaded: dict[str, Any] = {}
+        self._discovered = False
+        self._lock = threading.Lock()
+
+    def register(self, name: str, target: Any) -> None:
+        """register `target`, a "module:attribute" string or the implementation, as `name`"""
+        with self._lock:
+            self._targets[name] = target
+            self._loaded.pop(name, None)
+
+    def discover(self) -> None:
+        """register the entry points of the group, once"""
+        with self._lock:
+            if self._discovered:
+                return
+            self._discovered = True
+            # importlib.metadata is only imported when a plugin is needed
+            from importlib.metadata import entry_points
+
+            for entry_point in entry_points(group=self.group):
+                if entry_point.name in self._targets:
+                    logger.warning(
+                        "Ignoring plugin {} for {}, the name is already registered",
+                        entry_point.value,
+                        entry_point.name,
+                    )
+                    continue
+                logger.debug("Discovered {} plugin {}", self.group, entry_point.name)
+                self._targets[entry_point.name] = entry_point.value
+
+    def targets(self) -> dict[str, Any]:
+        """return the registered targets by name, without discovering plugins"""
+        return dict(self._targets)
+
+    def names(self) -> list[str]:
+        """return every registered name, including plugins"""
+        self.discover()
+        return sorted(self._targets)
+
+    def __contains__(self, name: object) -> bool:
+        if name not in self._targets:
+            self.discover()
+        return name in self._targets
+
+    def load(self, name: str) -> Any:
+        """import and return the implementation of `name`,
+        raising a KeyError if no implementation is registered"""
+        if name in self._loaded:
+            return self._loaded[name]
+        if name not in self:
+            raise KeyError(name)
+        target = self._targets[name]
+        implementation = load_target(target) if isinstance(target, str) else target
+        self._loaded[name] = implementation
+        return implementation
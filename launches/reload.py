@@ -0,0 +1,202 @@
+"""Space Launch Notifications - Configuration Reload Module
+
+Watches the configuration file while the service runs and applies changes
+between checks. Only the handlers and schedule entries affected by a change
+are rebuilt, so the launch cache, the outbox and the pooled connections of
+unchanged handlers stay warm.
+
+Copyright ©️ 2025 Scott Cummings
+SPDX-License-Identifier: MIT OR Apache-2.0
+"""
+
+import os
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+import schedule
+from loguru import logger
+
+from launches.config import LaunchesConfig, load_config
+from launches.errors import ConfigError, LaunchesError
+from launches.launches import LaunchCheck, schedule_daily_checks, schedule_periodic_checks
+from launches.notifications.dispatch import Sender
+from launches.notifications.handlers import HandlerReuse
+from launches.scheduling import GuardedJob
+
+# settings which are only read at startup, changing them needs a restart
+RESTART_FIELDS = (
+    "cache_enabled",
+    "cache_directory",
+    "outbox_enabled",
+    "outbox_max_attempts",
+    "sent_index_size",
+    "debounce_seconds",
+    "service_runtime",
+    "reload_config",
+    "metrics_port",
+    "metrics_host",
+)
+
+
+@dataclass
+class ServicePlan:
+    """The parts of the configuration a running service applies"""
+
+    window_hours: int
+    notification_handlers: list[Sender]
+    periodic: bool
+    repeat_hours: int
+    specific_times: list[str]
+    tz: str
+    deadline_seconds: float
+
+    def schedule_key(self) -> tuple[Any, ...]:
+        """the settings the schedule entries are created from"""
+        if self.periodic:
+            return (True, self.repeat_hours)
+        return (False, tuple(self.specific_times), self.tz)
+
+
+class ConfigWatcher:
+    """Polls a configuration file for changes using its modification time and
+    size, which costs a single stat per poll."""
+
+    def __init__(self, path: str, config: LaunchesConfig) -> None:
+        self.path = path
+        self.config = config
+        self._signature = self._stat()
+
+    def _stat(self) -> tuple[int, int] | None:
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def poll(self) -> LaunchesConfig | None:
+        """Return the new configuration if the file changed and is valid.
+        An invalid or unreadable file is logged and the current config is kept."""
+        signature = self._stat()
+        if signature is None or signature == self._signature:
+            return None
+        self._signature = signature
+        try:
+            config = load_config(self.path)
+        except ConfigError as ex:
+            logger.error("Ignoring invalid configuration change, keeping current config: {}", ex)
+            return None
+        if config == self.config:
+            logger.debug("Configuration file touched without changes")
+            return None
+        self.config = config
+        return config
+
+
+def changed_fields(old: LaunchesConfig, new: LaunchesConfig) -> list[str]:
+    """return the names of the top-level settings which differ"""
+    return [
+        name for name in LaunchesConfig.model_fields if getattr(old, name) != getattr(new, name)
+    ]
+
+
+class ConfigReloader:
+    """Applies configuration changes to a running schedule service.
+
+    `build_plan` builds the ServicePlan for a configuration, getting its
+    handlers through the given HandlerReuse. Applying a plan swaps the handlers
+    and window of the attached LaunchCheck and the deadline of its job, and
+    re-creates the schedule entries only if the check times changed.
+    """
+
+    def __init__(
+        self,
+        watcher: ConfigWatcher,
+        build_plan: Callable[[LaunchesConfig, HandlerReuse], ServicePlan],
+        plan: ServicePlan,
+        reuse: HandlerReuse,
+    ) -> None:
+        self.watcher = watcher
+        self.build_plan = build_plan
+        self.plan = plan
+        self.reuse = reuse
+        self.check: LaunchCheck | None = None
+        self.job: GuardedJob | None = None
+        self.entries: list[schedule.Job] = []
+
+    def attach(self, check: LaunchCheck, job: GuardedJob, entries: list[schedule.Job]) -> None:
+        """attach the running check, its job and its schedule entries"""
+        self.check = check
+        self.job = job
+        self.entries = entries
+
+    def poll(self) -> bool:
+        """apply the configuration file if it changed, returning True if applied"""
+        old_config = self.watcher.config
+        config = self.watcher.poll()
+        if config is None:
+            return False
+
+        reuse = HandlerReuse(self.reuse)
+        try:
+            plan = self.build_plan(config, reuse)
+        except LaunchesError as ex:
+            logger.error("Unable to apply configuration change, keeping current config: {}", ex)
+            # handlers built before the failure would otherwise hold their connections
+            self.close_handlers(reuse.built())
+            return False
+
+        changed = changed_fields(old_config, config)
+        restart = [name for name in changed if name in RESTART_FIELDS]
+        if restart:
+            logger.warning("Configuration changes to {} apply after a restart", restart)
+        self.apply(plan)
+        self.close_handlers(reuse.removed())
+        self.reuse = reuse
+        logger.info(
+            "Reloaded configuration: changed {}, rebuilt handlers {}", changed, reuse.rebuilt()
+        )
+        return True
+
+    def apply(self, plan: ServicePlan) -> None:
+        """switch the running check, job and schedule entries to plan"""
+        if self.check is not None:
+            self.check.window_hours = plan.window_hours
+            self.check.notification_handlers = plan.notification_handlers
+            self.check.deadline_seconds = plan.deadline_seconds
+        if self.job is not None:
+            self.job.deadline_seconds = plan.deadline_seconds
+            if plan.schedule_key() != self.plan.schedule_key():
+                self.reschedule(self.job, plan)
+        self.plan = plan
+
+    def reschedule(self, job: GuardedJob, plan: ServicePlan) -> None:
+        """Replace the schedule entries of job. The new entries are created
+        before the old ones are cancelled, so invalid times keep the old schedule."""
+        existing = schedule.get_jobs()
+        try:
+            if plan.periodic:
+                entries = schedule_periodic_checks(job, plan.repeat_hours)
+            else:
+                entries = schedule_daily_checks(job, plan.specific_times, plan.tz)
+        except Exception as ex:
+            logger.error("Unable to reschedule launch checks, keeping current schedule: {}", ex)
+            for entry in schedule.get_jobs():
+                if entry not in existing:
+                    schedule.cancel_job(entry)
+            return
+        for entry in self.entries:
+            schedule.cancel_job(entry)
+        self.entries = entries
+        if plan.periodic:
+            logger.info("Rescheduled launch checks every {} hours", plan.repeat_hours)
+        else:
+            logger.info("Rescheduled launch checks at {} ({})", plan.specific_times, plan.tz)
+
+    @staticmethod
+    def close_handlers(handlers: list[Sender]) -> None:
+        """close the handlers which hold resources"""
+        for handler in handlers:
+            close = getattr(handler, "close", None)
+            if callable(close):
+                close()
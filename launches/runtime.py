@@ -0,0 +1,399 @@
+"""Space Launch Notifications - Asyncio Service Runtime Module
+
+An alternative to the `schedule` polling loops in `launches.launches`. Fetching,
+change detection and notification dispatch run as separate asyncio tasks joined
+by bounded queues, so a slow notification service never delays the next check.
+
+Blocking stage work runs on the service's own small thread pool, while
+notifications are sent on the dispatch module's SendExecutor, so handlers hung
+past their timeout can never starve the fetch and diff stages. A stage which
+times out stops waiting, but the abandoned call keeps its thread until it
+returns; shutdown does not wait for it, though the interpreter still joins a
+stage thread before the process exits.
+
+Copyright ©️ 2025 Scott Cummings
+SPDX-License-Identifier: MIT OR Apache-2.0
+"""
+
+import asyncio
+import signal
+from collections.abc import Callable, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from functools import partial
+from typing import Any, Optional, TypeVar
+
+import schedule
+from loguru import logger
+
+from launches.cache import LaunchCache, with_all_new
+from launches.errors import LaunchesError
+from launches.outbox import NotificationOutbox, OutboxWorker
+from launches.scheduling import (
+    RunRecord,
+    is_daily_run_missed,
+    observe_scheduler_lag,
+    scheduler_sleep_seconds,
+)
+from launches.subscriptions import get_notification_windows
+
+from .launches import CHANGED_LAUNCHES, get_window_datetime
+from .ll2 import LaunchLibrary2Client
+from .notifications.dispatch import (
+    SEND_EXECUTOR,
+    NotificationJob,
+    SendExecutor,
+    get_notification_jobs,
+    send_observed,
+)
+from .notifications.handlers import NotificationHandler
+
+QUEUE_SIZE = 4  # maximum change sets waiting on a single stage
+STAGE_WORKERS = 2  # threads for the fetch and diff stages, sends use the SendExecutor
+
+T = TypeVar("T")
+
+
+@dataclass
+class StageTimeouts:
+    """Per-stage timeouts (seconds) for the asyncio service runtime"""
+
+    fetch: float = 60.0
+    diff: float = 30.0
+    notify: float = 120.0
+    enqueue: float = 30.0  # queueing a backed up handler's change set in the outbox
+
+
+class AsyncLaunchesService:
+    """Runs fetch, diff and notify stages as independent asyncio tasks.
+
+    The scheduler stage enqueues fetch triggers, the fetch stage requests
+    upcoming launches, the diff stage filters them through the cache, and
+    every notification handler gets its own queue and worker task so a stalled
+    handler only delays itself.
+    """
+
+    def __init__(
+        self,
+        window_hours: int,
+        notification_handlers: Sequence[NotificationHandler],
+        ll2_client: LaunchLibrary2Client,
+        cache: Optional[LaunchCache] = None,
+        timeouts: Optional[StageTimeouts] = None,
+        run_record: Optional[RunRecord] = None,
+        outbox: Optional[NotificationOutbox] = None,
+        send_executor: SendExecutor = SEND_EXECUTOR,
+        deadline_seconds: Optional[float] = None,
+    ) -> None:
+        self.window_hours = window_hours
+        self.notification_handlers = list(notification_handlers)
+        self.ll2_client = ll2_client
+        self.cache = cache
+        self.timeouts = timeouts if timeouts is not None else StageTimeouts()
+        self.run_record = run_record
+        self.outbox = outbox
+        self.send_executor = send_executor
+        self.deadline_seconds = deadline_seconds
+        self.scheduler = schedule.Scheduler()
+        self._triggers: asyncio.Queue[None] = asyncio.Queue(maxsize=1)
+        # (start time, deadline on the loop clock, fetched launches)
+        self._fetched: asyncio.Queue[tuple[datetime, float | None, dict[str, Any]]] = asyncio.Queue(
+            maxsize=QUEUE_SIZE
+        )
+        self._changed: asyncio.Queue[dict[str, Any]] = asyncio.Queue(maxsize=QUEUE_SIZE)
+        self._handler_queues: list[asyncio.Queue[dict[str, Any]]] = [
+            asyncio.Queue(maxsize=QUEUE_SIZE) for _ in self.notification_handlers
+        ]
+        self._stop = asyncio.Event()
+        self._executor = ThreadPoolExecutor(
+            max_workers=STAGE_WORKERS, thread_name_prefix="launches-runtime"
+        )
+
+    def schedule_daily(self, specific_times: list[str], tz: str) -> None:
+        """schedule checks at specific times each day, catching up a missed check"""
+        for time_str in specific_times:
+            self.scheduler.every().day.at(time_str, tz).do(self.trigger)
+        if self.run_record is not None and is_daily_run_missed(
+            self.run_record.last_success(), specific_times, tz
+        ):
+            logger.info("A scheduled check was missed, running a catch-up check")
+            self.trigger()
+
+    def schedule_periodic(self, repeat_hours: int) -> None:
+        """schedule checks every `repeat_hours` and run a check immediately"""
+        self.scheduler.every(repeat_hours).hours.do(self.trigger)
+        self.trigger()
+
+    def trigger(self) -> None:
+        """request a check, dropping the request if one is already waiting"""
+        try:
+            self._triggers.put_nowait(None)
+        except asyncio.QueueFull:
+            logger.warning("A launch check is already pending, skipping scheduled check")
+
+    def stop(self) -> None:
+        """request a clean shutdown of all stages"""
+        self._stop.set()
+
+    async def run(self) -> None:
+        """run all stages until `stop` is called or the task is cancelled"""
+        tasks = [
+            asyncio.create_task(self._scheduler_stage(), name="scheduler"),
+            asyncio.create_task(self._fetch_stage(), name="fetch"),
+            asyncio.create_task(self._diff_stage(), name="diff"),
+            asyncio.create_task(self._notify_stage(), name="notify"),
+        ]
+        tasks.extend(
+            asyncio.create_task(self._handler_stage(handler, queue), name=f"handler-{i}")
+            for i, (handler, queue) in enumerate(
+                zip(self.notification_handlers, self._handler_queues, strict=True)
+            )
+        )
+        worker = OutboxWorker(self.outbox) if self.outbox is not None else None
+        if worker is not None:
+            worker.start()
+        try:
+            await self._stop.wait()
+        finally:
+            logger.info("Shutting down asyncio service runtime")
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            if worker is not None:
+                await asyncio.to_thread(worker.stop)
+            # calls abandoned after a timeout are not waited for
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _in_thread(self, func: Callable[..., T], *args: Any) -> T:
+        """run a blocking stage call on the service's thread pool"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, partial(func, *args))
+
+    async def _in_send_thread(self, func: Callable[..., T], *args: Any) -> T:
+        """run a blocking send on the send executor, which is never used by the stages"""
+        return await asyncio.wrap_future(self.send_executor.submit(func, *args))
+
+    def _stage_timeout(self, timeout: float, deadline: float | None) -> float:
+        """return a stage's timeout, shortened to what is left of the check's deadline"""
+        if deadline is None:
+            return timeout
+        return max(0.0, min(timeout, deadline - asyncio.get_running_loop().time()))
+
+    async def _scheduler_stage(self) -> None:
+        while True:
+            observe_scheduler_lag(self.scheduler.get_jobs())
+            self.scheduler.run_pending()
+            await asyncio.sleep(scheduler_sleep_seconds(self.scheduler.idle_seconds))
+
+    async def _fetch_stage(self) -> None:
+        while True:
+            await self._triggers.get()
+            started = datetime.now(timezone.utc)
+            deadline = None
+            if self.deadline_seconds is not None:
+                deadline = asyncio.get_running_loop().time() + self.deadline_seconds
+            logger.info("Checking for upcoming launches within a {} hour window", self.window_hours)
+            window = get_window_datetime(self.window_hours)
+            timeout = self._stage_timeout(self.timeouts.fetch, deadline)
+            try:
+                # the request itself times out too, so an abandoned fetch ends
+                launches = await asyncio.wait_for(
+                    self._in_thread(
+                        partial(
+                            self.ll2_client.get_upcoming_launches_within_window,
+                            window,
+                            timeout=timeout,
+                        )
+                    ),
+                    timeout,
+                )
+            except asyncio.TimeoutError:
+                logger.error("Fetching upcoming launches timed out after {}s", timeout)
+                continue
+            except LaunchesError as ex:
+                logger.error("Exception occured while attempting to get upcoming launches {}", ex)
+                continue
+            except Exception as ex:
+                # the stage must survive unexpected errors, the next check runs as scheduled
+                logger.exception("Unhandled exception fetching upcoming launches: {}", ex)
+                continue
+            await self._fetched.put((started, deadline, launches))
+
+    async def _diff_stage(self) -> None:
+        while True:
+            started, deadline, launches = await self._fetched.get()
+            if self.cache is not None:
+                timeout = self._stage_timeout(self.timeouts.diff, deadline)
+                if timeout <= 0:
+                    logger.error(
+                        "Launch check exceeded its {}s deadline, abandoning run",
+                        self.deadline_seconds,
+                    )
+                    continue
+                try:
+                    changed_launches = await asyncio.wait_for(
+                        self._in_thread(
+                            self.cache.get_changed_launches,
+                            launches,
+                            get_notification_windows(self.notification_handlers),
+                        ),
+                        timeout,
+                    )
+                except asyncio.TimeoutError:
+                    logger.error("Change detection timed out after {}s", timeout)
+                    continue
+                except Exception as ex:
+                    # the stage must survive unexpected errors, the next check runs as scheduled
+                    logger.exception("Unhandled exception detecting changed launches: {}", ex)
+                    continue
+                logger.info("Changed launches: {}/{}", changed_launches["count"], launches["count"])
+                launches = changed_launches
+            else:
+                launches = with_all_new(launches)
+
+            if self.run_record is not None:
+                await self._in_thread(self.run_record.record_success, started)
+
+            CHANGED_LAUNCHES.observe(launches["count"])
+            if launches["count"] > 0:
+                logger.info("Found {} launches to report", launches["count"])
+                await self._changed.put(launches)
+            else:
+                logger.info(
+                    "No new or changed launches found within a {} hour window.",
+                    self.window_hours,
+                )
+
+    async def _notify_stage(self) -> None:
+        while True:
+            launches = await self._changed.get()
+            for handler, queue in zip(
+                self.notification_handlers, self._handler_queues, strict=True
+            ):
+                try:
+                    queue.put_nowait(launches)
+                except asyncio.QueueFull:
+                    if self.outbox is None:
+                        logger.error(
+                            "Notification handler {} is backed up, dropping change set", handler
+                        )
+                        continue
+                    logger.warning(
+                        "Notification handler {} is backed up, queueing change set", handler
+                    )
+                    try:
+                        await asyncio.wait_for(
+                            self._in_thread(
+                                self.outbox.enqueue, get_notification_jobs(launches, [handler])
+                            ),
+                            self.timeouts.enqueue,
+                        )
+                    except asyncio.TimeoutError:
+                        logger.error(
+                            "Queueing a change set for {} timed out after {}s, dropping it",
+                            handler,
+                            self.timeouts.enqueue,
+                        )
+                    except Exception as ex:
+                        # the stage must survive unexpected errors or every handler stalls
+                        logger.exception(
+                            "Unable to queue a change set for {}, dropping it: {}", handler, ex
+                        )
+
+    async def _handler_stage(
+        self, handler: NotificationHandler, queue: "asyncio.Queue[dict[str, Any]]"
+    ) -> None:
+        while True:
+            launches = await queue.get()
+            if self.outbox is not None:
+                send = partial(self.outbox.deliver, get_notification_jobs(launches, [handler]))
+            else:
+                send = partial(send_observed, NotificationJob(handler, launches))
+            try:
+                await asyncio.wait_for(self._in_send_thread(send), self.timeouts.notify)
+            except asyncio.TimeoutError:
+                logger.error(
+                    "Notification handler {} timed out after {}s", handler, self.timeouts.notify
+                )
+            except LaunchesError as ex:
+                logger.error("Error encounted attempting to send notification: {}", ex)
+            except Exception as ex:
+                # a handler's task must survive unexpected errors or its queue fills for good
+                logger.exception(
+                    "Unhandled exception sending notification with {}: {}", handler, ex
+                )
+
+
+async def _serve(service: AsyncLaunchesService) -> None:
+    """run the service, stopping cleanly on SIGINT or SIGTERM"""
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, service.stop)
+        except (NotImplementedError, RuntimeError):
+            # signal handlers are unavailable on some platforms and outside the main thread
+            pass
+    await service.run()
+
+
+def run_upcoming_launches_async(
+    window_hours: int,
+    notification_handlers: Sequence[NotificationHandler],
+    ll2_client: LaunchLibrary2Client,
+    cache: Optional[LaunchCache] = None,
+    *,
+    periodic: bool = False,
+    repeat_hours: int = 24,
+    specific_times: Optional[list[str]] = None,
+    tz: str = "UTC",
+    timeouts: Optional[StageTimeouts] = None,
+    run_record: Optional[RunRecord] = None,
+    outbox: Optional[NotificationOutbox] = None,
+    deadline_seconds: Optional[float] = None,
+) -> None:
+    """
+    Runs launch checks on the asyncio service runtime until interrupted.
+
+    Args:
+        window_hours (int): The time window (in hours) to look ahead for upcoming launches.
+        notification_handlers (Sequence[NotificationHandler]): Handlers used to send notifications.
+        ll2_client (LaunchLibrary2Client): Client used to fetch launch data.
+        cache (Optional[LaunchCache], optional): Cache instance to filter unchanged launches.
+        periodic (bool, optional): Check every `repeat_hours` rather than at `specific_times`.
+        repeat_hours (int, optional): The interval (in hours) between periodic checks.
+        specific_times (Optional[list[str]], optional): Daily check times in "HH:MM" format.
+        tz (str, optional): IANA timezone used for `specific_times`.
+        timeouts (Optional[StageTimeouts], optional): Per-stage timeouts.
+        run_record (Optional[RunRecord], optional): Persisted record of the last
+            successful check, used to catch up missed daily checks.
+        outbox (Optional[NotificationOutbox], optional): Durable queue notifications
+            are delivered through and retried from.
+        deadline_seconds (Optional[float], optional): Deadline for the fetch and
+            change detection of each check, shortening their stage timeouts.
+
+    Returns:
+        None
+    """
+
+    async def main() -> None:
+        service = AsyncLaunchesService(
+            window_hours,
+            notification_handlers,
+            ll2_client,
+            cache,
+            timeouts,
+            run_record,
+            outbox,
+            deadline_seconds=deadline_seconds,
+        )
+        if periodic:
+            service.schedule_periodic(repeat_hours)
+        else:
+            service.schedule_daily(specific_times or [], tz)
+        await _serve(service)
+
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        return
@@ -0,0 +1,164 @@
+"""Space Launch Notifications - Scheduling Module
+
+Guards scheduled launch checks against overlapping runs and stragglers, and
+persists the last successful run so a missed daily check can be caught up
+after a restart.
+
+Copyright ©️ 2025 Scott Cummings
+SPDX-License-Identifier: MIT OR Apache-2.0
+"""
+
+import json
+import os
+import threading
+from collections.abc import Callable, Iterable
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytz
+import schedule
+from loguru import logger
+
+from launches.metrics import METRICS
+
+RUN_RECORD_FILE = "last_run.json"
+SCHEDULER_TICK_SECONDS = 30  # maximum time between scheduler checks
+
+SCHEDULER_LAG_SECONDS = METRICS.histogram(
+    "launches_scheduler_lag_seconds", "How late scheduled checks start after their due time"
+)
+
+
+class RunRecord:
+    """Persists the time of the last successful launch check"""
+
+    def __init__(self, cache_dir: str) -> None:
+        self.cache_dir = Path(cache_dir)
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self.record_file = self.cache_dir / RUN_RECORD_FILE
+
+    def last_success(self) -> datetime | None:
+        """return the time of the last successful check, if one was recorded"""
+        if not self.record_file.exists():
+            return None
+        try:
+            with open(self.record_file, "r") as f:
+                return datetime.fromisoformat(json.load(f)["last_success"])
+        except (json.JSONDecodeError, IOError, KeyError, TypeError, ValueError) as e:
+            logger.warning(f"Failed to load run record: {e}")
+            return None
+
+    def record_success(self, when: datetime | None = None) -> None:
+        """record a successful check, defaulting to now"""
+        when = when if when is not None else datetime.now(timezone.utc)
+        try:
+            with open(self.record_file, "w") as f:
+                json.dump({"last_success": when.isoformat()}, f)
+        except IOError as e:
+            logger.warning(f"Failed to save run record: {e}")
+
+
+def get_last_scheduled_run(specific_times: list[str], tz: str, now: datetime) -> datetime | None:
+    """return the most recent daily slot from `specific_times` at or before `now`"""
+    zone = pytz.timezone(tz)
+    local_now = now.astimezone(zone)
+    slots = []
+    for time_str in specific_times:
+        hour, minute = (int(part) for part in time_str.split(":")[:2])
+        for days_ago in (0, 1):
+            day = (local_now - timedelta(days=days_ago)).date()
+            slot = zone.localize(datetime(day.year, day.month, day.day, hour, minute))
+            if slot <= local_now:
+                slots.append(slot)
+                break
+    return max(slots) if slots else None
+
+
+def is_daily_run_missed(
+    last_success: datetime | None, specific_times: list[str], tz: str, now: datetime | None = None
+) -> bool:
+    """True if a daily slot passed after the last successful check. When no check
+    has ever been recorded, True once the first of today's slots has passed."""
+    now = now if now is not None else datetime.now(timezone.utc)
+    last_slot = get_last_scheduled_run(specific_times, tz, now)
+    if last_slot is None:
+        return False
+    if last_success is None:
+        return last_slot.date() == now.astimezone(pytz.timezone(tz)).date()
+    return last_success < last_slot
+
+
+def scheduler_sleep_seconds(idle_seconds: float | None) -> float:
+    """return how long a scheduler loop should sleep: until the next job is due,
+    so jobs start on time, but at most SCHEDULER_TICK_SECONDS"""
+    if idle_seconds is None:
+        return SCHEDULER_TICK_SECONDS
+    return min(max(0.0, idle_seconds), SCHEDULER_TICK_SECONDS)
+
+
+def observe_scheduler_lag(jobs: Iterable[schedule.Job]) -> None:
+    """Observe how late each job that is about to run is, the scheduler works in
+    naive local time. Called just before the jobs are run by a loop which wakes
+    when the next job is due, so this is the delay in starting them, e.g. behind
+    a long reload, rather than the phase of the loop's polling."""
+    now = datetime.now()
+    for job in jobs:
+        if job.should_run and job.next_run is not None:
+            SCHEDULER_LAG_SECONDS.observe(max(0.0, (now - job.next_run).total_seconds()))
+
+
+class GuardedJob:
+    """Wraps a launch check with single-flight protection and a per-run deadline.
+
+    A run that is still in flight causes later runs to be skipped rather than
+    queued. A run exceeding `deadline_seconds` is abandoned: the scheduler stops
+    waiting for it, its result is discarded, and the guard is released once the
+    straggler finally returns. The job only stops waiting, so `func` should bound
+    its own blocking calls by the deadline too, see LaunchCheck. Successful runs
+    are recorded in `run_record`.
+    """
+
+    def __init__(
+        self,
+        func: Callable[[], bool | None],
+        deadline_seconds: float | None = None,
+        run_record: RunRecord | None = None,
+        name: str = "launch check",
+    ) -> None:
+        self.func = func
+        self.deadline_seconds = deadline_seconds
+        self.run_record = run_record
+        self.name = name
+        self._in_flight = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="launches-job")
+
+    def __call__(self) -> bool:
+        """run the job, returning True if it completed successfully in time"""
+        if not self._in_flight.acquire(blocking=False):
+            logger.warning("Previous {} is still running, skipping this run", self.name)
+            return False
+
+        started = datetime.now(timezone.utc)
+        future = self._executor.submit(self.func)
+        future.add_done_callback(self._release)
+        try:
+            result = future.result(timeout=self.deadline_seconds)
+        except FutureTimeoutError:
+            logger.error(
+                "{} exceeded its {}s deadline, abandoning run", self.name, self.deadline_seconds
+            )
+            return False
+        except Exception as ex:
+            # the scheduler loop must survive errors raised by a job
+            logger.exception("Unhandled exception in {}: {}", self.name, ex)
+            return False
+
+        success = result is not False
+        if success and self.run_record is not None:
+            self.run_record.record_success(started)
+        return success
+
+    def _release(self, _future: Future) -> None:
+        self._in_flight.release()
@@ -0,0 +1,227 @@
+"""Space Launch Notifications - Subscriptions Module
+
+Serves many named subscriber groups from a single fetch and a single change
+set. Each subscription selects the launches matching its own filters and
+search window and notifies its own handlers.
+
+Copyright ©️ 2025 Scott Cummings
+SPDX-License-Identifier: MIT OR Apache-2.0
+"""
+
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from loguru import logger
+
+from launches.cache import is_change_for_window
+from launches.config import SubscriptionConfig, SubscriptionFilterConfig
+from launches.ll2 import is_within_window
+from launches.notifications.dispatch import (
+    DispatchResult,
+    NotificationJob,
+    Sender,
+    dispatch_notifications,
+)
+from launches.notifications.handlers import HandlerReuse, get_notification_handlers
+
+DEFAULT_SUBSCRIPTION = "default"
+
+# subscription filter field -> path to the matching attribute in an LL2 launch
+FILTER_ATTRIBUTES: dict[str, tuple[str, ...]] = {
+    "launch_service_provider_ids": ("launch_service_provider", "id"),
+    "location_ids": ("pad", "location", "id"),
+    "pad_ids": ("pad", "id"),
+    "orbits": ("mission", "orbit", "abbrev"),
+    "rocket_configuration_ids": ("rocket", "configuration", "id"),
+}
+
+
+def get_launch_attribute(launch: dict[str, Any], path: tuple[str, ...]) -> Any:
+    """follow path through nested launch dicts, returning None if any key is missing"""
+    value: Any = launch
+    for key in path:
+        if not isinstance(value, dict):
+            return None
+        value = value.get(key)
+    return value
+
+
+def select_launches(launches: dict[str, Any], results: list[dict[str, Any]]) -> dict[str, Any]:
+    """build a launches dict from launches containing only results, keeping the
+    change reasons of the selected results"""
+    selected = {
+        "count": len(results),
+        "next": launches.get("next"),
+        "previous": launches.get("previous"),
+        "results": results,
+    }
+    if "changes" in launches:
+        changes = launches["changes"]
+        selected["changes"] = {
+            launch["id"]: changes[launch["id"]] for launch in results if launch["id"] in changes
+        }
+    return selected
+
+
+@dataclass
+class Subscription:
+    """A named subscriber group with its own filters, window and handlers"""
+
+    name: str
+    window_hours: int
+    notification_handlers: list[Sender]
+    filters: SubscriptionFilterConfig = field(default_factory=SubscriptionFilterConfig)
+
+    def matches_filters(self, launch: dict[str, Any]) -> bool:
+        """True if the launch matches every filter configured on the subscription"""
+        for filter_name, path in FILTER_ATTRIBUTES.items():
+            accepted = getattr(self.filters, filter_name)
+            if accepted and get_launch_attribute(launch, path) not in accepted:
+                return False
+        return True
+
+
+class SubscriptionIndex:
+    """Inverted index from launch attribute values to subscriptions.
+
+    Each subscription is posted under every value it filters on. Matching a
+    launch looks up one posting list per attribute and counts hits; a
+    subscription matches once it has been hit for every attribute it filters
+    on. Subscriptions without filters match every launch.
+    """
+
+    def __init__(self, subscriptions: list[Subscription]) -> None:
+        self.subscriptions = subscriptions
+        self._postings: dict[str, dict[Any, list[int]]] = {}
+        self._required: list[int] = []
+        self._unfiltered: list[int] = []
+        for position, subscription in enumerate(subscriptions):
+            required = 0
+            for filter_name in FILTER_ATTRIBUTES:
+                accepted = getattr(subscription.filters, filter_name)
+                if not accepted:
+                    continue
+                required += 1
+                postings = self._postings.setdefault(filter_name, {})
+                for value in set(accepted):
+                    postings.setdefault(value, []).append(position)
+            self._required.append(required)
+            if required == 0:
+                self._unfiltered.append(position)
+
+    def match(self, launch: dict[str, Any]) -> list[int]:
+        """return the positions of the subscriptions whose filters match the launch"""
+        hits: dict[int, int] = {}
+        for filter_name, postings in self._postings.items():
+            value = get_launch_attribute(launch, FILTER_ATTRIBUTES[filter_name])
+            for position in postings.get(value, ()):
+                hits[position] = hits.get(position, 0) + 1
+        matched = [
+            position for position, count in hits.items() if count == self._required[position]
+        ]
+        return self._unfiltered + matched
+
+
+@dataclass
+class SubscriptionEngine:
+    """Fans a single shared change set out to every subscription.
+
+    Quacks like a NotificationHandler so it can be passed anywhere a
+    handler is expected, including the service runtimes.
+    """
+
+    subscriptions: list[Subscription]
+    index: SubscriptionIndex = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self.index = SubscriptionIndex(self.subscriptions)
+
+    @property
+    def window_hours(self) -> int:
+        """the widest search window of any subscription, used for the shared fetch"""
+        return max(subscription.window_hours for subscription in self.subscriptions)
+
+    @property
+    def windows(self) -> list[int]:
+        """the distinct search windows of the subscriptions"""
+        return sorted({subscription.window_hours for subscription in self.subscriptions})
+
+    def send(self, launches: dict[str, Any]) -> list[DispatchResult]:
+        """notify each subscription of the launches it is interested in"""
+        return dispatch_notifications(self.notification_jobs(launches))
+
+    def notification_jobs(self, launches: dict[str, Any]) -> list[NotificationJob]:
+        """return a job for every handler of every subscription with matching launches"""
+        now = datetime.now(timezone.utc)
+        window_ends = [now + timedelta(hours=s.window_hours) for s in self.subscriptions]
+        matched: list[list[dict[str, Any]]] = [[] for _ in self.subscriptions]
+        changes = launches.get("changes", {})
+        for launch in launches.get("results", []):
+            reasons = changes.get(launch["id"])
+            for position in self.index.match(launch):
+                if is_within_window(launch, window_ends[position]) and is_change_for_window(
+                    reasons, self.subscriptions[position].window_hours
+                ):
+                    matched[position].append(launch)
+
+        jobs: list[NotificationJob] = []
+        for subscription, results in zip(self.subscriptions, matched, strict=True):
+            selected = select_launches(launches, results)
+            if selected["count"] == 0:
+                logger.debug("No launches for subscription '{}'", subscription.name)
+                continue
+            logger.info("{} launches for subscription '{}'", selected["count"], subscription.name)
+            jobs.extend(
+                NotificationJob(handler, selected) for handler in subscription.notification_handlers
+            )
+        return jobs
+
+    def routed_handlers(self) -> list[Sender]:
+        """return the handlers of every subscription"""
+        return [
+            handler
+            for subscription in self.subscriptions
+            for handler in subscription.notification_handlers
+        ]
+
+    def __repr__(self) -> str:
+        return f"SubscriptionEngine(subscriptions={[s.name for s in self.subscriptions]})"
+
+
+def get_notification_windows(notification_handlers: Sequence[Sender]) -> list[int]:
+    """return the search windows of every SubscriptionEngine among the handlers,
+    including engines wrapped by another router such as a ChangeCoalescer"""
+    windows: set[int] = set()
+    for handler in notification_handlers:
+        if isinstance(handler, SubscriptionEngine):
+            windows.update(handler.windows)
+            continue
+        wrapped = getattr(handler, "notification_handlers", None)
+        if isinstance(wrapped, list):
+            windows.update(get_notification_windows(wrapped))
+    return sorted(windows)
+
+
+def get_subscriptions(
+    subscription_configs: list[SubscriptionConfig],
+    default_window_hours: int,
+    reuse: HandlerReuse | None = None,
+) -> list[Subscription]:
+    """This function returns a list of subscriptions built from the project
+    configuration. Subscriptions without a search window use default_window_hours,
+    handlers are kept from `reuse` when their configuration is unchanged
+    """
+    logger.debug("loading subscriptions")
+    return [
+        Subscription(
+            name=subscription_config.name,
+            window_hours=subscription_config.search_window_hours or default_window_hours,
+            notification_handlers=get_notification_handlers(
+                subscription_config.notification_handlers, f"{subscription_config.name}/", reuse
+            ),
+            filters=subscription_config.filters,
+        )
+        for subscription_config in subscription_configs
+    ]
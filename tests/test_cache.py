@@ -8,12 +8,18 @@ import json
 import os
 import shutil
 import tempfile
+from datetime import datetime, timezone
 from pathlib import Path
 from unittest.mock import patch
 
 import pytest
 
-from launches.cache import LaunchCache
+from launches.cache import (
+    LaunchCache,
+    change_fingerprint,
+    entered_window_reason,
+    is_change_for_window,
+)
 
 
 @pytest.fixture
@@ -152,7 +158,7 @@ def test_get_changed_launches_disabled(sample_launches):
     """Test get_changed_launches with cache disabled"""
     cache = LaunchCache(enabled=False)
     result = cache.get_changed_launches(sample_launches)
-    assert result == sample_launches
+    assert result == {**sample_launches, "changes": {"test-launch-1": ["new"]}}
 
 
 def test_get_changed_launches_no_previous(temp_cache_dir, sample_launches, mock_logger):
@@ -161,7 +167,7 @@ def test_get_changed_launches_no_previous(temp_cache_dir, sample_launches, mock_
 
     result = cache.get_changed_launches(sample_launches)
 
-    assert result == sample_launches
+    assert result == {**sample_launches, "changes": {"test-launch-1": ["new"]}}
     # Verify cache was saved
     with open(cache.cache_file, "r") as f:
         saved_data = json.load(f)
@@ -227,6 +233,7 @@ def test_get_changed_launches_modified_launch(
     assert len(result["results"]) == 1
     assert result["results"][0]["id"] == updated_launch["id"]
     assert result["results"][0]["status"]["name"] == "Launch Successful"
+    assert result["changes"] == {updated_launch["id"]: ["status"]}
 
 
 def test_is_launch_significantly_changed_status(sample_launch, mock_logger):
@@ -299,3 +306,43 @@ def test_is_launch_significantly_changed_no_change(sample_launch, mock_logger):
     result = LaunchCache._is_launch_significantly_changed(sample_launch, modified_launch)
     assert result is False
     mock_logger.info.assert_not_called()
+
+
+def test_change_fingerprint(single_launch):
+    """fingerprints should only change with significant launch attributes"""
+    launch = single_launch["results"][0]
+    fingerprint = change_fingerprint(launch)
+    updated = json.loads(json.dumps(launch))
+    updated["last_updated"] = "2030-01-01T00:00:00Z"
+    assert change_fingerprint(updated) == fingerprint
+
+    updated["net"] = "2030-01-01T00:00:00Z"
+    assert change_fingerprint(updated) != fingerprint
+
+
+def test_change_reasons(sample_launch, mock_logger):
+    """every significant change should be listed as a reason"""
+    modified_launch = sample_launch.copy()
+    modified_launch["status"] = {"id": 2, "name": "Launch Successful"}
+    modified_launch["net"] = "2024-06-01T14:00:00Z"
+
+    assert LaunchCache._change_reasons(sample_launch, modified_launch) == ["status", "net"]
+    assert LaunchCache._change_reasons(sample_launch, sample_launch) == []
+
+
+def test_get_changed_launches_entered_window(temp_cache_dir, sample_launches, mock_logger):
+    """an unchanged launch entering a search window should be changed for that window only"""
+    cache = LaunchCache(cache_dir=temp_cache_dir)
+    with patch("launches.cache.datetime") as mock_datetime:
+        mock_datetime.now.return_value = datetime(2024, 5, 30, 12, 0, tzinfo=timezone.utc)
+        cache.get_changed_launches(sample_launches, [24, 72])
+        mock_datetime.now.return_value = datetime(2024, 5, 31, 13, 0, tzinfo=timezone.utc)
+        result = cache.get_changed_launches(sample_launches, [24, 72])
+        # a window without a previous state is only recorded
+        assert cache.get_changed_launches(sample_launches, [12, 24, 72])["count"] == 0
+
+    assert result["changes"] == {"test-launch-1": [entered_window_reason(24)]}
+    assert is_change_for_window(result["changes"]["test-launch-1"], 24)
+    assert not is_change_for_window(result["changes"]["test-launch-1"], 72)
+    assert is_change_for_window(["status", entered_window_reason(24)], 72)
+    assert is_change_for_window(None, 72)
@@ -0,0 +1,198 @@
+"""unittests for launches.coalescing
+
+Copyright ©️ 2025 Scott Cummings
+SPDX-License-Identifier: MIT OR Apache-2.0
+"""
+
+import copy
+import tempfile
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from launches.coalescing import RETRY_SECONDS, ChangeCoalescer
+from launches.notifications.dispatch import NotificationJob
+from launches.outbox import NotificationOutbox
+
+
+@pytest.fixture
+def clock():
+    """patch the coalescer and rate limiter clocks with a settable time"""
+    now = [1000.0]
+    with (
+        patch("launches.coalescing.time") as coalescing_time,
+        patch("launches.notifications.ratelimit.time") as ratelimit_time,
+    ):
+        coalescing_time.time.side_effect = lambda: now[0]
+        ratelimit_time.monotonic.side_effect = lambda: now[0]
+        yield now
+
+
+@pytest.fixture
+def cache_dir():
+    """return a temporary cache directory"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        yield tmpdir
+
+
+def named_handler(name, max_sends_per_hour=None):
+    """return a mock handler with a name and send rate"""
+    handler = MagicMock()
+    handler.name = name
+    handler.max_sends_per_hour = max_sends_per_hour
+    return handler
+
+
+def test_changes_are_merged_within_window(clock, single_launch, two_launches):
+    """repeated changes to a launch should be sent once, in their latest version"""
+    handler = named_handler("a")
+    coalescer = ChangeCoalescer([handler], debounce_seconds=60)
+    updated = copy.deepcopy(single_launch)
+    updated["results"][0]["status"]["name"] = "Launch Successful"
+
+    coalescer.send(two_launches)
+    clock[0] += 30
+    coalescer.send(single_launch)
+    coalescer.send(updated)
+    clock[0] += 30
+    assert coalescer.flush() == []
+
+    clock[0] += 30
+    results = coalescer.flush()
+
+    assert len(results) == 1 and results[0].success
+    sent = handler.send.call_args.args[0]
+    ids = [launch["id"] for launch in two_launches["results"]]
+    assert [launch["id"] for launch in sent["results"]] == ids
+    assert sent["count"] == 2
+    assert updated["results"][0] in sent["results"]
+    assert coalescer.flush() == []
+
+
+def test_changes_are_sent_after_max_wait(clock, single_launch):
+    """a steady stream of changes should not hold notifications forever"""
+    handler = named_handler("a")
+    coalescer = ChangeCoalescer([handler], debounce_seconds=60)
+
+    for _ in range(4):
+        coalescer.send(single_launch)
+        clock[0] += 59
+    coalescer.send(single_launch)
+    clock[0] += 4
+
+    assert len(coalescer.flush()) == 1
+    handler.send.assert_called_once()
+
+
+def test_rate_limited_handlers_are_held(clock, single_launch, two_launches):
+    """a rate limited handler should get one merged notification per interval"""
+    limited, unlimited = named_handler("a", max_sends_per_hour=1), named_handler("b")
+    coalescer = ChangeCoalescer([limited, unlimited])
+
+    coalescer.send(single_launch)
+    assert len(coalescer.flush()) == 2
+    coalescer.send(two_launches)
+    results = coalescer.flush()
+    assert [result.job.handler for result in results] == [unlimited]
+
+    clock[0] += 3600
+    results = coalescer.flush()
+
+    assert [result.job.handler for result in results] == [limited]
+    assert limited.send.call_count == 2
+    assert limited.send.call_args.args[0]["count"] == 2
+
+
+def test_held_changes_survive_restart(clock, cache_dir, single_launch):
+    """held changes should be persisted and sent by the next process"""
+    ChangeCoalescer([named_handler("a")], 60, cache_dir).send(single_launch)
+    handler = named_handler("a")
+    coalescer = ChangeCoalescer([handler], 60, cache_dir)
+
+    clock[0] += 60
+    coalescer.flush()
+
+    handler.send.assert_called_once_with(single_launch)
+    assert ChangeCoalescer([handler], 60, cache_dir).flush() == []
+
+
+def test_coalesced_changes_are_sent_through_outbox(clock, cache_dir, single_launch):
+    """coalesced notifications should be queued for retry when a handler fails"""
+    handler = named_handler("a")
+    handler.send.side_effect = RuntimeError("down")
+    coalescer = ChangeCoalescer([handler])
+    outbox = NotificationOutbox(cache_dir, retry_delay=0)
+    outbox.register([coalescer])
+    coalescer.outbox = outbox
+
+    outbox.deliver([NotificationJob(coalescer, single_launch)])
+    coalescer.flush()
+
+    assert outbox.counts()["pending"] == 1
+    handler.send.side_effect = None
+    outbox.retry_due()
+    handler.send.assert_called_with(single_launch)
+    assert outbox.counts()["pending"] == 0
+
+
+def test_change_reasons_are_merged(clock, single_launch):
+    """the change reasons of merged changes should be kept"""
+    handler = named_handler("a")
+    coalescer = ChangeCoalescer([handler], debounce_seconds=60)
+    launch_id = single_launch["results"][0]["id"]
+
+    coalescer.send({**single_launch, "changes": {launch_id: ["status"]}})
+    coalescer.send({**single_launch, "changes": {launch_id: ["net", "status"]}})
+    clock[0] += 60
+    coalescer.flush()
+
+    assert handler.send.call_args.args[0]["changes"] == {launch_id: ["status", "net"]}
+
+
+def test_set_handlers_moves_held_changes(clock, single_launch):
+    """held changes follow a reloaded handler of the same name, removed handlers drop theirs"""
+    coalescer = ChangeCoalescer([named_handler("a"), named_handler("b")], debounce_seconds=60)
+    coalescer.send(single_launch)
+    reloaded = named_handler("a")
+
+    coalescer.set_handlers([reloaded])
+    clock[0] += 60
+    results = coalescer.flush()
+
+    assert [result.job.handler for result in results] == [reloaded]
+    reloaded.send.assert_called_once()
+
+
+def test_set_handlers_keeps_unchanged_rate_limits(clock, single_launch):
+    """a reload must not reset the send budget of a handler whose rate is unchanged"""
+    coalescer = ChangeCoalescer([named_handler("a", max_sends_per_hour=1)])
+    coalescer.send(single_launch)
+    assert len(coalescer.flush()) == 1
+
+    coalescer.set_handlers([named_handler("a", max_sends_per_hour=1)])
+    coalescer.send(single_launch)
+    assert coalescer.flush() == []
+
+
+def test_failed_sends_are_held_for_retry(clock, single_launch, two_launches):
+    """without an outbox, changes which failed to send should be retried, keeping
+    launches which changed again in their latest version"""
+    handler = named_handler("a")
+    handler.send.side_effect = [RuntimeError("smtp down"), None]
+    coalescer = ChangeCoalescer([handler], debounce_seconds=10)
+    updated = copy.deepcopy(single_launch)
+    updated["results"][0]["status"]["name"] = "Launch Successful"
+
+    coalescer.send(two_launches)
+    clock[0] += 10
+    assert not coalescer.flush()[0].success
+    coalescer.send(updated)
+    clock[0] += 10
+    assert coalescer.flush() == []
+
+    clock[0] += RETRY_SECONDS - 10
+    assert coalescer.flush()[0].success
+    sent = handler.send.call_args.args[0]
+    assert sent["count"] == 2
+    assert updated["results"][0] in sent["results"]
+    assert coalescer.flush() == []
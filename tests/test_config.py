@@ -96,3 +96,34 @@ def test_load_config_json_decode_error(monkeypatch):
     with pytest.raises(ConfigError) as ex:
         _ = load_config("config.json")
     assert str(ex.value) == "malformed configuration"
+
+
+def test_load_config_subscriptions_only(monkeypatch):
+    """load config should accept subscriptions without top-level handlers"""
+    config_json = """{
+        "subscriptions": [
+            {
+                "name": "spacex",
+                "filters": {"launch_service_provider_ids": [121]},
+                "notification_handlers": [
+                    {"service": "stdout", "renderer": "text", "parameters": {}}
+                ]
+            }
+        ]
+    }"""
+    mock_open = MagicMock(return_value=io.StringIO(config_json))
+    monkeypatch.setattr("builtins.open", mock_open)
+    config = load_config("config.json")
+    assert config.notification_handlers == []
+    assert config.subscriptions[0].name == "spacex"
+    assert config.subscriptions[0].filters.launch_service_provider_ids == [121]
+
+
+def test_reload_config_rejected_with_asyncio_runtime():
+    """reload is only supported by the schedule runtime"""
+    handlers = [NotificationHandlerConfig(service="stdout", parameters={})]
+    with pytest.raises(ValueError, match="reload_config"):
+        LaunchesConfig(
+            notification_handlers=handlers, service_runtime="asyncio", reload_config=True
+        )
+    assert LaunchesConfig(notification_handlers=handlers, service_runtime="asyncio")
@@ -0,0 +1,124 @@
+"""unittests for launches.idempotency
+
+Copyright ©️ 2025 Scott Cummings
+SPDX-License-Identifier: MIT OR Apache-2.0
+"""
+
+import copy
+import tempfile
+from unittest.mock import MagicMock
+
+import pytest
+
+from launches.idempotency import SentIndex, change_digest, idempotency_key
+from launches.notifications.dispatch import NotificationJob
+from launches.outbox import NotificationOutbox
+
+
+@pytest.fixture
+def cache_dir():
+    """return a temporary cache directory"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        yield tmpdir
+
+
+def named_handler(name):
+    """return a mock handler with a name"""
+    handler = MagicMock()
+    handler.name = name
+    return handler
+
+
+def test_idempotency_key(single_launch):
+    """keys should change with the handler and launch, digests with significant changes only"""
+    launch = single_launch["results"][0]
+    key = idempotency_key("a", launch)
+    digest = change_digest(launch)
+    updated = copy.deepcopy(launch)
+    updated["last_updated"] = "2030-01-01T00:00:00Z"
+
+    assert len(key) == len(digest) == 16
+    assert idempotency_key("b", launch) != key
+    assert change_digest(updated) == digest
+    updated["status"]["name"] = "Launch Successful"
+    assert idempotency_key("a", updated) == key
+    assert change_digest(updated) != digest
+
+
+def test_dispatch_skips_delivered_changes(cache_dir, two_launches):
+    """a change set resent after a restart should not be delivered again"""
+    handler = named_handler("a")
+    SentIndex(cache_dir).dispatch([NotificationJob(handler, two_launches)])
+
+    results = SentIndex(cache_dir).dispatch([NotificationJob(handler, two_launches)])
+
+    handler.send.assert_called_once_with(two_launches)
+    assert results[0].success and results[0].skipped
+
+
+def test_dispatch_sends_only_new_changes(cache_dir, two_launches):
+    """only launches with changes the handler has not delivered should be sent"""
+    index = SentIndex(cache_dir)
+    handlers = [named_handler("a"), named_handler("b")]
+    index.dispatch([NotificationJob(handlers[0], two_launches)])
+
+    updated = copy.deepcopy(two_launches)
+    updated["results"][1]["status"]["name"] = "Go for Launch"
+    index.dispatch([NotificationJob(handler, updated) for handler in handlers])
+
+    sent = handlers[0].send.call_args.args[0]
+    assert sent["count"] == 1
+    assert sent["results"] == [updated["results"][1]]
+    handlers[1].send.assert_called_once_with(updated)
+
+
+def test_failed_sends_are_not_recorded(cache_dir, single_launch):
+    """a failed delivery should be retried rather than skipped"""
+    index = SentIndex(cache_dir)
+    handler = named_handler("a")
+    handler.send.side_effect = [RuntimeError("down"), None]
+
+    assert not index.dispatch([NotificationJob(handler, single_launch)])[0].success
+    assert not index.dispatch([NotificationJob(handler, single_launch)])[0].skipped
+    assert handler.send.call_count == 2
+
+
+def test_sent_index_bounded(cache_dir):
+    """the index should forget the oldest keys beyond max_entries"""
+    index = SentIndex(cache_dir, max_entries=2)
+    index.add([(b"1" * 16, b"a" * 16), (b"2" * 16, b"b" * 16), (b"3" * 16, b"c" * 16)])
+
+    reloaded = SentIndex(cache_dir, max_entries=2)
+
+    assert len(reloaded) == 2
+    assert reloaded._entries == {b"2" * 16: b"b" * 16, b"3" * 16: b"c" * 16}
+    assert reloaded.index_file.stat().st_size == len(b"LSIX2") + 64
+
+
+def test_dispatch_delivers_change_back_to_earlier_state(cache_dir, single_launch):
+    """a launch changing A -> B -> A should be delivered on every change"""
+    index = SentIndex(cache_dir)
+    handler = named_handler("a")
+    hold = copy.deepcopy(single_launch)
+    hold["results"][0]["status"]["name"] = "On Hold"
+
+    for launches in (single_launch, hold, single_launch):
+        assert not index.dispatch([NotificationJob(handler, launches)])[0].skipped
+
+    assert handler.send.call_count == 3
+    assert SentIndex(cache_dir).dispatch([NotificationJob(handler, single_launch)])[0].skipped
+
+
+def test_outbox_retry_after_lost_delete(cache_dir, single_launch):
+    """a delivered job left queued by a crash should not be resent by the outbox"""
+    index = SentIndex(cache_dir)
+    handler = named_handler("a")
+    index.dispatch([NotificationJob(handler, single_launch)])
+    outbox = NotificationOutbox(cache_dir, sent_index=index)
+    outbox.enqueue([NotificationJob(handler, single_launch)])
+
+    results = outbox.retry_due()
+
+    assert results[0].skipped
+    handler.send.assert_called_once()
+    assert outbox.counts()["pending"] == 0
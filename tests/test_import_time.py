@@ -0,0 +1,41 @@
+"""lazy imports of the launches CLI
+
+One-shot runs spend most of their wall time importing, so the CLI must not
+load client libraries or template engines until they are used. The import
+time budget itself is checked by benchmarks/bench_import.py, since wall clock
+timings are too noisy to assert in the test suite.
+
+Copyright ©️ 2025 Scott Cummings
+SPDX-License-Identifier: MIT OR Apache-2.0
+"""
+
+import json
+import subprocess
+import sys
+
+LAZY_MODULES = [
+    "googleapiclient",
+    "google_auth_oauthlib",
+    "google.oauth2",
+    "http.server",
+    "jinja2",
+    "launches.notifications.services.gmail",
+    "launches.notifications.services.smtp_email",
+    "launches.notifications.services.webhook",
+]
+
+
+def run_python(*args):
+    """run a fresh interpreter, returning its completed process"""
+    return subprocess.run(  # noqa: S603 - fixed interpreter and arguments
+        [sys.executable, *args], capture_output=True, text=True, check=True
+    )
+
+
+def test_cli_import_is_lazy():
+    """importing the CLI should not import service clients or jinja2"""
+    script = f"import json, sys, launches.cli; print(json.dumps([m for m in {LAZY_MODULES!r} if m in sys.modules]))"
+
+    loaded = json.loads(run_python("-c", script).stdout)
+
+    assert loaded == []
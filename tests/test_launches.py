@@ -81,17 +81,19 @@ def test_check_for_upcoming_launches_with_launches(mock_client, mock_send_notifi
     # setup
     mock_client.return_value.get_upcoming_launches_within_window.return_value = {
         "count": 1,
-        "results": [{}],
+        "results": [{"id": "a"}],
     }
     notification_handlers = [MagicMock()]
 
     # test
     check_for_upcoming_launches(1, notification_handlers, mock_client.return_value)
 
-    # assert
+    # assert, without a cache every launch is reported as new
     mock_client.return_value.get_upcoming_launches_within_window.assert_called_once()
     mock_send_notification.assert_called_once_with(
-        {"count": 1, "results": [{}]}, notification_handlers
+        {"count": 1, "results": [{"id": "a"}], "changes": {"a": ["new"]}},
+        notification_handlers,
+        None,
     )
 
 
@@ -11,7 +11,15 @@ from unittest.mock import MagicMock, patch
 import pytest
 import requests.exceptions
 
-from launches.ll2 import LL2_API_URL, LaunchLibrary2Client, LL2RequestError
+from launches.ll2 import (
+    LL2_API_URL,
+    LL2_REQUEST_SECONDS,
+    LL2_RESPONSE_BYTES,
+    LL2_RESPONSES,
+    LaunchLibrary2Client,
+    LL2RequestError,
+    parse_launch_time,
+)
 
 
 @pytest.fixture
@@ -69,6 +77,37 @@ def test_ll2_get_success(mock_requests_get):
     assert resp == mock_requests_get.return_value
 
 
+@patch("requests.get")
+def test_ll2_get_records_metrics(mock_requests_get):
+    """requests should record their latency, status and payload size"""
+    mock_requests_get.return_value = MagicMock(
+        status_code=503, content=b"unavailable", raise_for_status=MagicMock()
+    )
+    mock_requests_get.return_value.raise_for_status.side_effect = requests.exceptions.HTTPError
+    requests_before = LL2_REQUEST_SECONDS.count(endpoint="metrics_endpoint")
+    responses_before = LL2_RESPONSES.value(status=503)
+    bytes_before = LL2_RESPONSE_BYTES.sum()
+
+    with pytest.raises(LL2RequestError):
+        LaunchLibrary2Client().ll2_get("metrics_endpoint", {})
+
+    assert LL2_REQUEST_SECONDS.count(endpoint="metrics_endpoint") == requests_before + 1
+    assert LL2_RESPONSES.value(status=503) == responses_before + 1
+    assert LL2_RESPONSE_BYTES.sum() == bytes_before + len(b"unavailable")
+
+
+@patch("requests.get")
+def test_ll2_get_timeout(mock_requests_get):
+    """a timeout shorter than REQUEST_TIMEOUT should bound the request"""
+    mock_requests_get.return_value = MagicMock(status_code=200, raise_for_status=lambda: None)
+    c = LaunchLibrary2Client()
+
+    c.ll2_get("test_endpoint", {}, timeout=5)
+    assert mock_requests_get.call_args.kwargs["timeout"] == 5
+    c.ll2_get("test_endpoint", {}, timeout=600)
+    assert mock_requests_get.call_args.kwargs["timeout"] == c.REQUEST_TIMEOUT
+
+
 @patch("requests.get")
 def test_ll2_get_exception(mock_requests_get):
     # setup
@@ -103,7 +142,7 @@ def test_get_upcoming_launches_within_window(mock_check_response, mock_ll2_get):
 
     # assert
     assert launches == response
-    mock_ll2_get.assert_called_with(c.LL2_UPCOMING_ENDPOINT, parameters)
+    mock_ll2_get.assert_called_with(c.LL2_UPCOMING_ENDPOINT, parameters, timeout=None)
     mock_ll2_get.return_value.json.assert_called_once()
 
 
@@ -128,7 +167,7 @@ def test_get_upcoming_launches_within_window_invalid_json(mock_ll2_get):
         c.get_upcoming_launches_within_window(window_start_lt)
 
     # assert
-    mock_ll2_get.assert_called_with(c.LL2_UPCOMING_ENDPOINT, parameters)
+    mock_ll2_get.assert_called_with(c.LL2_UPCOMING_ENDPOINT, parameters, timeout=None)
     mock_ll2_get.return_value.json.assert_called_once()
     assert str(exinfo.value).startswith("Unable to decode response JSON")
 
@@ -154,5 +193,21 @@ def test_get_upcoming_launches_within_window_invalid_response(mock_check_respons
         c.get_upcoming_launches_within_window(window_start_lt)
 
     # assert
-    mock_ll2_get.assert_called_with(c.LL2_UPCOMING_ENDPOINT, parameters)
+    mock_ll2_get.assert_called_with(c.LL2_UPCOMING_ENDPOINT, parameters, timeout=None)
     mock_check_response.assert_called_once()
+
+
+def test_parse_launch_time():
+    """parse_launch_time should match strptime with LAUNCH_DT_FORMAT"""
+    assert parse_launch_time("2025-05-27T16:14:00Z") == datetime(
+        2025, 5, 27, 16, 14, 0, tzinfo=timezone.utc
+    )
+
+
+@pytest.mark.parametrize(
+    "iso_time",
+    [None, "", "2025-05-27", "2025-05-27T16:14Z", "2025-05-27 16:14:00Z", "2025-13-27T16:14:00Z"],
+)
+def test_parse_launch_time_invalid(iso_time):
+    """parse_launch_time should return None for anything but LAUNCH_DT_FORMAT"""
+    assert parse_launch_time(iso_time) is None
@@ -0,0 +1,92 @@
+"""unittests for launches.metrics
+
+Copyright ©️ 2025 Scott Cummings
+SPDX-License-Identifier: MIT OR Apache-2.0
+"""
+
+import pytest
+import requests
+
+from launches.metrics import CONTENT_TYPE, MetricsRegistry, MetricsServer
+
+
+@pytest.fixture
+def registry():
+    return MetricsRegistry()
+
+
+@pytest.fixture
+def server(registry):
+    """a metrics server for registry on a free local port"""
+    server = MetricsServer(0, registry=registry)
+    server.start()
+    yield server
+    server.stop()
+
+
+def test_counter(registry):
+    counter = registry.counter("test_total", "A test counter", ("status",))
+    counter.inc(status=200)
+    counter.inc(2, status="200")
+    counter.inc(status='bad "quote"\n')
+
+    assert registry.counter("test_total", "ignored") is counter
+    assert counter.value(status=200) == 3
+    assert registry.render().splitlines() == [
+        "# HELP test_total A test counter",
+        "# TYPE test_total counter",
+        'test_total{status="200"} 3',
+        'test_total{status="bad \\"quote\\"\\n"} 1',
+    ]
+
+
+def test_histogram(registry):
+    """buckets are cumulative and include values equal to their bound"""
+    histogram = registry.histogram("test_seconds", "A test histogram", buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 5.0):
+        histogram.observe(value)
+
+    assert histogram.count() == 4
+    assert histogram.sum() == pytest.approx(5.65)
+    assert registry.render().splitlines()[2:] == [
+        'test_seconds_bucket{le="0.1"} 2',
+        'test_seconds_bucket{le="1"} 3',
+        'test_seconds_bucket{le="+Inf"} 4',
+        "test_seconds_sum 5.65",
+        "test_seconds_count 4",
+    ]
+
+
+def test_histogram_time_observes_errors(registry):
+    histogram = registry.histogram("test_seconds", "A test histogram", ("stage",))
+    with pytest.raises(ValueError), histogram.time(stage="diff"):
+        raise ValueError("failed")
+    assert histogram.count(stage="diff") == 1
+
+
+def test_failing_gauge_is_skipped(registry):
+    """a gauge failing to collect should not hide the other metrics"""
+    registry.counter("test_total", "A test counter").inc()
+    registry.gauge("test_queue", "A failing gauge", "state", lambda: 1 / 0)
+    registry.gauge("test_outbox", "A test gauge", "state", lambda: {"pending": 2, "dead": 0})
+
+    lines = registry.render().splitlines()
+
+    assert "test_total 1" in lines
+    assert 'test_outbox{state="pending"} 2' in lines
+    assert not any(line.startswith("# HELP test_queue") for line in lines)
+
+
+def test_server_serves_metrics(registry, server):
+    registry.counter("test_total", "A test counter").inc()
+
+    response = requests.get(f"http://127.0.0.1:{server.port}/metrics", timeout=5)
+
+    assert response.status_code == 200
+    assert response.headers["Content-Type"] == CONTENT_TYPE
+    assert "test_total 1" in response.text.splitlines()
+
+
+def test_server_unknown_path(server):
+    response = requests.get(f"http://127.0.0.1:{server.port}/", timeout=5)
+    assert response.status_code == 404
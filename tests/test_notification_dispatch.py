@@ -0,0 +1,143 @@
+"""unittests for launches.notifications.dispatch
+
+Copyright ©️ 2025 Scott Cummings
+SPDX-License-Identifier: MIT OR Apache-2.0
+"""
+
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from launches.errors import NotificationError
+from launches.notifications.dispatch import (
+    SEND_SECONDS,
+    SENDS,
+    NotificationJob,
+    SendExecutor,
+    dispatch_notifications,
+    get_notification_jobs,
+)
+
+
+def test_dispatch_isolates_failures(single_launch):
+    """a failing handler should not prevent the remaining handlers from sending"""
+    failing = MagicMock(send=MagicMock(side_effect=NotificationError("smtp down")))
+    healthy = MagicMock()
+    jobs = [NotificationJob(failing, single_launch), NotificationJob(healthy, single_launch)]
+
+    results = dispatch_notifications(jobs)
+
+    assert [result.success for result in results] == [False, True]
+    assert isinstance(results[0].error, NotificationError)
+    healthy.send.assert_called_once_with(single_launch)
+
+
+def test_dispatch_records_send_metrics(single_launch):
+    """every dispatched job should record its latency and result by handler name"""
+    failing = MagicMock(send=MagicMock(side_effect=NotificationError("smtp down")))
+    failing.name = "metrics-failing"
+    healthy = MagicMock()
+    healthy.name = "metrics-healthy"
+
+    dispatch_notifications(
+        [NotificationJob(failing, single_launch), NotificationJob(healthy, single_launch)]
+    )
+
+    assert SENDS.value(handler="metrics-failing", result="failure") == 1
+    assert SENDS.value(handler="metrics-healthy", result="success") == 1
+    assert SEND_SECONDS.count(handler="metrics-healthy") == 1
+
+
+def test_dispatch_timeout(single_launch):
+    """a hung handler should time out without delaying the other handlers"""
+    release = threading.Event()
+    hung = MagicMock(send=MagicMock(side_effect=lambda _launches: release.wait(5)))
+    healthy = MagicMock()
+    jobs = [NotificationJob(hung, single_launch), NotificationJob(healthy, single_launch)]
+
+    try:
+        results = dispatch_notifications(jobs, timeout=0.1)
+    finally:
+        release.set()
+
+    assert [result.success for result in results] == [False, True]
+    assert isinstance(results[0].error, TimeoutError)
+
+
+def test_dispatch_is_concurrent(single_launch):
+    """total latency should be close to the slowest handler rather than the sum"""
+    slow = [MagicMock(send=MagicMock(side_effect=lambda _l: time.sleep(0.2))) for _ in range(4)]
+
+    start = time.monotonic()
+    results = dispatch_notifications([NotificationJob(h, single_launch) for h in slow])
+
+    assert all(result.success for result in results)
+    assert time.monotonic() - start < 0.6
+
+
+def test_get_notification_jobs_expands_routers(single_launch):
+    """routers should be expanded into the jobs they route to"""
+    handler = MagicMock()
+    routed = NotificationJob(MagicMock(), single_launch)
+
+    class Router:
+        def notification_jobs(self, launches):
+            return [routed]
+
+    jobs = get_notification_jobs(single_launch, [handler, Router()])
+
+    assert jobs == [NotificationJob(handler, single_launch), routed]
+
+
+def test_dispatch_reuses_daemon_workers(single_launch):
+    """dispatches should share daemon workers, so an abandoned send never blocks exit"""
+    threads = []
+    handler = MagicMock(
+        send=MagicMock(side_effect=lambda _l: threads.append(threading.current_thread()))
+    )
+    executor = SendExecutor(1, "test-dispatch")
+
+    for _ in range(3):
+        dispatch_notifications([NotificationJob(handler, single_launch)], executor=executor)
+
+    assert len(set(threads)) == 1
+    assert threads[0].daemon
+
+
+def test_abandoned_queued_jobs_are_skipped(single_launch):
+    """jobs still waiting for a worker when they time out should never be sent"""
+    release = threading.Event()
+    hung = MagicMock(send=MagicMock(side_effect=lambda _launches: release.wait(5)))
+    queued = MagicMock()
+    executor = SendExecutor(1, "test-dispatch")
+
+    try:
+        results = dispatch_notifications(
+            [NotificationJob(hung, single_launch), NotificationJob(queued, single_launch)],
+            timeout=0.1,
+            executor=executor,
+        )
+    finally:
+        release.set()
+
+    assert [result.success for result in results] == [False, False]
+    time.sleep(0.1)
+    queued.send.assert_not_called()
+
+
+def test_send_executor_shutdown():
+    """shutdown should stop the workers after the submitted calls have run"""
+    executor = SendExecutor(2, "test-shutdown")
+    futures = [executor.submit(lambda value: value, value) for value in range(4)]
+    workers = [t for t in threading.enumerate() if t.name.startswith("test-shutdown")]
+
+    executor.shutdown()
+
+    assert [future.result(timeout=5) for future in futures] == [0, 1, 2, 3]
+    for worker in workers:
+        worker.join(5)
+        assert not worker.is_alive()
+    with pytest.raises(RuntimeError):
+        executor.submit(print)
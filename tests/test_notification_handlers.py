@@ -4,15 +4,20 @@ Copyright ©️ 2025 Scott Cummings
 SPDX-License-Identifier: MIT OR Apache-2.0
 """
 
+import threading
 from unittest.mock import Mock, patch
 
 import pytest
 
 from launches.config import NotificationHandlerConfig
+from launches.errors import DeliveryError, NotificationError
 from launches.notifications.handlers import (
     NotificationHandler,
+    RenderCache,
     get_notification_handlers,
 )
+from launches.notifications.renderers import get_notification_renderer
+from launches.notifications.services import ServiceCapabilities
 
 
 @pytest.fixture
@@ -20,7 +25,7 @@ def handler():
     """return a NotificationHandler with mocks for renderer and service"""
     renderer = Mock()
     service = Mock()
-    return NotificationHandler(renderer, service)
+    return NotificationHandler(renderer, service, RenderCache())
 
 
 def test_send(handler, single_launch):  # pylint: disable=redefined-outer-name
@@ -40,3 +45,195 @@ def test_get_notification_handlers(get_notification_service_mock, get_notificati
     get_notification_handlers(handler_configs)
     get_notification_renderer_mock.assert_called_once()
     get_notification_service_mock.assert_called_once()
+
+
+def test_send_renders_once_per_change_set(single_launch, two_launches):
+    """handlers sharing a renderer should render each change set once"""
+    renderer = Mock()
+    render_cache = RenderCache()
+    handlers = [NotificationHandler(renderer, Mock(), render_cache) for _ in range(3)]
+
+    for handler in handlers:
+        handler.send(single_launch)
+    renderer.render_text_body.assert_called_once_with(single_launch)
+
+    handlers[0].send(two_launches)
+    assert renderer.render_text_body.call_count == 2
+    for handler in handlers:
+        handler.service.send.assert_called()
+
+
+def test_render_cache_renders_keys_concurrently(single_launch, two_launches):
+    """renders of different change sets should not wait for each other"""
+    started = threading.Barrier(2, timeout=5)
+    renderer = Mock(render_subject=Mock(side_effect=lambda _launches: started.wait()))
+    render_cache = RenderCache()
+
+    threads = [
+        threading.Thread(target=render_cache.render, args=(renderer, launches))
+        for launches in (single_launch, two_launches)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not started.broken
+    assert renderer.render_text_body.call_count == 2
+
+
+def test_render_cache_waits_for_render_in_progress(single_launch):
+    """concurrent renders of the same change set should render it once"""
+    release = threading.Event()
+    renderer = Mock(render_subject=Mock(side_effect=lambda _launches: release.wait(5)))
+    render_cache = RenderCache()
+    results = []
+
+    threads = [
+        threading.Thread(
+            target=lambda: results.append(render_cache.render(renderer, single_launch))
+        )
+        for _ in range(3)
+    ]
+    for thread in threads:
+        thread.start()
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    renderer.render_subject.assert_called_once_with(single_launch)
+    assert len(results) == 3
+    assert all(result is results[0] for result in results)
+
+
+def test_close_closes_service(handler):  # pylint: disable=redefined-outer-name
+    """closing a handler should release the resources held by its service"""
+    handler.close()
+    handler.service.close.assert_called_once()
+    NotificationHandler(Mock(), object()).close()
+
+
+def test_get_notification_renderer_shared():
+    """renderers with the same configuration should be shared"""
+    assert get_notification_renderer("html") is get_notification_renderer("html")
+    assert get_notification_renderer("html") is not get_notification_renderer("plaintext")
+
+
+def test_send_stream(single_launch):
+    """streaming handlers should pass body streams to the service, bypassing the cache"""
+    renderer = Mock()
+    render_cache = Mock()
+    handler = NotificationHandler(renderer, Mock(), render_cache, stream=True)
+
+    handler.send(single_launch)
+
+    render_cache.render.assert_not_called()
+    handler.service.send_stream.assert_called_once_with(
+        renderer.render_subject.return_value,
+        renderer.stream_text_body.return_value,
+        renderer.stream_formatted_body.return_value,
+    )
+    handler.service.send.assert_not_called()
+
+
+def test_get_notification_handlers_stream_unsupported():
+    """streaming should be disabled for services which cannot stream"""
+    service = Mock(spec=["send"])
+    handler_configs = [
+        NotificationHandlerConfig(service="gmail", renderer="html", parameters={}, stream=True)
+    ]
+    with patch("launches.notifications.handlers.get_notification_service", return_value=service):
+        handlers = get_notification_handlers(handler_configs)
+
+    assert handlers[0].stream is False
+
+
+class RecipientService:
+    """a service whose recipients declare timezones"""
+
+    def __init__(self, groups, fail=()):
+        self.groups = groups
+        self.fail = fail
+        self.sent = []
+
+    def timezone_groups(self):
+        return self.groups
+
+    def send(self, subject, msg, formatted_msg):
+        raise AssertionError("grouped services should be sent per group")
+
+    def send_to(self, recipients, subject, msg, formatted_msg):
+        self.sent.append((recipients, msg))
+        if set(recipients) & set(self.fail):
+            raise NotificationError("refused")
+
+
+def test_send_renders_once_per_timezone(single_launch):
+    """recipients should be grouped so each distinct timezone is rendered once"""
+    renderer = get_notification_renderer("plaintext")
+    service = RecipientService(
+        {
+            None: ["a@example.com"],
+            "Europe/Berlin": ["b@example.com", "c@example.com"],
+            renderer.tz: ["d@example.com"],
+        }
+    )
+    handler = NotificationHandler(renderer, service, RenderCache())
+
+    with patch.object(
+        renderer.text_renderer, "render", wraps=renderer.text_renderer.render
+    ) as render:
+        handler.send(single_launch)
+
+    assert render.call_count == 2
+    assert [recipients for recipients, _ in service.sent] == [
+        ["a@example.com", "d@example.com"],
+        ["b@example.com", "c@example.com"],
+    ]
+    assert "CDT" in service.sent[0][1]
+    assert "CEST" in service.sent[1][1]
+
+
+def test_send_by_timezone_attempts_every_group(single_launch):
+    """a failing timezone group should not stop the other groups"""
+    service = RecipientService(
+        {"Asia/Tokyo": ["a@example.com"], "Europe/Berlin": ["b@example.com"]},
+        fail=["a@example.com"],
+    )
+    handler = NotificationHandler(get_notification_renderer("plaintext"), service, RenderCache())
+
+    with pytest.raises(DeliveryError) as error:
+        handler.send(single_launch)
+
+    assert len(service.sent) == 2
+    assert error.value.failed_recipients == ["a@example.com"]
+
+
+class PooledRecipientService(RecipientService):
+    """a recipient service whose sends may run concurrently"""
+
+    capabilities = ServiceCapabilities(batch=True, pooled=True)
+
+    def __init__(self, groups):
+        super().__init__(groups)
+        self.barrier = threading.Barrier(len(groups), timeout=5)
+
+    def send_to(self, recipients, subject, msg, formatted_msg):
+        # every group must be in flight at once to pass the barrier
+        self.barrier.wait()
+        super().send_to(recipients, subject, msg, formatted_msg)
+
+
+def test_send_by_timezone_concurrent_for_pooled_services(single_launch):
+    """pooled services should be sent every timezone group concurrently"""
+    service = PooledRecipientService(
+        {"Asia/Tokyo": ["a@example.com"], "Europe/Berlin": ["b@example.com"]}
+    )
+    handler = NotificationHandler(get_notification_renderer("plaintext"), service, RenderCache())
+
+    handler.send(single_launch)
+
+    assert sorted(recipients for recipients, _ in service.sent) == [
+        ["a@example.com"],
+        ["b@example.com"],
+    ]
@@ -0,0 +1,87 @@
+"""unittests for launches.notifications.jsonl
+
+Copyright ©️ 2025 Scott Cummings
+SPDX-License-Identifier: MIT OR Apache-2.0
+"""
+
+import json
+from unittest.mock import patch
+
+from launches.config import NotificationHandlerConfig
+from launches.notifications.handlers import get_notification_handlers
+from launches.notifications.jsonl import JsonLinesHandler
+from launches.notifications.services import get_capabilities, get_service_class, register_service
+
+
+def test_jsonl_writes_records_with_changes(tmp_path, two_launches):
+    """each changed launch should be written as one JSON object with its change reasons"""
+    ids = [launch["id"] for launch in two_launches["results"]]
+    launches = {**two_launches, "changes": {ids[0]: ["status", "net"]}}
+    path = tmp_path / "launches.jsonl"
+    handler = JsonLinesHandler(str(path))
+
+    handler.send(launches)
+    handler.send(launches)
+
+    records = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [record["id"] for record in records] == ids * 2
+    assert records[0]["changes"] == ["status", "net"]
+    assert records[1]["changes"] == []
+    assert records[0]["launch"] == two_launches["results"][0]
+    handler.close()
+
+
+def test_jsonl_flushes_once_per_change_set(tmp_path, two_launches):
+    """records should be buffered and flushed once for each change set"""
+    handler = JsonLinesHandler(str(tmp_path / "launches.jsonl"))
+    handler.send(two_launches)
+
+    with patch.object(handler._file, "flush", wraps=handler._file.flush) as flush:
+        handler.send(two_launches)
+
+    flush.assert_called_once()
+    handler.close()
+
+
+def test_jsonl_stdout(capsys, single_launch):
+    """without a path records should be written to stdout"""
+    JsonLinesHandler().send(single_launch)
+
+    (line,) = capsys.readouterr().out.splitlines()
+    assert json.loads(line)["id"] == single_launch["results"][0]["id"]
+
+
+@patch("launches.notifications.handlers.get_notification_renderer")
+def test_get_notification_handlers_jsonl(get_notification_renderer_mock, tmp_path):
+    """jsonl handlers should be built without a renderer or service"""
+    handler_configs = [
+        NotificationHandlerConfig(
+            service="jsonl", parameters={"path": str(tmp_path / "out.jsonl")}, name="pipe"
+        )
+    ]
+
+    (handler,) = get_notification_handlers(handler_configs)
+
+    assert handler == JsonLinesHandler(str(tmp_path / "out.jsonl"), name="pipe")
+    get_notification_renderer_mock.assert_not_called()
+
+
+def test_jsonl_registered_as_handler_service():
+    """jsonl should be resolved through the service registry as a handler service"""
+    assert get_service_class("jsonl") is JsonLinesHandler
+    assert get_capabilities(JsonLinesHandler).handler
+
+
+def test_handler_service_plugin(tmp_path):
+    """a registered handler service should build the whole handler"""
+
+    class PluginHandler(JsonLinesHandler):
+        pass
+
+    register_service("test-handler-plugin", PluginHandler)
+    handler_configs = [NotificationHandlerConfig(service="test-handler-plugin", parameters={})]
+
+    (handler,) = get_notification_handlers(handler_configs)
+
+    assert isinstance(handler, PluginHandler)
+    assert handler.name == "0-test-handler-plugin"
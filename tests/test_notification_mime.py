@@ -0,0 +1,110 @@
+"""unittests for launches.notifications.mime
+
+Copyright ©️ 2025 Scott Cummings
+SPDX-License-Identifier: MIT OR Apache-2.0
+"""
+
+import email
+from email.header import decode_header, make_header
+
+import pytest
+
+from launches.errors import NotificationError
+from launches.notifications.mime import (
+    add_headers,
+    encode_header,
+    encode_message,
+    iter_base64_lines,
+    iter_mime_message,
+)
+
+
+def parse(lines):
+    """parse streamed message lines back into an email.message.Message"""
+    return email.message_from_bytes(b"".join(lines))
+
+
+def test_iter_base64_lines():
+    """chunks should encode into 76 character lines regardless of chunk boundaries"""
+    text = "launch é " * 50
+    lines = list(iter_base64_lines(text[i : i + 7] for i in range(0, len(text), 7)))
+
+    assert all(len(line) <= 78 and line.endswith(b"\r\n") for line in lines)
+    assert all(len(line) == 78 for line in lines[:-1])
+    assert email.message_from_bytes(
+        b"Content-Transfer-Encoding: base64\r\n\r\n" + b"".join(lines)
+    ).get_payload(decode=True) == text.encode("utf-8")
+
+
+def test_iter_mime_message_plaintext():
+    """a message without html should be a single text/plain part"""
+    message = parse(iter_mime_message({"Subject": "Launches"}, iter(["one ", "two"])))
+
+    assert message["Subject"] == "Launches"
+    assert message.get_content_type() == "text/plain"
+    assert message.get_payload(decode=True) == b"one two"
+
+
+def test_iter_mime_message_alternative():
+    """a message with html should contain plaintext and html alternatives"""
+    message = parse(
+        iter_mime_message(
+            {"Subject": "Lancements à venir", "To": "user@example.com"},
+            iter(["plain"]),
+            iter(["<p>", "html", "</p>"]),
+        )
+    )
+
+    assert str(make_header(decode_header(message["Subject"]))) == "Lancements à venir"
+    assert message.get_content_type() == "multipart/alternative"
+    text, html = message.get_payload()
+    assert text.get_content_type() == "text/plain"
+    assert text.get_payload(decode=True) == b"plain"
+    assert html.get_content_type() == "text/html"
+    assert html.get_payload(decode=True) == b"<p>html</p>"
+
+
+def test_encode_message_shared():
+    """the same content should be encoded once and stamped with per-service headers"""
+    encode_message.cache_clear()
+    message = encode_message("Launches", "plain", "<p>html</p>")
+
+    assert encode_message("Launches", "plain", "<p>html</p>") is message
+    assert encode_message.cache_info().hits == 1
+
+    stamped = parse([add_headers(message, {"From": "a@example.com", "To": "b@example.com"})])
+    assert stamped["From"] == "a@example.com"
+    assert stamped["To"] == "b@example.com"
+    assert stamped["Subject"] == "Launches"
+    text, html = stamped.get_payload()
+    assert text.get_payload(decode=True) == b"plain"
+    assert html.get_payload(decode=True) == b"<p>html</p>"
+
+
+def test_encode_header_folds_with_crlf():
+    """long non-ASCII headers should be folded with CRLF line breaks only"""
+    subject = "Lancements à venir " * 10
+    line = encode_header("Subject", subject)
+
+    assert line.count(b"\r\n") > 1
+    assert b"\n" not in line.replace(b"\r\n", b"")
+    message = email.message_from_bytes(line + b"\r\nbody")
+    assert str(make_header(decode_header(message["Subject"]))) == subject
+
+
+def test_encode_header_folds_ascii_recipients():
+    """a long ASCII To list should be folded into short lines"""
+    recipients = [f"user{i}@example.com" for i in range(200)]
+    line = encode_header("To", ", ".join(recipients))
+
+    assert all(len(folded) <= 78 for folded in line.split(b"\r\n"))
+    message = email.message_from_bytes(line + b"\r\nbody")
+    assert [address.strip() for address in message["To"].split(",")] == recipients
+
+
+def test_encode_header_rejects_line_breaks():
+    """header values with line breaks should be rejected rather than inject headers"""
+    with pytest.raises(NotificationError):
+        encode_header("Subject", "Launches\r\nBcc: someone@example.com")
+    with pytest.raises(NotificationError):
+        encode_header("Subject", "Lancements à venir\nBcc: someone@example.com")
@@ -0,0 +1,36 @@
+"""unittests for launches.notifications.ratelimit
+
+Copyright ©️ 2025 Scott Cummings
+SPDX-License-Identifier: MIT OR Apache-2.0
+"""
+
+from unittest.mock import patch
+
+from launches.notifications.ratelimit import TokenBucket
+
+
+@patch("launches.notifications.ratelimit.time")
+def test_token_bucket(time_mock):
+    """a bucket should allow a burst of capacity then wait for refills"""
+    clock = [0.0]
+    time_mock.monotonic.side_effect = lambda: clock[0]
+    time_mock.sleep.side_effect = lambda seconds: clock.__setitem__(0, clock[0] + seconds)
+    bucket = TokenBucket(rate=100, capacity=200)
+
+    assert bucket.acquire(200) == 0
+    assert bucket.acquire(100) == 1.0
+    assert bucket.acquire(500) == 2.0
+
+
+@patch("launches.notifications.ratelimit.time")
+def test_token_bucket_try_acquire(time_mock):
+    """try_acquire should take available tokens without waiting"""
+    clock = [0.0]
+    time_mock.monotonic.side_effect = lambda: clock[0]
+    bucket = TokenBucket(rate=1, capacity=1)
+
+    assert bucket.try_acquire()
+    assert not bucket.try_acquire()
+    clock[0] = 1.0
+    assert bucket.try_acquire()
+    time_mock.sleep.assert_not_called()
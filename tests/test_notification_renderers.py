@@ -4,13 +4,33 @@ Copyright ©️ 2025 Scott Cummings
 SPDX-License-Identifier: MIT OR Apache-2.0
 """
 
+import copy
+import os
+import tempfile
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+from jinja2 import FileSystemLoader
+
+from launches.errors import ConfigError
+from launches.ll2 import parse_launch_time
 from launches.notifications.renderers import (
+    BODY_TZ,
     HTML_TEMPLATE,
+    RENDER_SECONDS,
+    TXT_TEMPLATE,
+    DigestTemplate,
     JinjaRenderer,
     format_time,
+    get_jinja_env,
+    launch_fingerprint,
     local_format_time,
+    precompile_templates,
 )
 
+MONOLITHIC_TEMPLATES_DIR = "tests/resources/monolithic"
+
 
 def test_subject_renderer(single_launch):
     renderer = JinjaRenderer()
@@ -120,3 +140,143 @@ def test_format_unexpected_time_format():
     """format_time should return an empty string if the input is not in the expected format"""
     assert format_time("2023-11-19 10:52 GMT") == ""
     assert format_time("2023-11-19 10:52") == ""
+
+
+def test_digest_template_reuses_fragments(two_launches):
+    """only launches which changed since the last render should be re-rendered"""
+    digest = DigestTemplate(TXT_TEMPLATE)
+    first_body = digest.render(two_launches)
+
+    updated = copy.deepcopy(two_launches)
+    updated["results"][1]["status"]["name"] = "Go for Launch"
+    fragments = Mock(wraps=digest.fragment_module(BODY_TZ))
+    with patch.object(digest, "fragment_module", return_value=fragments):
+        updated_body = digest.render(updated)
+
+    fragments.summary.assert_called_once_with(updated["results"][1])
+    fragments.detail.assert_called_once_with(updated["results"][1])
+    assert "To Be Confirmed" in first_body
+    assert updated_body != first_body
+    assert updated_body.count("Go for Launch") == 4
+
+
+@pytest.mark.parametrize("template_name", [TXT_TEMPLATE, HTML_TEMPLATE])
+def test_digest_template_matches_full_render(two_launches, template_name):
+    """assembling cached fragments should match the monolithic template the digest
+    replaced, apart from the indentation of HTML fragments"""
+    env = get_jinja_env().overlay(loader=FileSystemLoader(MONOLITHIC_TEMPLATES_DIR))
+    expected = env.get_template(template_name).render(two_launches, body_tz=BODY_TZ)
+    digest = DigestTemplate(template_name)
+
+    for _ in range(2):  # rendered from scratch, then from cached fragments
+        body = digest.render(two_launches)
+        if template_name == TXT_TEMPLATE:
+            assert body == expected
+        else:
+            assert [line.strip() for line in body.splitlines() if line.strip()] == [
+                line.strip() for line in expected.splitlines() if line.strip()
+            ]
+    assert len(digest._cache) == 2
+
+
+def test_launch_fingerprint(single_launch):
+    """the fingerprint should change when any launch field changes"""
+    updated = copy.deepcopy(single_launch["results"][0])
+    assert launch_fingerprint(updated) == launch_fingerprint(single_launch["results"][0])
+    updated["mission"]["description"] = "changed"
+    assert launch_fingerprint(updated) != launch_fingerprint(single_launch["results"][0])
+
+
+def test_digest_template_loads_lazily(single_launch):
+    """templates should not be loaded until the first render"""
+    digest = DigestTemplate(TXT_TEMPLATE)
+    assert digest.template is None
+    digest.render(single_launch)
+    assert digest.template is not None
+
+
+def test_precompile_templates():
+    """precompiling should write a bytecode cache entry for every template"""
+    with tempfile.TemporaryDirectory() as cache_dir:
+        precompile_templates(cache_dir)
+        assert len(os.listdir(cache_dir)) == len(get_jinja_env().list_templates())
+
+
+def test_renderer_timezone(single_launch):
+    """renderers should localize times to their configured timezone"""
+    renderer = JinjaRenderer(formatted_template=HTML_TEMPLATE, tz="Europe/Berlin")
+    assert "Tue May 27 2025 18:14 CEST" in renderer.render_text_body(single_launch)
+    assert "Tue May 27 2025 18:14 CEST" in renderer.render_formatted_body(single_launch)
+    assert "Tue May 27 2025 11:14 CDT" in JinjaRenderer().render_text_body(single_launch)
+
+
+def test_renderer_unknown_timezone():
+    """an unknown timezone should be reported as a configuration error"""
+    with pytest.raises(ConfigError):
+        JinjaRenderer(tz="Mars/Olympus_Mons")
+
+
+def test_renderer_localized(single_launch):
+    """localized renderers should be shared per timezone and share templates"""
+    renderer = JinjaRenderer()
+    berlin = renderer.localized("Europe/Berlin")
+
+    assert renderer.localized(BODY_TZ) is renderer
+    assert berlin.localized("Europe/Berlin") is berlin
+    assert renderer.localized("Europe/Berlin") is berlin
+    assert berlin.text_renderer is renderer.text_renderer
+    assert "Tue May 27 2025 18:14 CEST" in berlin.render_text_body(single_launch)
+    assert "Tue May 27 2025 11:14 CDT" in renderer.render_text_body(single_launch)
+    with pytest.raises(ConfigError):
+        renderer.localized("Mars/Olympus_Mons")
+
+
+def test_format_time_parsed_datetime():
+    """time helpers should accept datetimes parsed upstream"""
+    dt = parse_launch_time("2023-11-19T10:52:20Z")
+    assert local_format_time(dt) == "Sun Nov 19 2023 04:52 CST"
+    assert local_format_time(dt, "UTC") == "Sun Nov 19 2023 10:52 UTC"
+    assert format_time(dt) == "Sun Nov 19 2023 10:52 UTC"
+    assert format_time(None) == ""
+
+
+def test_digest_template_generates_fragments_lazily(two_launches):
+    """streamed digests should render fragments as they are consumed"""
+    digest = DigestTemplate(TXT_TEMPLATE)
+    with patch.object(digest, "render_fragments", wraps=digest.render_fragments) as fragments:
+        chunks = digest.generate(two_launches)
+        first = next(chunks)
+        assert fragments.call_count == 0
+        body = first + "".join(chunks)
+
+    assert fragments.call_count == 4
+    assert body == digest.render(two_launches)
+
+
+def test_digest_template_generate_records_render_time(two_launches):
+    """streamed digests should record their render time, excluding the consumer's"""
+    digest = DigestTemplate(TXT_TEMPLATE)
+    digest.render(two_launches)  # load the templates and fragments
+    count = RENDER_SECONDS.count(template=TXT_TEMPLATE)
+    total = RENDER_SECONDS.sum(template=TXT_TEMPLATE)
+
+    consumed = 0.0
+    for _ in digest.generate(two_launches):
+        time.sleep(0.01)
+        consumed += 0.01
+
+    assert RENDER_SECONDS.count(template=TXT_TEMPLATE) == count + 1
+    assert RENDER_SECONDS.sum(template=TXT_TEMPLATE) - total < consumed / 2
+
+
+def test_jinja_renderer_stream(two_launches):
+    """streamed bodies should match the rendered bodies"""
+    renderer = JinjaRenderer(formatted_template=HTML_TEMPLATE)
+
+    assert "".join(renderer.stream_text_body(two_launches)) == renderer.render_text_body(
+        two_launches
+    )
+    assert "".join(renderer.stream_formatted_body(two_launches)) == (
+        renderer.render_formatted_body(two_launches)
+    )
+    assert JinjaRenderer().stream_formatted_body(two_launches) is None
@@ -5,16 +5,44 @@ SPDX-License-Identifier: MIT OR Apache-2.0
 """
 
 import base64
+import email
+import hmac
+import json
+import smtplib
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import MagicMock, patch
 
+import googleapiclient.errors
 import pytest
 
 from launches.config import NotificationHandlerConfig
-from launches.errors import ConfigError
+from launches.errors import ConfigError, DeliveryError, NotificationError
+from launches.notifications.mime import encode_message
 from launches.notifications.services import (
+    GmailNotificationService,
+    ServiceCapabilities,
     SMTPEmaiLNotificationService,
     StdOutNotificationService,
+    WebhookNotificationService,
+    get_capabilities,
     get_notification_service,
+    get_service_class,
+    register_service,
 )
+from launches.notifications.services.smtp_pool import (
+    SMTPConnectionPool,
+    close_connection_pools,
+)
+from launches.notifications.services.webhook import sign
+
+
+@pytest.fixture(autouse=True)
+def reset_connection_pools():
+    """keep pooled SMTP connections from leaking between tests"""
+    close_connection_pools()
+    yield
+    close_connection_pools()
 
 
 def test_get_notification_service_stdout():
@@ -57,3 +85,639 @@ def test_get_notification_service_unknown_service():
 
     with pytest.raises(ConfigError):
         get_notification_service(service_config)
+
+
+def test_get_service_class():
+    """services should be resolved by name from the registry"""
+    assert get_service_class("stdout") is StdOutNotificationService
+    with pytest.raises(ConfigError):
+        get_service_class("unknown")
+
+
+def test_get_capabilities():
+    """declared capabilities are returned, undeclared ones are inferred from methods"""
+    assert get_capabilities(StdOutNotificationService()) == ServiceCapabilities(streaming=True)
+    assert get_capabilities(WebhookNotificationService(urls=["http://localhost"])).pooled
+
+    class SendOnly:
+        def send(self, subject, msg, formatted_msg):
+            pass
+
+    class Streaming(SendOnly):
+        def send_stream(self, subject, msg, formatted_msg):
+            pass
+
+    assert get_capabilities(SendOnly) == ServiceCapabilities()
+    assert get_capabilities(Streaming()) == ServiceCapabilities(streaming=True)
+
+
+def test_register_service():
+    """registered services should be built by name"""
+
+    class PluginService(StdOutNotificationService):
+        pass
+
+    register_service("test-plugin", PluginService)
+    service = get_notification_service(
+        NotificationHandlerConfig(service="test-plugin", parameters={})
+    )
+    assert isinstance(service, PluginService)
+
+
+def get_smtp_service(**overrides):
+    """return an SMTPEmaiLNotificationService for tests"""
+    parameters = {
+        "smtp_server": "smtp.example.com",
+        "smtp_port": 587,
+        "use_tls": False,
+        "sender": "sender@example.com",
+        "recipients": ["one@example.com", "two@example.com"],
+    }
+    parameters.update(overrides)
+    return SMTPEmaiLNotificationService(**parameters)
+
+
+@patch("launches.notifications.services.smtp_email.smtplib.SMTP")
+def test_smtp_send_stream(smtp_mock):
+    """send_stream should write the encoded message into the DATA stream"""
+    connection = smtp_mock.return_value
+    connection.mail.return_value = (250, b"ok")
+    connection.rcpt.return_value = (250, b"ok")
+    connection.docmd.return_value = (354, b"go ahead")
+    connection.getreply.return_value = (250, b"queued")
+
+    get_smtp_service().send_stream("Launches", iter(["plain ", "body"]), iter(["<p>html</p>"]))
+
+    assert connection.rcpt.call_count == 2
+    connection.docmd.assert_called_once_with("DATA")
+    data = b"".join(call.args[0] for call in connection.send.call_args_list)
+    assert data.endswith(b"\r\n.\r\n")
+    message = email.message_from_bytes(data[: -len(b".\r\n")])
+    assert message["From"] == "sender@example.com"
+    text, html = message.get_payload()
+    assert text.get_payload(decode=True) == b"plain body"
+    assert html.get_payload(decode=True) == b"<p>html</p>"
+    connection.close.assert_not_called()
+
+
+@patch("launches.notifications.services.smtp_email.smtplib.SMTP")
+def test_smtp_send_stream_data_refused(smtp_mock):
+    """send_stream should raise a NotificationError when the server rejects the message"""
+    connection = smtp_mock.return_value
+    connection.mail.return_value = (250, b"ok")
+    connection.rcpt.return_value = (250, b"ok")
+    connection.docmd.return_value = (354, b"go ahead")
+    connection.getreply.return_value = (554, b"rejected")
+
+    with pytest.raises(NotificationError):
+        get_smtp_service().send_stream("Launches", iter(["body"]), None)
+    # a connection left mid transaction is never returned to the pool
+    connection.close.assert_called_once()
+
+
+def test_stdout_send_stream(capsys):
+    """send_stream should print the same output as send"""
+    service = StdOutNotificationService()
+
+    service.send("Launches", "plain body", None)
+    sent = capsys.readouterr().out
+    service.send_stream("Launches", iter(["plain ", "body"]), None)
+
+    assert capsys.readouterr().out == sent
+
+
+@patch("launches.notifications.services.smtp_email.smtplib.SMTP")
+def test_smtp_send_to_timezone_group(smtp_mock):
+    """recipients should be grouped by timezone and sent to one group at a time"""
+    smtp_mock.return_value.sendmail.return_value = {}
+    service = get_smtp_service(
+        recipients=["a@example.com", "b@example.com"],
+        recipient_timezones={"b@example.com": "Europe/Berlin"},
+    )
+
+    service.send_to(["b@example.com"], "Launches", "body", None)
+
+    assert service.timezone_groups() == {
+        None: ["a@example.com"],
+        "Europe/Berlin": ["b@example.com"],
+    }
+    _, recipients, message = smtp_mock.return_value.sendmail.call_args.args
+    assert recipients == ["b@example.com"]
+    assert email.message_from_bytes(message)["To"] == "b@example.com"
+
+
+@patch("launches.notifications.services.smtp_email.smtplib.SMTP")
+def test_smtp_send_reuses_connection(smtp_mock):
+    """handlers for the same server should share one authenticated session"""
+    connection = smtp_mock.return_value
+    connection.noop.return_value = (250, b"ok")
+    connection.sendmail.return_value = {}
+    password = base64.b64encode(b"password123").decode("utf-8")
+    services = [get_smtp_service(smtp_username="user", smtp_password=password) for _ in range(2)]
+
+    for service in services:
+        service.send("Launches", "body", None)
+        service.send("Launches", "body", "<p>body</p>")
+
+    smtp_mock.assert_called_once()
+    connection.login.assert_called_once()
+    assert connection.sendmail.call_count == 4
+    assert connection.noop.call_count == 3
+
+
+@patch("launches.notifications.services.smtp_email.smtplib.SMTP")
+def test_smtp_send_reconnects_after_disconnect(smtp_mock):
+    """a pooled session dropped by the server should be replaced and the message resent"""
+    stale, fresh = MagicMock(), MagicMock()
+    smtp_mock.side_effect = [stale, fresh]
+    stale.noop.return_value = (250, b"ok")
+    stale.sendmail.side_effect = [{}, smtplib.SMTPServerDisconnected()]
+    fresh.sendmail.return_value = {}
+    service = get_smtp_service()
+
+    service.send("Launches", "body", None)
+    service.send("Launches", "body", None)
+
+    assert smtp_mock.call_count == 2
+    stale.close.assert_called_once()
+    fresh.sendmail.assert_called_once()
+
+
+@patch("launches.notifications.services.smtp_email.smtplib.SMTP")
+def test_smtp_send_connect_error(smtp_mock):
+    """a failed connection should raise a NotificationError"""
+    smtp_mock.side_effect = smtplib.SMTPConnectError(421, b"unavailable")
+
+    with pytest.raises(NotificationError):
+        get_smtp_service(retry_delay=0).send("Launches", "body", None)
+    assert smtp_mock.call_count == 3
+
+
+def test_smtp_pool_shared_by_credentials_and_settings():
+    """services should only share a pool with the same login, password and pool settings"""
+    password = base64.b64encode(b"secret").decode("ascii")
+    changed_password = base64.b64encode(b"changed").decode("ascii")
+    login = {"smtp_username": "user", "smtp_password": password}
+    service = get_smtp_service(**login)
+
+    assert get_smtp_service(**login).pool is service.pool
+    changed = get_smtp_service(smtp_username="user", smtp_password=changed_password)
+    assert changed.pool is not service.pool
+    resized = get_smtp_service(**login, pool_size=2)
+    assert resized.pool is not service.pool
+    assert resized.pool.max_size == 2
+
+
+def test_smtp_close_releases_pool():
+    """the shared pool should be closed once every service using it is closed"""
+    services = [get_smtp_service(), get_smtp_service()]
+    pool = services[0].pool
+
+    services[0].close()
+    services[0].close()
+    assert not pool.closed
+    services[1].close()
+    assert pool.closed
+    assert get_smtp_service().pool is not pool
+
+
+def test_connection_pool_closes_returned_connections():
+    """connections returned to a closed pool should be closed rather than kept"""
+    connection = MagicMock()
+    pool = SMTPConnectionPool(MagicMock(return_value=connection))
+
+    with pool.connection():
+        pool.close()
+
+    connection.quit.assert_called_once()
+    assert pool._idle == []
+
+
+def test_webhook_close():
+    """closing the webhook service should close its pooled session"""
+    service = WebhookNotificationService(urls=["http://localhost"])
+    with patch.object(service.session, "close") as close:
+        service.close()
+    close.assert_called_once()
+
+
+def test_connection_pool_health_check():
+    """idle connections failing NOOP or past their idle timeout should be replaced"""
+    connections = [MagicMock() for _ in range(3)]
+    connect = MagicMock(side_effect=connections)
+    pool = SMTPConnectionPool(connect, idle_timeout=60)
+
+    with pool.connection() as connection:
+        assert connection is connections[0]
+    connections[0].noop.return_value = (421, b"closing")
+    with pool.connection() as connection:
+        assert connection is connections[1]
+    connections[0].close.assert_called_once()
+
+    pool.idle_timeout = -1
+    with pool.connection() as connection:
+        assert connection is connections[2]
+    connections[1].quit.assert_called_once()
+    connections[1].noop.assert_not_called()
+
+
+def test_connection_pool_bounded():
+    """the pool should keep at most max_size connections open"""
+    pool = SMTPConnectionPool(MagicMock(), max_size=1)
+
+    with patch("launches.notifications.services.smtp_pool.ACQUIRE_TIMEOUT", 0.01):
+        with pool.connection(), pytest.raises(smtplib.SMTPException), pool.connection():
+            pass
+
+
+@patch("launches.notifications.services.smtp_email.smtplib.SMTP")
+def test_smtp_send_chunks_recipients(smtp_mock):
+    """recipients should be split into transactions of recipients_per_message"""
+    connection = smtp_mock.return_value
+    connection.noop.return_value = (250, b"ok")
+    connection.sendmail.return_value = {}
+    recipients = [f"user{i}@example.com" for i in range(5)]
+    service = get_smtp_service(recipients=recipients, recipients_per_message=2)
+
+    service.send("Launches", "body", None)
+
+    chunks = sorted(call.args[1] for call in connection.sendmail.call_args_list)
+    assert chunks == [recipients[0:2], recipients[2:4], recipients[4:]]
+    # each transaction is addressed to its own chunk of recipients
+    for _, chunk, message in (call.args for call in connection.sendmail.call_args_list):
+        assert email.message_from_bytes(message)["To"] == ", ".join(chunk)
+
+
+@patch("launches.notifications.services.smtp_email.smtplib.SMTP")
+def test_smtp_chunks_share_pool_executor(smtp_mock):
+    """chunks should be sent on the pool's long-lived workers, not a pool per send"""
+    connection = smtp_mock.return_value
+    connection.noop.return_value = (250, b"ok")
+    threads = set()
+
+    def sendmail(*_args):
+        threads.add(threading.current_thread().name)
+        return {}
+
+    connection.sendmail.side_effect = sendmail
+    recipients = [f"user{i}@example.com" for i in range(4)]
+    service = get_smtp_service(recipients=recipients, recipients_per_message=1, pool_size=2)
+
+    for _ in range(3):
+        service.send("Launches", "body", None)
+
+    assert connection.sendmail.call_count == 12
+    assert all(name.startswith("launches-smtp") for name in threads)
+    assert len(threads) <= 2
+
+
+@patch("launches.notifications.services.smtp_email.smtplib.SMTP")
+def test_smtp_send_stream_chunks_large_recipient_lists(smtp_mock):
+    """streaming to more than recipients_per_message should send rendered chunks"""
+    connection = smtp_mock.return_value
+    connection.noop.return_value = (250, b"ok")
+    connection.sendmail.return_value = {}
+    recipients = [f"user{i}@example.com" for i in range(3)]
+    service = get_smtp_service(recipients=recipients, recipients_per_message=2)
+
+    service.send_stream("Launches", iter(["plain ", "body"]), iter(["<p>html</p>"]))
+
+    connection.mail.assert_not_called()
+    chunks = sorted(call.args[1] for call in connection.sendmail.call_args_list)
+    assert chunks == [recipients[0:2], recipients[2:]]
+    text, html = email.message_from_bytes(connection.sendmail.call_args.args[2]).get_payload()
+    assert text.get_payload(decode=True) == b"plain body"
+    assert html.get_payload(decode=True) == b"<p>html</p>"
+
+
+@patch("launches.notifications.services.smtp_email.smtplib.SMTP")
+def test_smtp_send_retries_failed_recipients(smtp_mock):
+    """only recipients refused with a transient error should be retried"""
+    connection = smtp_mock.return_value
+    connection.noop.return_value = (250, b"ok")
+    connection.sendmail.side_effect = [
+        {"one@example.com": (451, b"try again"), "two@example.com": (550, b"no such user")},
+        {},
+    ]
+    service = get_smtp_service(retry_delay=0)
+
+    with pytest.raises(DeliveryError) as error:
+        service.send("Launches", "body", None)
+
+    assert connection.sendmail.call_count == 2
+    assert connection.sendmail.call_args.args[1] == ["one@example.com"]
+    assert error.value.failed_recipients == ["two@example.com"]
+
+
+@patch("launches.notifications.services.smtp_email.smtplib.SMTP")
+def test_smtp_deliver_results(smtp_mock):
+    """deliver should return a result for every recipient"""
+    connection = smtp_mock.return_value
+    connection.sendmail.side_effect = smtplib.SMTPRecipientsRefused(
+        {"one@example.com": (550, b"no"), "two@example.com": (550, b"no")}
+    )
+    service = get_smtp_service()
+
+    results = service.deliver(b"message", service.get_recipients())
+
+    assert set(results) == {"one@example.com", "two@example.com"}
+    assert not any(result.success or result.retryable for result in results.values())
+    assert results["one@example.com"].response == "no"
+    connection.close.assert_not_called()
+
+
+@pytest.fixture
+def gmail_creds(tmp_path):
+    """patch Gmail credential loading, returning the loaded credentials mock"""
+    token_file = tmp_path / "token.json"
+    token_file.write_text("{}")
+    creds = MagicMock(valid=True, expired=False, refresh_token="refresh")  # noqa: S106
+    creds.to_json.return_value = '{"token": "refreshed"}'
+    with patch(
+        "launches.notifications.services.gmail.Credentials.from_authorized_user_file",
+        return_value=creds,
+    ):
+        yield creds, token_file
+
+
+@patch("launches.notifications.services.gmail.build")
+def test_gmail_service_built_once(build_mock, gmail_creds):
+    """the Gmail API service should be built once from the bundled discovery document"""
+    _, token_file = gmail_creds
+    service = GmailNotificationService(token_file=str(token_file), recipients=["a@example.com"])
+
+    service.send("Launches", "body", None)
+    service.send("Launches", "body", "<p>body</p>")
+
+    build_mock.assert_called_once()
+    assert build_mock.call_args.kwargs["static_discovery"] is True
+    assert build_mock.return_value.users().messages().send().execute.call_count == 2
+
+
+@patch("launches.notifications.services.gmail.InstalledAppFlow")
+@patch("launches.notifications.services.gmail.build")
+def test_gmail_refreshes_expired_token(build_mock, flow_mock, gmail_creds):
+    """expired credentials should be refreshed and saved without the OAuth2 flow"""
+    creds, token_file = gmail_creds
+    creds.valid = False
+
+    def refresh(_request):
+        creds.valid = True
+
+    creds.refresh.side_effect = refresh
+    service = GmailNotificationService(token_file=str(token_file), recipients="a@example.com")
+
+    creds.expired = True
+    service.send("Launches", "body", None)
+
+    assert creds.refresh.call_count == 2
+    flow_mock.from_client_secrets_file.assert_not_called()
+    assert token_file.read_text() == '{"token": "refreshed"}'
+    build_mock.assert_called_once()
+
+
+def http_error(status):
+    """return a googleapiclient HttpError with the status"""
+    return googleapiclient.errors.HttpError(MagicMock(status=status, reason="error"), b"{}")
+
+
+class FakeBatch:
+    """a stand-in for a Gmail batch request failing requests with errors[request_id]"""
+
+    def __init__(self, callback, errors, sizes):
+        self.callback = callback
+        self.errors = errors
+        self.sizes = sizes
+        self.request_ids = []
+
+    def add(self, _request, request_id):
+        self.request_ids.append(request_id)
+
+    def execute(self):
+        self.sizes.append(len(self.request_ids))
+        for request_id in self.request_ids:
+            self.callback(request_id, {}, self.errors.pop(0) if self.errors else None)
+
+
+@patch("launches.notifications.services.gmail.build")
+def test_gmail_batches_separate_messages(build_mock, gmail_creds):
+    """separate messages should be sent in batches, retrying only rate limited messages"""
+    _, token_file = gmail_creds
+    sizes = []
+    errors = [None, http_error(429), http_error(400), None, None]
+    build_mock.return_value.new_batch_http_request.side_effect = lambda callback: FakeBatch(
+        callback, errors, sizes
+    )
+    recipients = [f"user{i}@example.com" for i in range(5)]
+    service = GmailNotificationService(
+        token_file=str(token_file),
+        recipients=recipients,
+        separate_messages=True,
+        batch_size=3,
+        retry_delay=0,
+        quota_units_per_second=10000,
+    )
+
+    with pytest.raises(DeliveryError) as error:
+        service.send("Launches", "body", None)
+
+    assert sizes == [3, 2]
+    # the rate limited message is retried on its own, outside of a batch
+    build_mock.return_value.users().messages().send().execute.assert_called_once()
+    assert error.value.failed_recipients == ["user2@example.com"]
+
+
+@patch("launches.notifications.services.gmail.build")
+def test_gmail_joined_message_fails_each_recipient(build_mock, gmail_creds):
+    """a failed message to several recipients should report each of its recipients"""
+    _, token_file = gmail_creds
+    build_mock.return_value.users().messages().send().execute.side_effect = http_error(400)
+    recipients = ["a@example.com", "b@example.com"]
+    service = GmailNotificationService(token_file=str(token_file), recipients=recipients)
+
+    with pytest.raises(DeliveryError) as error:
+        service.send("Launches", "body", None)
+
+    assert error.value.failed_recipients == recipients
+    raw = build_mock.return_value.users().messages().send.call_args.kwargs["body"]["raw"]
+    assert email.message_from_bytes(base64.urlsafe_b64decode(raw))["To"] == ", ".join(recipients)
+
+
+@patch("launches.notifications.services.gmail.build")
+@patch("launches.notifications.services.smtp_email.smtplib.SMTP")
+def test_email_services_share_encoding(smtp_mock, build_mock, gmail_creds):
+    """email services sending the same notification should share one encoded message"""
+    _, token_file = gmail_creds
+    smtp_mock.return_value.sendmail.return_value = {}
+    gmail = GmailNotificationService(token_file=str(token_file), recipients="g@example.com")
+    smtp = get_smtp_service()
+
+    with patch(
+        "launches.notifications.services.smtp_email.encode_message",
+        wraps=encode_message,
+    ) as smtp_encode:
+        smtp.send("Launches", "shared body", "<p>shared</p>")
+    gmail.send("Launches", "shared body", "<p>shared</p>")
+
+    smtp_message = email.message_from_bytes(smtp_mock.return_value.sendmail.call_args.args[2])
+    raw = build_mock.return_value.users().messages().send.call_args.kwargs["body"]["raw"]
+    gmail_message = email.message_from_bytes(base64.urlsafe_b64decode(raw))
+    assert smtp_encode.call_count == 1
+    assert smtp_message["From"] == "sender@example.com"
+    assert gmail_message["To"] == "g@example.com"
+    assert (
+        smtp_message.get_payload()[1].get_payload() == gmail_message.get_payload()[1].get_payload()
+    )
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """records webhook requests, replying with statuses queued per path"""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        server = self.server
+        with server.lock:
+            server.requests.append((self.path, dict(self.headers), body))
+            server.clients.add(self.client_address)
+            statuses = server.statuses.get(self.path, [])
+            status = statuses.pop(0) if statuses else 204
+        self.send_response(status)
+        if status == 429:
+            self.send_header("Retry-After", "0")
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *_args):
+        pass
+
+
+@pytest.fixture
+def webhook_server():
+    """run a local stand-in HTTP server for webhook endpoints"""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+    server.lock = threading.Lock()
+    server.requests, server.clients, server.statuses = [], set(), {}
+    server.url = f"http://127.0.0.1:{server.server_address[1]}"
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_get_notification_service_webhook():
+    """get_notification_service should return a WebhookNotificationService if service is webhook"""
+    service_config = NotificationHandlerConfig(
+        service="webhook",
+        renderer="text",
+        parameters={"urls": "http://127.0.0.1/hook"},
+    )
+
+    notification_service = get_notification_service(service_config)
+
+    assert isinstance(notification_service, WebhookNotificationService)
+
+
+def test_webhook_unknown_format():
+    """an unknown webhook format should be a configuration error"""
+    with pytest.raises(ConfigError):
+        WebhookNotificationService(urls="http://127.0.0.1/hook", format="xml")
+
+
+def test_webhook_posts_signed_json(webhook_server):
+    """every endpoint should receive the same signed json payload"""
+    urls = [f"{webhook_server.url}/hook/{i}" for i in range(3)]
+    service = WebhookNotificationService(urls=urls, secret="s3cret")  # noqa: S106 - test secret
+
+    service.send("Launches", "text body", "<p>html</p>")
+
+    assert sorted(path for path, _, _ in webhook_server.requests) == [
+        f"/hook/{i}" for i in range(3)
+    ]
+    _, headers, body = webhook_server.requests[0]
+    assert json.loads(body) == {"subject": "Launches", "text": "text body", "html": "<p>html</p>"}
+    assert headers["Content-Type"] == "application/json"
+    expected = sign("s3cret", headers["X-Launches-Timestamp"], body)
+    assert hmac.compare_digest(headers["X-Launches-Signature"], expected)
+
+
+def test_webhook_posts_rendered_body(webhook_server):
+    """the body format should post the rendered html, or text if there is none"""
+    service = WebhookNotificationService(urls=f"{webhook_server.url}/hook", format="body")
+
+    service.send("Launches", "text body", "<p>html</p>")
+    service.send("Launches", "text body", None)
+
+    (_, html_headers, html), (_, text_headers, text) = webhook_server.requests
+    assert (html, html_headers["Content-Type"]) == (b"<p>html</p>", "text/html; charset=utf-8")
+    assert (text, text_headers["Content-Type"]) == (b"text body", "text/plain; charset=utf-8")
+    assert "X-Launches-Signature" not in html_headers
+
+
+def test_webhook_reuses_connections(webhook_server):
+    """posts should share at most max_connections keep-alive connections"""
+    urls = [f"{webhook_server.url}/hook/{i}" for i in range(20)]
+    service = WebhookNotificationService(urls=urls, max_connections=2)
+
+    service.send("Launches", "one", None)
+    service.send("Launches", "two", None)
+
+    assert len(webhook_server.requests) == 40
+    assert len(webhook_server.clients) <= 2
+
+
+def test_webhook_retries_transient_failures(webhook_server):
+    """5xx and 429 responses should be retried, other failures should not"""
+    webhook_server.statuses = {"/flaky": [503], "/limited": [429], "/gone": [404, 404]}
+    urls = [f"{webhook_server.url}/{path}" for path in ("ok", "flaky", "limited", "gone")]
+    service = WebhookNotificationService(urls=urls, retry_delay=0)
+
+    with pytest.raises(DeliveryError) as error:
+        service.send("Launches", "body", None)
+
+    assert error.value.failed_recipients == [f"{webhook_server.url}/gone"]
+    paths = [path for path, _, _ in webhook_server.requests]
+    assert sorted(paths) == ["/flaky", "/flaky", "/gone", "/limited", "/limited", "/ok"]
+
+
+def test_webhook_retries_signed_afresh(webhook_server):
+    """each attempt should be signed again, with a matching signature"""
+    webhook_server.statuses = {"/flaky": [503]}
+    url = f"{webhook_server.url}/flaky"
+    service = WebhookNotificationService(urls=url, secret="s3cret", retry_delay=0)  # noqa: S106
+
+    with patch.object(service, "get_headers", wraps=service.get_headers) as get_headers:
+        service.send("Launches", "body", None)
+
+    assert get_headers.call_count == 2
+    assert len(webhook_server.requests) == 2
+    for _, headers, body in webhook_server.requests:
+        timestamp = headers["X-Launches-Timestamp"]
+        assert headers["X-Launches-Signature"] == sign("s3cret", timestamp, body)
+
+
+def test_webhook_retries_within_send_timeout(webhook_server):
+    """a retry which would outlast the send timeout should not be attempted"""
+    webhook_server.statuses = {"/flaky": [503]}
+    service = WebhookNotificationService(
+        urls=f"{webhook_server.url}/flaky", retry_delay=30, send_timeout=20
+    )
+
+    with pytest.raises(DeliveryError):
+        service.send("Launches", "body", None)
+
+    assert len(webhook_server.requests) == 1
+
+
+def test_webhook_connection_error():
+    """an unreachable endpoint should fail after its retries"""
+    service = WebhookNotificationService(
+        urls="http://127.0.0.1:9/hook", max_retries=1, retry_delay=0, timeout=1
+    )
+
+    with pytest.raises(DeliveryError) as error:
+        service.send("Launches", "body", None)
+
+    assert error.value.failed_recipients == ["http://127.0.0.1:9/hook"]
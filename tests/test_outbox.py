@@ -0,0 +1,101 @@
+"""unittests for launches.outbox
+
+Copyright ©️ 2025 Scott Cummings
+SPDX-License-Identifier: MIT OR Apache-2.0
+"""
+
+import sqlite3
+import tempfile
+from unittest.mock import MagicMock
+
+import pytest
+
+from launches.notifications.dispatch import NotificationJob
+from launches.outbox import DEAD, PENDING, NotificationOutbox
+
+
+@pytest.fixture
+def cache_dir():
+    """return a temporary cache directory"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        yield tmpdir
+
+
+def named_handler(name):
+    """return a mock handler with a name"""
+    handler = MagicMock()
+    handler.name = name
+    return handler
+
+
+def test_deliver_removes_sent_notifications(cache_dir, single_launch):
+    """delivered notifications should not remain in the outbox"""
+    outbox = NotificationOutbox(cache_dir)
+    handlers = [named_handler("a"), named_handler("b")]
+
+    results = outbox.deliver([NotificationJob(handler, single_launch) for handler in handlers])
+
+    assert all(result.success for result in results)
+    assert outbox.counts() == {PENDING: 0, DEAD: 0}
+    with sqlite3.connect(outbox.path) as db:
+        assert db.execute("SELECT COUNT(*) FROM change_sets").fetchone() == (0,)
+
+
+def test_failed_notifications_are_retried(cache_dir, single_launch):
+    """a failed notification should be retried until it is delivered"""
+    outbox = NotificationOutbox(cache_dir, retry_delay=0)
+    handler = named_handler("a")
+    handler.send.side_effect = [RuntimeError("down"), None]
+
+    assert not outbox.deliver([NotificationJob(handler, single_launch)])[0].success
+    assert outbox.counts()[PENDING] == 1
+
+    assert outbox.retry_due()[0].success
+    assert outbox.counts()[PENDING] == 0
+    assert handler.send.call_count == 2
+
+
+def test_failed_notifications_are_dead_lettered(cache_dir, single_launch):
+    """a notification failing every attempt should be dead-lettered"""
+    outbox = NotificationOutbox(cache_dir, max_attempts=2, retry_delay=0)
+    handler = named_handler("a")
+    handler.send.side_effect = RuntimeError("down")
+
+    outbox.deliver([NotificationJob(handler, single_launch)])
+    outbox.retry_due()
+
+    assert outbox.retry_due() == []
+    assert outbox.counts() == {PENDING: 0, DEAD: 1}
+    assert outbox.dead_letters() == [("a", "down")]
+
+
+def test_queued_notifications_survive_restart(cache_dir, single_launch):
+    """notifications queued by one process should be sent by the next"""
+    NotificationOutbox(cache_dir).enqueue([NotificationJob(named_handler("a"), single_launch)])
+
+    handler = named_handler("a")
+    outbox = NotificationOutbox(cache_dir)
+    outbox.register([handler])
+    outbox.retry_due()
+
+    handler.send.assert_called_once_with(single_launch)
+    assert outbox.counts()[PENDING] == 0
+
+
+def test_in_flight_notifications_are_not_retried(cache_dir, single_launch):
+    """leased notifications should be hidden from the retry worker"""
+    outbox = NotificationOutbox(cache_dir)
+    outbox.enqueue([NotificationJob(named_handler("a"), single_launch)], lease=True)
+
+    assert outbox.retry_due() == []
+    assert outbox.counts()[PENDING] == 1
+
+
+def test_unknown_handler_dead_lettered(cache_dir, single_launch):
+    """notifications for handlers no longer configured should be dead-lettered"""
+    NotificationOutbox(cache_dir).enqueue([NotificationJob(named_handler("gone"), single_launch)])
+
+    outbox = NotificationOutbox(cache_dir)
+
+    assert outbox.retry_due() == []
+    assert outbox.dead_letters() == [("gone", "unknown handler")]
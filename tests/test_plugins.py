@@ -0,0 +1,70 @@
+"""unittests for launches.plugins
+
+Copyright ©️ 2025 Scott Cummings
+SPDX-License-Identifier: MIT OR Apache-2.0
+"""
+
+from importlib.metadata import EntryPoint
+from unittest.mock import patch
+
+import pytest
+
+from launches.notifications.renderers import (
+    JinjaRenderer,
+    get_notification_renderer,
+    register_renderer,
+)
+from launches.plugins import PluginRegistry, load_target
+
+GROUP = "launches.test_plugins"
+
+
+def entry_points(*points):
+    """patch the installed entry points with `(name, value)` pairs"""
+    installed = [EntryPoint(name, value, GROUP) for name, value in points]
+    return patch(
+        "importlib.metadata.entry_points",
+        side_effect=lambda group: [ep for ep in installed if ep.group == group],
+    )
+
+
+def test_load_target():
+    assert load_target("os.path:join") is __import__("os").path.join
+    assert load_target("launches.plugins:PluginRegistry.load") is PluginRegistry.load
+
+
+def test_builtins_load_without_discovery():
+    """built-in names should never scan the installed entry points"""
+    registry = PluginRegistry(GROUP, {"join": "os.path:join"})
+    with entry_points() as discovered:
+        assert registry.load("join") is load_target("os.path:join")
+    discovered.assert_not_called()
+
+
+def test_plugins_are_discovered_lazily():
+    registry = PluginRegistry(GROUP, {"join": "os.path:join"})
+    with entry_points(("split", "os.path:split")) as discovered:
+        assert registry.load("split") is load_target("os.path:split")
+        assert registry.names() == ["join", "split"]
+    discovered.assert_called_once()
+
+
+def test_builtins_take_priority_over_plugins():
+    registry = PluginRegistry(GROUP, {"join": "os.path:join"})
+    with entry_points(("join", "os.path:split")):
+        registry.discover()
+    assert registry.load("join") is load_target("os.path:join")
+
+
+def test_unknown_name():
+    registry = PluginRegistry(GROUP, {})
+    with entry_points(), pytest.raises(KeyError):
+        registry.load("unknown")
+
+
+def test_register_renderer():
+    """registered renderer factories should be called with the timezone"""
+    register_renderer("test-plugin", lambda tz: JinjaRenderer(tz=tz))
+    renderer = get_notification_renderer("test-plugin", "Europe/Berlin")
+    assert isinstance(renderer, JinjaRenderer)
+    assert renderer.tz == "Europe/Berlin"
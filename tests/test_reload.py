@@ -0,0 +1,177 @@
+"""unittests for launches.reload
+
+Copyright ©️ 2025 Scott Cummings
+SPDX-License-Identifier: MIT OR Apache-2.0
+"""
+
+import json
+import os
+from unittest.mock import MagicMock, patch
+
+import pytest
+import schedule
+
+from launches.config import load_config
+from launches.launches import LaunchCheck, schedule_daily_checks
+from launches.notifications.handlers import HandlerReuse, get_notification_handlers
+from launches.reload import ConfigReloader, ConfigWatcher, ServicePlan
+from launches.scheduling import GuardedJob
+
+STDOUT = {"service": "stdout", "renderer": "plaintext", "parameters": {}}
+JSONL = {"service": "jsonl", "parameters": {}}
+
+
+def write_config(path, config, step=[0]):  # noqa: B006 - bumps the mtime on every write
+    """write config, moving its mtime forward so every write is seen as a change"""
+    path.write_text(json.dumps(config))
+    step[0] += 1
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + step[0] * 1_000_000_000))
+
+
+def build_plan(config, reuse):
+    return ServicePlan(
+        window_hours=config.search_window_hours or 48,
+        notification_handlers=get_notification_handlers(config.notification_handlers, reuse=reuse),
+        periodic=config.periodic,
+        repeat_hours=config.search_repeat_hours or 24,
+        specific_times=config.daily_check_times or ["07:00"],
+        tz=config.time_zone or "UTC",
+        deadline_seconds=config.check_deadline_seconds or 600,
+    )
+
+
+@pytest.fixture
+def config_file(tmp_path):
+    path = tmp_path / "config.json"
+    write_config(path, {"notification_handlers": [STDOUT, JSONL]})
+    return path
+
+
+@pytest.fixture
+def service(config_file):
+    """a running schedule service with a reloader attached"""
+    schedule.clear()
+    config = load_config(str(config_file))
+    reuse = HandlerReuse()
+    plan = build_plan(config, reuse)
+    reloader = ConfigReloader(ConfigWatcher(str(config_file), config), build_plan, plan, reuse)
+    check = LaunchCheck(plan.window_hours, plan.notification_handlers, MagicMock())
+    job = GuardedJob(check, plan.deadline_seconds)
+    reloader.attach(check, job, schedule_daily_checks(job, plan.specific_times, plan.tz))
+    yield reloader
+    schedule.clear()
+
+
+def test_watcher_ignores_unchanged_file(config_file):
+    """polling an untouched or rewritten but identical config returns None"""
+    watcher = ConfigWatcher(str(config_file), load_config(str(config_file)))
+    assert watcher.poll() is None
+    write_config(config_file, {"notification_handlers": [STDOUT, JSONL]})
+    assert watcher.poll() is None
+
+
+def test_watcher_returns_changed_config(config_file):
+    watcher = ConfigWatcher(str(config_file), load_config(str(config_file)))
+    write_config(config_file, {"search_window_hours": 12, "notification_handlers": [STDOUT]})
+    config = watcher.poll()
+    assert config is not None
+    assert config.search_window_hours == 12
+    assert watcher.config is config
+
+
+def test_watcher_keeps_config_when_invalid(config_file):
+    """an invalid config is ignored until the file changes again"""
+    original = load_config(str(config_file))
+    watcher = ConfigWatcher(str(config_file), original)
+    write_config(config_file, {"notification_handlers": []})
+    assert watcher.poll() is None
+    assert watcher.config is original
+    assert watcher.poll() is None
+
+
+def test_reload_keeps_unchanged_handlers(service, config_file):
+    """only the changed handler is rebuilt, the window is swapped in place"""
+    stdout_handler, jsonl_handler = service.check.notification_handlers
+    write_config(
+        config_file,
+        {
+            "search_window_hours": 12,
+            "notification_handlers": [STDOUT, {**JSONL, "max_sends_per_hour": 6}],
+        },
+    )
+    assert service.poll()
+    assert service.check.window_hours == 12
+    assert service.check.notification_handlers[0] is stdout_handler
+    assert service.check.notification_handlers[1] is not jsonl_handler
+    assert service.reuse.rebuilt() == ["1-jsonl"]
+
+
+def test_reload_closes_removed_handlers(service, config_file):
+    jsonl_handler = service.check.notification_handlers[1]
+    jsonl_handler.close = MagicMock()
+    write_config(config_file, {"notification_handlers": [STDOUT]})
+    assert service.poll()
+    jsonl_handler.close.assert_called_once()
+
+
+def test_reload_keeps_schedule_when_times_unchanged(service, config_file):
+    entries = list(service.entries)
+    write_config(config_file, {"check_deadline_seconds": 30, "notification_handlers": [STDOUT]})
+    assert service.poll()
+    assert service.entries == entries
+    assert schedule.get_jobs() == entries
+    assert service.job.deadline_seconds == 30
+    assert service.check.deadline_seconds == 30
+
+
+def test_reload_reschedules_changed_times(service, config_file):
+    write_config(
+        config_file, {"daily_check_times": ["08:00", "20:00"], "notification_handlers": [STDOUT]}
+    )
+    assert service.poll()
+    assert schedule.get_jobs() == service.entries
+    assert [str(entry.at_time) for entry in service.entries] == ["08:00:00", "20:00:00"]
+    assert all(entry.job_func.func is service.job for entry in service.entries)
+
+
+def test_reload_keeps_schedule_when_times_invalid(service, config_file):
+    entries = list(service.entries)
+    write_config(
+        config_file, {"daily_check_times": ["8 o'clock"], "notification_handlers": [STDOUT]}
+    )
+    assert service.poll()
+    assert schedule.get_jobs() == entries
+
+
+def test_reload_logs_restart_fields(service, config_file):
+    """settings only read at startup should be logged as needing a restart"""
+    write_config(config_file, {"metrics_port": 9100, "notification_handlers": [STDOUT, JSONL]})
+    with patch("launches.reload.logger") as mock_logger:
+        assert service.poll()
+    mock_logger.warning.assert_called_once_with(
+        "Configuration changes to {} apply after a restart", ["metrics_port"]
+    )
+
+
+def test_reload_keeps_plan_when_build_fails(service, config_file):
+    handlers = service.check.notification_handlers
+    write_config(config_file, {"notification_handlers": [{**STDOUT, "service": "carrier-pigeon"}]})
+    assert not service.poll()
+    assert service.check.notification_handlers is handlers
+
+
+def test_reload_closes_built_handlers_when_build_fails(service, config_file):
+    """handlers built before the plan failed should be closed, kept ones left open"""
+    stdout_handler, jsonl_handler = service.check.notification_handlers
+    jsonl_handler.close = MagicMock()
+    new_jsonl = {**JSONL, "max_sends_per_hour": 6}
+    unknown = {**STDOUT, "service": "carrier-pigeon"}
+    write_config(config_file, {"notification_handlers": [STDOUT, new_jsonl, unknown]})
+
+    with patch("launches.notifications.jsonl.JsonLinesHandler.close") as close:
+        assert not service.poll()
+
+    close.assert_called_once()
+    jsonl_handler.close.assert_not_called()
+    assert service.check.notification_handlers == [stdout_handler, jsonl_handler]
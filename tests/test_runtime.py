@@ -0,0 +1,199 @@
+"""unittests for launches.runtime
+
+Copyright ©️ 2025 Scott Cummings
+SPDX-License-Identifier: MIT OR Apache-2.0
+"""
+
+import asyncio
+import threading
+from unittest.mock import MagicMock
+
+from launches.cache import with_all_new
+from launches.notifications.dispatch import SendExecutor
+from launches.runtime import AsyncLaunchesService, StageTimeouts
+
+
+async def run_until(service, condition, timeout=5.0):
+    """run the service until condition() is true, then stop it"""
+    task = asyncio.create_task(service.run())
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while not condition() and loop.time() < deadline:
+        await asyncio.sleep(0.01)
+    service.stop()
+    await asyncio.wait_for(task, timeout)
+
+
+def test_pipeline_sends_changed_launches(single_launch):
+    """a trigger should flow through fetch, diff and notify stages"""
+    client = MagicMock()
+    client.get_upcoming_launches_within_window.return_value = single_launch
+    cache = MagicMock()
+    cache.get_changed_launches.return_value = single_launch
+    handler = MagicMock()
+
+    async def main():
+        service = AsyncLaunchesService(1, [handler], client, cache)
+        service.trigger()
+        await run_until(service, lambda: handler.send.called)
+
+    asyncio.run(main())
+
+    client.get_upcoming_launches_within_window.assert_called_once()
+    cache.get_changed_launches.assert_called_once_with(single_launch, [])
+    handler.send.assert_called_once_with(single_launch)
+
+
+def test_pipeline_applies_check_deadline(single_launch):
+    """the fetch should time out by the check's deadline rather than the stage timeout"""
+    client = MagicMock()
+    client.get_upcoming_launches_within_window.return_value = single_launch
+    handler = MagicMock()
+
+    async def main():
+        service = AsyncLaunchesService(1, [handler], client, None, deadline_seconds=5)
+        service.trigger()
+        await run_until(service, lambda: handler.send.called)
+
+    asyncio.run(main())
+
+    timeout = client.get_upcoming_launches_within_window.call_args.kwargs["timeout"]
+    assert 4 < timeout <= 5
+
+
+def test_pipeline_skips_unchanged_launches(single_launch):
+    """no handler should be called when the cache reports no changes"""
+    client = MagicMock()
+    client.get_upcoming_launches_within_window.return_value = single_launch
+    cache = MagicMock()
+    cache.get_changed_launches.return_value = {"count": 0, "results": []}
+    handler = MagicMock()
+
+    async def main():
+        service = AsyncLaunchesService(1, [handler], client, cache)
+        service.trigger()
+        await run_until(service, lambda: cache.get_changed_launches.called)
+
+    asyncio.run(main())
+
+    handler.send.assert_not_called()
+
+
+def test_stalled_handler_does_not_block_others(single_launch):
+    """a handler exceeding the notify timeout should not delay other handlers"""
+    client = MagicMock()
+    client.get_upcoming_launches_within_window.return_value = single_launch
+    release = threading.Event()
+    stalled = MagicMock()
+    stalled.send.side_effect = lambda _launches: release.wait(5)
+    healthy = MagicMock()
+
+    async def main():
+        service = AsyncLaunchesService(
+            1, [stalled, healthy], client, None, StageTimeouts(notify=0.1)
+        )
+        service.trigger()
+        await run_until(service, lambda: healthy.send.called)
+        release.set()
+
+    asyncio.run(main())
+
+    healthy.send.assert_called_once_with(with_all_new(single_launch))
+
+
+def test_hung_handlers_do_not_starve_stages(single_launch):
+    """sends should run on the send executor, so hung handlers leave the stages free"""
+    client = MagicMock()
+    client.get_upcoming_launches_within_window.return_value = single_launch
+    release = threading.Event()
+    threads = []
+
+    def hang(_launches):
+        threads.append(threading.current_thread().name)
+        release.wait(5)
+
+    handlers = [MagicMock() for _ in range(3)]
+    for handler in handlers:
+        handler.send.side_effect = hang
+    executor = SendExecutor(len(handlers), "test-sends")
+
+    async def main():
+        service = AsyncLaunchesService(
+            1, handlers, client, None, StageTimeouts(notify=0.05), send_executor=executor
+        )
+        task = asyncio.create_task(service.run())
+        for _ in range(3):
+            service.trigger()
+            calls = client.get_upcoming_launches_within_window.call_count
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + 5
+            while client.get_upcoming_launches_within_window.call_count == calls:
+                assert loop.time() < deadline
+                await asyncio.sleep(0.01)
+            await asyncio.sleep(0.1)
+        service.stop()
+        await asyncio.wait_for(task, 5)
+        release.set()
+
+    asyncio.run(main())
+
+    assert client.get_upcoming_launches_within_window.call_count == 3
+    assert threads and all(name.startswith("test-sends") for name in threads)
+
+
+def test_trigger_drops_duplicate_requests():
+    """only one pending check should be queued at a time"""
+
+    async def main():
+        service = AsyncLaunchesService(1, [MagicMock()], MagicMock(), None)
+        service.trigger()
+        service.trigger()
+        return service._triggers.qsize()
+
+    assert asyncio.run(main()) == 1
+
+
+def test_pipeline_delivers_through_outbox(single_launch):
+    """handlers should deliver through the outbox when one is configured"""
+    client = MagicMock()
+    client.get_upcoming_launches_within_window.return_value = single_launch
+    handler = MagicMock()
+    outbox = MagicMock()
+    outbox.retry_due.return_value = []
+
+    async def main():
+        service = AsyncLaunchesService(1, [handler], client, None, outbox=outbox)
+        service.trigger()
+        await run_until(service, lambda: outbox.deliver.called)
+
+    asyncio.run(main())
+
+    jobs = outbox.deliver.call_args.args[0]
+    assert [(job.handler, job.launches) for job in jobs] == [(handler, with_all_new(single_launch))]
+    handler.send.assert_not_called()
+
+
+def test_handler_survives_unexpected_errors(single_launch):
+    """an unexpected exception from a handler should not end its worker task"""
+    client = MagicMock()
+    client.get_upcoming_launches_within_window.return_value = single_launch
+    handler = MagicMock()
+    handler.send.side_effect = [OSError("connection reset"), None]
+
+    async def main():
+        service = AsyncLaunchesService(1, [handler], client, None)
+        service.trigger()
+        task = asyncio.create_task(service.run())
+        while handler.send.call_count < 1:
+            await asyncio.sleep(0.01)
+        service.trigger()
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + 5
+        while handler.send.call_count < 2 and loop.time() < deadline:
+            await asyncio.sleep(0.01)
+        service.stop()
+        await asyncio.wait_for(task, 5)
+
+    asyncio.run(main())
+
+    assert handler.send.call_count == 2
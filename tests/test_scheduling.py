@@ -0,0 +1,135 @@
+"""unittests for launches.scheduling
+
+Copyright ©️ 2025 Scott Cummings
+SPDX-License-Identifier: MIT OR Apache-2.0
+"""
+
+import shutil
+import tempfile
+import threading
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock
+
+import pytest
+import schedule
+
+from launches.scheduling import (
+    SCHEDULER_LAG_SECONDS,
+    SCHEDULER_TICK_SECONDS,
+    GuardedJob,
+    RunRecord,
+    get_last_scheduled_run,
+    is_daily_run_missed,
+    observe_scheduler_lag,
+    scheduler_sleep_seconds,
+)
+
+
+@pytest.fixture
+def temp_cache_dir():
+    """Create a temporary directory for run records"""
+    temp_dir = tempfile.mkdtemp()
+    yield temp_dir
+    shutil.rmtree(temp_dir)
+
+
+def test_run_record_round_trip(temp_cache_dir):
+    """a recorded success should be returned by last_success"""
+    record = RunRecord(temp_cache_dir)
+    assert record.last_success() is None
+    when = datetime(2025, 5, 27, 12, 0, tzinfo=timezone.utc)
+    record.record_success(when)
+    assert RunRecord(temp_cache_dir).last_success() == when
+
+
+def test_run_record_invalid_file(temp_cache_dir):
+    """a corrupt run record should be treated as missing"""
+    record = RunRecord(temp_cache_dir)
+    record.record_file.write_text("not json")
+    assert record.last_success() is None
+
+
+def test_get_last_scheduled_run():
+    """the most recent slot at or before now should be returned"""
+    now = datetime(2025, 5, 27, 15, 0, tzinfo=timezone.utc)  # 10:00 America/Chicago
+    last = get_last_scheduled_run(["07:00", "19:00"], "America/Chicago", now)
+    assert last == datetime(2025, 5, 27, 12, 0, tzinfo=timezone.utc)
+
+
+def test_get_last_scheduled_run_previous_day():
+    """slots later in the day should fall back to the previous day"""
+    now = datetime(2025, 5, 27, 11, 0, tzinfo=timezone.utc)  # 06:00 America/Chicago
+    last = get_last_scheduled_run(["07:00", "19:00"], "America/Chicago", now)
+    assert last == datetime(2025, 5, 27, 0, 0, tzinfo=timezone.utc)
+
+
+def test_is_daily_run_missed():
+    """a slot passing after the last success should count as missed"""
+    now = datetime(2025, 5, 27, 15, 0, tzinfo=timezone.utc)
+    times = ["07:00", "19:00"]
+    before_slot = datetime(2025, 5, 27, 1, 0, tzinfo=timezone.utc)
+    after_slot = datetime(2025, 5, 27, 12, 5, tzinfo=timezone.utc)
+    assert is_daily_run_missed(before_slot, times, "America/Chicago", now)
+    assert not is_daily_run_missed(after_slot, times, "America/Chicago", now)
+
+
+def test_is_daily_run_missed_without_record():
+    """without a recorded check, a slot passed today should count as missed"""
+    times = ["07:00", "19:00"]
+    after_first_slot = datetime(2025, 5, 27, 15, 0, tzinfo=timezone.utc)  # 10:00 Chicago
+    before_first_slot = datetime(2025, 5, 27, 11, 0, tzinfo=timezone.utc)  # 06:00 Chicago
+    assert is_daily_run_missed(None, times, "America/Chicago", after_first_slot)
+    assert not is_daily_run_missed(None, times, "America/Chicago", before_first_slot)
+
+
+def test_guarded_job_records_success(temp_cache_dir):
+    """a successful run should be recorded"""
+    record = RunRecord(temp_cache_dir)
+    job = GuardedJob(MagicMock(return_value=True), run_record=record)
+    assert job() is True
+    assert record.last_success() is not None
+
+
+def test_guarded_job_failure_not_recorded(temp_cache_dir):
+    """failed or raising runs should not be recorded"""
+    record = RunRecord(temp_cache_dir)
+    assert GuardedJob(MagicMock(return_value=False), run_record=record)() is False
+    assert GuardedJob(MagicMock(side_effect=RuntimeError), run_record=record)() is False
+    assert record.last_success() is None
+
+
+def test_guarded_job_deadline_and_single_flight():
+    """a straggler should be abandoned and block overlapping runs until it returns"""
+    release = threading.Event()
+    func = MagicMock(side_effect=lambda: release.wait(5))
+    job = GuardedJob(func, deadline_seconds=0.05)
+
+    assert job() is False
+    assert job() is False
+    assert func.call_count == 1
+
+    release.set()
+    job._executor.shutdown(wait=True)
+    assert not job._in_flight.locked()
+
+
+def test_observe_scheduler_lag():
+    """only due jobs should record how late they are run"""
+    scheduler = schedule.Scheduler()
+    late = scheduler.every().hour.do(lambda: None)
+    late.next_run = datetime.now() - timedelta(seconds=90)
+    scheduler.every().hour.do(lambda: None)
+    count, total = SCHEDULER_LAG_SECONDS.count(), SCHEDULER_LAG_SECONDS.sum()
+
+    observe_scheduler_lag(scheduler.get_jobs())
+
+    assert SCHEDULER_LAG_SECONDS.count() == count + 1
+    assert SCHEDULER_LAG_SECONDS.sum() - total == pytest.approx(90, abs=5)
+
+
+def test_scheduler_sleep_seconds():
+    """the scheduler loop should wake when the next job is due, at most every tick"""
+    assert scheduler_sleep_seconds(None) == SCHEDULER_TICK_SECONDS
+    assert scheduler_sleep_seconds(4.5) == 4.5
+    assert scheduler_sleep_seconds(-2) == 0
+    assert scheduler_sleep_seconds(3600) == SCHEDULER_TICK_SECONDS
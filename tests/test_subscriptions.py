@@ -0,0 +1,170 @@
+"""unittests for launches.subscriptions
+
+Copyright ©️ 2025 Scott Cummings
+SPDX-License-Identifier: MIT OR Apache-2.0
+"""
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock, patch
+
+from launches.cache import LaunchCache
+from launches.config import SubscriptionConfig, SubscriptionFilterConfig
+from launches.subscriptions import (
+    DEFAULT_SUBSCRIPTION,
+    Subscription,
+    SubscriptionEngine,
+    SubscriptionIndex,
+    get_notification_windows,
+    get_subscriptions,
+    select_launches,
+)
+
+NOW = datetime(2025, 5, 27, 0, 0, tzinfo=timezone.utc)
+
+
+def frozen_datetime(moment: datetime) -> type[datetime]:
+    """a datetime class whose now() is always moment"""
+
+    class FrozenDatetime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return moment
+
+    return FrozenDatetime
+
+
+def test_select_by_filters(two_launches):
+    """only launches matching every configured filter should be selected"""
+    by_pad = Subscription("pad", 96, [], SubscriptionFilterConfig(pad_ids=[87]))
+    by_provider_and_orbit = Subscription(
+        "spacex-leo",
+        96,
+        [],
+        SubscriptionFilterConfig(launch_service_provider_ids=[121], orbits=["LEO"]),
+    )
+    by_other_orbit = Subscription("gto", 96, [], SubscriptionFilterConfig(orbits=["GTO"]))
+    results = two_launches["results"]
+
+    assert [launch["pad"]["id"] for launch in results if by_pad.matches_filters(launch)] == [87]
+    assert all(by_provider_and_orbit.matches_filters(launch) for launch in results)
+    assert not any(by_other_orbit.matches_filters(launch) for launch in results)
+
+
+def test_select_by_window(two_launches):
+    """launches starting after the subscription window should not be selected"""
+    engine = SubscriptionEngine([Subscription("short", 24, [MagicMock()])])
+    with patch("launches.subscriptions.datetime", frozen_datetime(NOW)):
+        (job,) = engine.notification_jobs(two_launches)
+    assert job.launches["count"] == 1
+    assert job.launches["results"][0]["window_start"] == "2025-05-27T16:14:00Z"
+
+
+def test_launch_entering_narrower_window(tmp_path, two_launches):
+    """a launch seen by a wide subscription should still be notified to a narrower
+    subscription once it enters that subscription's window, and only to it"""
+    launch = {**two_launches["results"][0], "window_start": "2025-05-29T00:00:00Z"}
+    launches = {"count": 1, "next": None, "previous": None, "results": [launch]}
+    wide_handler = MagicMock()
+    narrow_handler = MagicMock()
+    engine = SubscriptionEngine(
+        [
+            Subscription("wide", 72, [wide_handler]),
+            Subscription(DEFAULT_SUBSCRIPTION, 24, [narrow_handler]),
+        ]
+    )
+    cache = LaunchCache(cache_dir=str(tmp_path))
+
+    def notified(moment: datetime) -> list[MagicMock]:
+        with (
+            patch("launches.cache.datetime", frozen_datetime(moment)),
+            patch("launches.subscriptions.datetime", frozen_datetime(moment)),
+        ):
+            changed = cache.get_changed_launches(launches, get_notification_windows([engine]))
+            return [job.handler for job in engine.notification_jobs(changed)]
+
+    # 48 hours out, only within the wide window
+    assert notified(NOW) == [wide_handler]
+    # 12 hours out, the launch is unchanged but has entered the narrow window
+    assert notified(NOW + timedelta(hours=36)) == [narrow_handler]
+    assert notified(NOW + timedelta(hours=37)) == []
+
+
+def test_engine_send(two_launches):
+    """the engine should only notify subscriptions with matching launches"""
+    matching_handler = MagicMock()
+    unmatched_handler = MagicMock()
+    matching = Subscription("all", 96, [matching_handler])
+    unmatched = Subscription("none", 96, [unmatched_handler], SubscriptionFilterConfig(pad_ids=[1]))
+    engine = SubscriptionEngine([matching, unmatched])
+
+    results = engine.send(two_launches)
+
+    assert [result.success for result in results] == [True]
+    matching_handler.send.assert_called_once()
+    assert matching_handler.send.call_args.args[0]["count"] == 2
+    unmatched_handler.send.assert_not_called()
+
+
+def test_engine_window_hours():
+    """the shared fetch should cover the widest subscription window"""
+    engine = SubscriptionEngine([Subscription("a", 24, []), Subscription("b", 72, [])])
+    assert engine.window_hours == 72
+
+
+@patch("launches.subscriptions.get_notification_handlers")
+def test_get_subscriptions(mock_get_notification_handlers):
+    """subscriptions without a window should use the default window"""
+    configs = [
+        SubscriptionConfig(name="a", notification_handlers=[]),
+        SubscriptionConfig(name="b", search_window_hours=12, notification_handlers=[]),
+    ]
+    subscriptions = get_subscriptions(configs, 48)
+    assert [(s.name, s.window_hours) for s in subscriptions] == [("a", 48), ("b", 12)]
+    assert mock_get_notification_handlers.call_count == 2
+
+
+def test_index_match(two_launches):
+    """the index should agree with a linear scan of subscription filters"""
+    subscriptions = [
+        Subscription("all", 96, []),
+        Subscription("pad-87", 96, [], SubscriptionFilterConfig(pad_ids=[87])),
+        Subscription(
+            "spacex-leo",
+            96,
+            [],
+            SubscriptionFilterConfig(launch_service_provider_ids=[121], orbits=["LEO"]),
+        ),
+        Subscription(
+            "spacex-gto",
+            96,
+            [],
+            SubscriptionFilterConfig(launch_service_provider_ids=[121], orbits=["GTO"]),
+        ),
+        Subscription("location", 96, [], SubscriptionFilterConfig(location_ids=[11, 27])),
+        Subscription("rocket", 96, [], SubscriptionFilterConfig(rocket_configuration_ids=[1])),
+    ]
+    index = SubscriptionIndex(subscriptions)
+
+    for launch in two_launches["results"]:
+        expected = {i for i, s in enumerate(subscriptions) if s.matches_filters(launch)}
+        assert set(index.match(launch)) == expected
+
+    first, second = two_launches["results"]
+    assert {subscriptions[i].name for i in index.match(first)} == {"all", "spacex-leo", "location"}
+    assert {subscriptions[i].name for i in index.match(second)} == {
+        "all",
+        "pad-87",
+        "spacex-leo",
+        "location",
+    }
+
+
+def test_select_launches_keeps_changes(two_launches):
+    """selected launches should keep only their own change reasons"""
+    first, second = two_launches["results"]
+    launches = {**two_launches, "changes": {first["id"]: ["new"], second["id"]: ["net"]}}
+
+    selected = select_launches(launches, [second])
+
+    assert selected["changes"] == {second["id"]: ["net"]}
+    assert "changes" not in select_launches(two_launches, [second])